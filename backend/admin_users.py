@@ -0,0 +1,54 @@
+"""
+Grant or revoke the administrator role.
+
+Administrators can import patients, deploy models and rescore patients
+through /admin. The role is never granted through signup:
+
+    python -m backend.admin_users grant admin@medicare.example
+    python -m backend.admin_users revoke admin@medicare.example
+    python -m backend.admin_users list
+"""
+import argparse
+import sys
+from typing import Optional
+
+from sqlalchemy import func
+
+from . import models
+from .utils import normalize_email
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage administrator accounts.")
+    parser.add_argument("action", choices=["grant", "revoke", "list"])
+    parser.add_argument("email", nargs="?", help="Account to grant or revoke")
+    args = parser.parse_args(argv)
+    if args.action != "list" and not args.email:
+        parser.error(f"{args.action} needs an email")
+
+    from .database import SessionLocal, add_missing_columns, engine
+
+    models.Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine, models.User.__table__)
+    db = SessionLocal()
+    try:
+        if args.action == "list":
+            for user in db.query(models.User).filter(models.User.is_admin == True).order_by(models.User.email):
+                print(f"{user.email}\t{user.hospital_name}")
+            return 0
+
+        user = db.query(models.User).filter(func.lower(models.User.email) == normalize_email(args.email)).first()
+        if user is None:
+            print(f"No account for {args.email}", file=sys.stderr)
+            return 1
+        user.is_admin = args.action == "grant"
+        db.commit()
+        print(f"{user.email} is {'now' if user.is_admin else 'no longer'} an administrator ({user.hospital_name})")
+        return 0
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
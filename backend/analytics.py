@@ -0,0 +1,317 @@
+"""
+Hospital analytics served from summary tables.
+
+`/hospitals/analytics` and `/hospitals/{hospital_name}/analytics` read
+two small tables instead of aggregating patients, appointments and the
+whole risk history on every request:
+
+* provider_caseload_summary: one row per provider with caseload,
+  high-risk patients and appointment outcomes. Recomputed on each refresh
+  from the patients / appointments indexes (grouped by provider).
+* daily_assessment_summary: assessments and high-risk assessments per
+  hospital per day. Maintained incrementally: a refresh only recomputes
+  the days after `settled_through` (the last ANALYTICS_OPEN_DAYS days in
+  steady state, found through the created_at index), so its cost does not
+  grow with the size of risk_history. Days are UTC.
+
+Every worker checks every ANALYTICS_REFRESH_SECONDS (default 60, 0 turns
+the schedule off), but the check claims the analytics_refresh row only if
+it was last refreshed longer ago than that, so the schedule runs about one
+refresh per interval however many workers there are.
+`POST /hospitals/analytics/refresh` or `python -m backend.analytics`
+refreshes immediately. Refreshes are serialized on the analytics_refresh
+row, so concurrent workers queue up rather than interleave. Responses carry
+`refreshed_at`.
+"""
+import argparse
+import logging
+import os
+import threading
+import time as timer
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import case, delete, func, insert, literal_column, or_, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "60"))
+# Recent days are recomputed on every refresh, so assessments that commit late are still counted
+ANALYTICS_OPEN_DAYS = int(os.getenv("ANALYTICS_OPEN_DAYS", "2"))
+
+
+def install_indexes(bind: Engine) -> None:
+    """Create the risk_history indexes the daily refresh relies on if the table predates them."""
+    with bind.begin() as conn:
+        for index in models.RiskHistory.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# REFRESH
+def _claim(db: Session, stale_before: Optional[datetime] = None) -> Optional[models.AnalyticsRefresh]:
+    """Lock the analytics_refresh row; None if it was refreshed at or after `stale_before` (naive UTC)."""
+    R = models.AnalyticsRefresh
+    # Writing first takes the row (PostgreSQL) or database (SQLite) lock for the whole refresh
+    claim = update(R).where(R.id == 1).values(refreshed_at=func.now())
+    if stale_before is not None:
+        # A worker queued behind another's refresh re-reads the row and finds it fresh
+        claim = claim.where(or_(R.refreshed_at.is_(None), R.refreshed_at < stale_before))
+    if not db.execute(claim).rowcount:
+        if stale_before is not None and db.get(R, 1) is not None:
+            db.rollback()
+            return None
+        db.add(R(id=1))
+        db.flush()
+    return db.get(R, 1, populate_existing=True)
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def refresh_caseloads(db: Session) -> int:
+    P, A, U = models.Patient, models.Appointment, models.User
+    patients = {
+        row.provider_id: row
+        for row in db.query(
+            P.provider_id,
+            func.count(P.id).label("patients"),
+            _count_if(P.risk_level == "High Risk").label("high_risk"),
+        ).filter(P.provider_id.isnot(None)).group_by(P.provider_id)
+    }
+    appointments = {
+        row.provider_id: row
+        for row in db.query(
+            A.provider_id,
+            func.count(A.id).label("total"),
+            _count_if(A.status == "Completed").label("completed"),
+            _count_if(A.status == "Cancelled").label("cancelled"),
+        ).filter(A.provider_id.isnot(None)).group_by(A.provider_id)
+    }
+
+    summary = []
+    for provider in db.query(U.id, U.full_name, U.hospital_name, U.role).filter(U.is_provider == True):
+        p, a = patients.get(provider.id), appointments.get(provider.id)
+        summary.append({
+            "provider_id": provider.id,
+            "hospital_name": provider.hospital_name,
+            "provider_name": provider.full_name,
+            "role": provider.role,
+            "patients": p.patients if p else 0,
+            "high_risk_patients": p.high_risk if p else 0,
+            "appointments": a.total if a else 0,
+            "completed_appointments": a.completed if a else 0,
+            "cancelled_appointments": a.cancelled if a else 0,
+        })
+
+    db.execute(delete(models.ProviderCaseloadSummary))
+    if summary:
+        db.execute(insert(models.ProviderCaseloadSummary), summary)
+    return len(summary)
+
+
+def refresh_daily(db: Session, state: models.AnalyticsRefresh, today: date) -> int:
+    """Recompute the days after state.settled_through (every day on the first run); returns rows written."""
+    H, P, D = models.RiskHistory, models.Patient, models.DailyAssessmentSummary
+    start = state.settled_through + timedelta(days=1) if state.settled_through else None
+
+    if db.get_bind().dialect.name == "postgresql":
+        # date() of a timestamptz uses the session time zone; the summary days are UTC.
+        # A literal, not a bound parameter, so the SELECT and GROUP BY expressions match
+        day = func.date(func.timezone(literal_column("'UTC'"), H.created_at))
+    else:
+        day = func.date(H.created_at)
+    query = (
+        db.query(
+            P.hospital_name,
+            day.label("day"),
+            func.count(H.id).label("assessments"),
+            _count_if(H.risk_level == "High Risk").label("high_risk"),
+        )
+        .join(P, P.id == H.patient_id)
+        .filter(H.source == "assessment")
+        .group_by(P.hospital_name, day)
+    )
+    stale = delete(D)
+    if start is not None:
+        query = query.filter(H.created_at >= datetime.combine(start, time.min, tzinfo=timezone.utc))
+        stale = stale.where(D.day >= start)
+
+    summary = [
+        {
+            "hospital_name": row.hospital_name,
+            # SQLite's date() returns text
+            "day": date.fromisoformat(row.day) if isinstance(row.day, str) else row.day,
+            "assessments": row.assessments,
+            "high_risk_assessments": row.high_risk,
+        }
+        for row in query
+    ]
+    db.execute(stale)
+    if summary:
+        db.execute(insert(D), summary)
+
+    settled = today - timedelta(days=ANALYTICS_OPEN_DAYS)
+    if state.settled_through is None or settled > state.settled_through:
+        state.settled_through = settled
+    return len(summary)
+
+
+def refresh(db: Session, today: Optional[date] = None, stale_before: Optional[datetime] = None) -> Optional[dict]:
+    """Bring both summary tables up to date in one transaction; None if skipped as fresh (see _claim)."""
+    started = timer.perf_counter()
+    state = _claim(db, stale_before)
+    if state is None:
+        return None
+    providers = refresh_caseloads(db)
+    days = refresh_daily(db, state, today or datetime.utcnow().date())
+    state.refreshed_at = datetime.utcnow()
+    state.duration_ms = round((timer.perf_counter() - started) * 1000, 1)
+    db.commit()
+    return {
+        "providers": providers,
+        "daily_rows": days,
+        "settled_through": state.settled_through,
+        "refreshed_at": state.refreshed_at,
+        "duration_ms": state.duration_ms,
+    }
+
+
+def start_refresher(interval: float = ANALYTICS_REFRESH_SECONDS) -> Optional[threading.Thread]:
+    """Every `interval` seconds, refresh unless some worker did within the interval (a daemon thread per worker)."""
+    if interval <= 0:
+        return None
+    from .database import SessionLocal
+
+    def loop():
+        while True:
+            db = SessionLocal()
+            try:
+                # A little under the interval, so the worker that refreshed last is not skipped for timer drift
+                refresh(db, stale_before=datetime.utcnow() - timedelta(seconds=interval * 0.9))
+            except Exception:
+                db.rollback()
+                logger.exception("Analytics refresh failed; retrying in %ss", interval)
+            finally:
+                db.close()
+            timer.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="analytics-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+# READS
+def _rates(row: dict) -> dict:
+    resolved = row["completed_appointments"] + row["cancelled_appointments"]
+    row["high_risk_share"] = round(row["high_risk_patients"] / row["patients"], 4) if row["patients"] else 0.0
+    row["completion_rate"] = round(row["completed_appointments"] / resolved, 4) if resolved else None
+    return row
+
+
+def _refreshed_at(db: Session) -> Optional[datetime]:
+    state = db.get(models.AnalyticsRefresh, 1)
+    return state.refreshed_at if state else None
+
+
+def _daily_totals(db: Session, since: date, hospital_name: Optional[str] = None):
+    D = models.DailyAssessmentSummary
+    query = db.query(
+        D.hospital_name,
+        func.sum(D.assessments).label("assessments"),
+        func.sum(D.high_risk_assessments).label("high_risk"),
+    ).filter(D.day >= since)
+    if hospital_name is not None:
+        query = query.filter(D.hospital_name == hospital_name)
+    return {row.hospital_name: row for row in query.group_by(D.hospital_name)}
+
+
+def hospital_overview(db: Session, days: int = 30) -> dict:
+    """Totals per hospital across all its providers."""
+    S = models.ProviderCaseloadSummary
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    volume = _daily_totals(db, since)
+    hospitals = []
+    for row in db.query(
+        S.hospital_name,
+        func.count(S.provider_id).label("providers"),
+        func.sum(S.patients).label("patients"),
+        func.sum(S.high_risk_patients).label("high_risk_patients"),
+        func.sum(S.appointments).label("appointments"),
+        func.sum(S.completed_appointments).label("completed_appointments"),
+        func.sum(S.cancelled_appointments).label("cancelled_appointments"),
+    ).group_by(S.hospital_name).order_by(S.hospital_name):
+        v = volume.get(row.hospital_name)
+        hospitals.append(_rates({
+            **row._asdict(),
+            "assessments": v.assessments if v else 0,
+            "high_risk_assessments": v.high_risk if v else 0,
+        }))
+    return {"days": days, "refreshed_at": _refreshed_at(db), "hospitals": hospitals}
+
+
+def hospital_analytics(db: Session, hospital_name: str, days: int = 30) -> dict:
+    """Per-provider caseloads and the daily assessment volume of one hospital."""
+    S, D = models.ProviderCaseloadSummary, models.DailyAssessmentSummary
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    providers = [
+        _rates({
+            "provider_id": p.provider_id,
+            "provider_name": p.provider_name,
+            "role": p.role,
+            "patients": p.patients,
+            "high_risk_patients": p.high_risk_patients,
+            "appointments": p.appointments,
+            "completed_appointments": p.completed_appointments,
+            "cancelled_appointments": p.cancelled_appointments,
+        })
+        for p in db.query(S).filter(S.hospital_name == hospital_name).order_by(S.provider_name, S.provider_id)
+    ]
+    daily = [
+        {"day": d.day, "assessments": d.assessments, "high_risk_assessments": d.high_risk_assessments}
+        for d in db.query(D).filter(D.hospital_name == hospital_name, D.day >= since).order_by(D.day)
+    ]
+    totals = _rates({
+        key: sum(p[key] for p in providers)
+        for key in ("patients", "high_risk_patients", "appointments", "completed_appointments", "cancelled_appointments")
+    })
+    totals["assessments"] = sum(d["assessments"] for d in daily)
+    totals["high_risk_assessments"] = sum(d["high_risk_assessments"] for d in daily)
+    return {
+        "hospital_name": hospital_name,
+        "days": days,
+        "refreshed_at": _refreshed_at(db),
+        "totals": totals,
+        "providers": providers,
+        "assessments_by_day": daily,
+    }
+
+
+# CLI
+def main(argv: Optional[list[str]] = None) -> int:
+    from .database import SessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Refresh the hospital analytics summary tables.")
+    parser.add_argument("--full", action="store_true", help="Recompute every day, not just the open ones")
+    args = parser.parse_args(argv)
+
+    models.Base.metadata.create_all(bind=engine)
+    install_indexes(engine)
+    db = SessionLocal()
+    try:
+        if args.full:
+            _claim(db).settled_through = None
+        result = refresh(db)
+    finally:
+        db.close()
+    print(f"Refreshed {result['providers']} providers and {result['daily_rows']} hospital-days "
+          f"in {result['duration_ms']} ms (settled through {result['settled_through']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
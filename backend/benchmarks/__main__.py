@@ -0,0 +1,58 @@
+"""
+Run the benchmark suite offline against SQLite and check for regressions.
+
+    python -m backend.benchmarks                      # run + compare with baseline
+    python -m backend.benchmarks --save-baseline      # run + store as new baseline
+    BENCH_PATIENTS=5000 python -m backend.benchmarks -k endpoint
+
+Requires `pytest-benchmark`.
+"""
+import argparse
+import os
+import shutil
+import sys
+
+import pytest
+
+from .compare import compare, load_stats, print_report
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="UzaziSafe micro-benchmarks")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write this run's JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--stat", default="median", choices=["min", "mean", "median", "max"])
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    exit_code = pytest.main([
+        HERE,
+        "-p", "backend.benchmarks.plugin",
+        "-o", "python_files=bench_*.py",
+        "--benchmark-only",
+        f"--benchmark-json={args.output}",
+        *pytest_args,
+    ])
+    if exit_code != 0:
+        return int(exit_code)
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    rows = compare(load_stats(args.output, args.stat), load_stats(args.baseline, args.stat), args.threshold)
+    print_report(rows, args.threshold)
+    return 1 if any(r["regressed"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
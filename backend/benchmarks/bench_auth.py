@@ -0,0 +1,40 @@
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from backend.benchmarks.plugin import BENCH_PASSWORD
+from backend.utils import (
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    get_current_email,
+    get_current_user,
+    hash_password,
+    verify_password,
+)
+
+
+@pytest.mark.benchmark(group="jwt")
+def test_jwt_encode(benchmark):
+    benchmark(create_access_token, {"sub": "bench.provider@example.com"})
+
+
+@pytest.mark.benchmark(group="jwt")
+def test_jwt_decode(benchmark):
+    token = create_access_token({"sub": "bench.provider@example.com"})
+    benchmark(jwt.decode, token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+@pytest.mark.benchmark(group="password")
+def test_bcrypt_verify(benchmark):
+    hashed = hash_password(BENCH_PASSWORD)
+    assert benchmark(verify_password, BENCH_PASSWORD, hashed) is True
+
+
+@pytest.mark.benchmark(group="auth")
+def test_get_current_user(benchmark, seeded, db_session):
+    token = create_access_token({"sub": seeded["provider_email"]})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    # The two dependencies FastAPI chains for a protected route: decode the token, then load the user
+    user = benchmark(lambda: get_current_user(email=get_current_email(credentials), db=db_session))
+    assert user.email == seeded["provider_email"]
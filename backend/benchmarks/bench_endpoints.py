@@ -0,0 +1,27 @@
+import pytest
+
+# (name, path template, which auth header to send)
+ENDPOINTS = [
+    ("patients_me", "/patients/me", "patient"),
+    ("patient_latest_risk", "/patients/{patient_id}/latest-risk", None),
+    ("patient_history", "/assess-risk/patient/{patient_id}", None),
+    ("patient_appointments", "/appointments/patient/{patient_email}", None),
+    ("providers_me", "/providers/me", "provider"),
+    ("provider_patients", "/providers/{provider_id}/patients", None),
+    ("provider_appointments", "/providers/{provider_id}/appointments", None),
+    ("provider_appointments_by_email", "/appointments/provider/{provider_email}", None),
+    ("provider_risk_summary", "/providers/{provider_id}/risk-summary", None),
+    ("provider_activity", "/providers/{provider_id}/activity", None),
+]
+
+
+@pytest.mark.benchmark(group="endpoints")
+@pytest.mark.parametrize(
+    "path,auth", [(path, auth) for _, path, auth in ENDPOINTS], ids=[e[0] for e in ENDPOINTS]
+)
+def test_dashboard_endpoint(benchmark, client, seeded, path, auth):
+    url = path.format(**seeded)
+    headers = seeded[f"{auth}_headers"] if auth else {}
+
+    response = benchmark(client.get, url, headers=headers)
+    assert response.status_code == 200
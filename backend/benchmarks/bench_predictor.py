@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import TypeAdapter
+
+from backend.ml import predictor
+from backend.ml.predictor import assess_risk, features_from_requests
+from backend.schemas import RiskAssessmentRequest
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "Maternal Health Data.csv")
+BATCH_SIZE = int(os.getenv("BENCH_BATCH_SIZE", 256))
+
+FEATURES = [
+    "Age", "Systolic BP", "Diastolic BP", "Blood Sugar", "Body Temp", "Heart Rate",
+    "Previous Complications", "Pre-existing Diabetes", "Gestational Diabetes",
+]
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    df = pd.read_csv(CSV_PATH).dropna()
+    for col in ["Previous Complications", "Pre-existing Diabetes", "Gestational Diabetes"]:
+        df[col] = (df[col] == "Yes").astype(int)
+    return df[FEATURES].head(BATCH_SIZE).astype(float).reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def payloads(dataset):
+    """Rows shaped like the `/assess-risk/` request body."""
+    yes_no = {1.0: "Yes", 0.0: "No"}
+    return [
+        {
+            "Age": r["Age"],
+            "Systolic_BP": r["Systolic BP"],
+            "Diastolic_BP": r["Diastolic BP"],
+            "Blood_Sugar": r["Blood Sugar"],
+            "Body_Temp": r["Body Temp"],
+            "Heart_Rate": r["Heart Rate"],
+            "Previous_Complications": yes_no[r["Previous Complications"]],
+            "Pre_existing_Diabetes": yes_no[r["Pre-existing Diabetes"]],
+            "Gestational_Diabetes": yes_no[r["Gestational Diabetes"]],
+        }
+        for r in dataset.to_dict("records")
+    ]
+
+
+# ASSESS_RISK END TO END
+@pytest.mark.benchmark(group="assess_risk")
+def test_assess_risk_single(benchmark, payloads):
+    """Validate one request body, build its feature row and score it."""
+    result = benchmark(lambda: assess_risk(features_from_requests([RiskAssessmentRequest(**payloads[0])])))
+    assert result["Prediction"] in ("High Risk", "Low Risk")
+
+
+@pytest.mark.benchmark(group="assess_risk")
+def test_assess_risk_batched_loop(benchmark, payloads):
+    """Cost of scoring a batch by calling assess_risk() once per row."""
+    results = benchmark(lambda: [assess_risk(features_from_requests([RiskAssessmentRequest(**p)])) for p in payloads])
+    assert len(results) == len(payloads)
+
+
+@pytest.mark.benchmark(group="assess_risk")
+def test_predict_proba_batched_vectorized(benchmark, dataset):
+    """Same batch scored with a single vectorized predict_proba call."""
+    probs = benchmark(predictor.model.predict_proba, dataset)
+    assert probs.shape == (len(dataset), 2)
+
+
+# INPUT CONSTRUCTION
+@pytest.mark.benchmark(group="input")
+def test_validate_request_batch(benchmark, payloads):
+    """Parse and validate a whole batch of request bodies into one feature matrix."""
+    adapter = TypeAdapter(list[RiskAssessmentRequest])
+    X = benchmark(lambda: features_from_requests(adapter.validate_python(payloads)))
+    assert X.shape == (len(payloads), len(FEATURES))
+
+
+@pytest.mark.benchmark(group="input")
+def test_build_single_row_dataframe(benchmark, dataset):
+    row = dataset.iloc[0].to_dict()
+    benchmark(lambda: pd.DataFrame([row]))
+
+
+@pytest.mark.benchmark(group="input")
+def test_build_single_row_ndarray(benchmark, dataset):
+    row = dataset.iloc[0].to_dict()
+    benchmark(lambda: np.array([[row[f] for f in FEATURES]], dtype=np.float32))
+
+
+@pytest.mark.benchmark(group="predict")
+def test_predict_proba_single_dataframe(benchmark, dataset):
+    benchmark(predictor.model.predict_proba, dataset.iloc[[0]])
+
+
+@pytest.mark.benchmark(group="predict")
+def test_predict_proba_single_ndarray(benchmark, dataset):
+    benchmark(predictor.model.predict_proba, dataset.iloc[[0]].to_numpy(dtype=np.float32))
+
+
+@pytest.mark.benchmark(group="predict")
+def test_predict_proba_single_onnx(benchmark, dataset):
+    """The XGBoost export under onnxruntime (MODEL_RUNTIME=onnx), one row."""
+    pytest.importorskip("onnxruntime")
+    from backend.ml.backends import MODELS_DIR, OnnxBackend
+    from backend.ml.onnx_export import create_session
+
+    exported = OnnxBackend(create_session(os.path.join(MODELS_DIR, "xgboost.onnx")), "xgboost")
+    row = dataset.iloc[[0]].to_numpy(dtype=np.float32)
+    prob = benchmark(exported.predict_proba, row)
+    assert prob.shape == (1,)
+
+
+# SHAP EXPLANATIONS
+@pytest.mark.benchmark(group="shap")
+def test_shap_single_row(benchmark, dataset):
+    if predictor.explainer is None:
+        pytest.skip("SHAP explainer not available")
+    benchmark(predictor.explainer.shap_values, dataset.iloc[[0]])
+
+
+@pytest.mark.benchmark(group="shap")
+def test_shap_batch(benchmark, dataset):
+    if predictor.explainer is None:
+        pytest.skip("SHAP explainer not available")
+    benchmark(predictor.explainer.shap_values, dataset)
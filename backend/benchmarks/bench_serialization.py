@@ -0,0 +1,83 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from backend import schemas
+from backend.responses import FastJSONResponse, dumps
+
+PAYLOAD_ROWS = int(os.getenv("BENCH_SERIALIZATION_ROWS", 10_000))
+
+
+@pytest.fixture(scope="module")
+def appointment_rows():
+    """Pre-shaped appointment rows, as the list endpoints build them."""
+    start = datetime(2025, 1, 1, 9, 0)
+    return [
+        {
+            "id": i,
+            "patient_name": f"Patient {i}",
+            "date": start + timedelta(hours=i),
+            "appointment_type": "Antenatal Checkup",
+            "status": "Scheduled",
+            "hospital_name": "UzaziSafe Health Center",
+            "provider_id": 1,
+            "provider_email": None,
+            "provider_name": "Dr. Bench",
+        }
+        for i in range(PAYLOAD_ROWS)
+    ]
+
+
+@pytest.fixture(scope="module")
+def risk_rows():
+    start = datetime(2025, 1, 1, 9, 0)
+    return [
+        {
+            "id": i,
+            "patientId": i % 500,
+            "timestamp": start + timedelta(minutes=i),
+            "risk": "High Risk" if i % 3 else "Low Risk",
+            "probability_high": 0.734,
+            "probability_low": 0.266,
+            "factors": "{'Blood Sugar': 1.2031, 'Age': -0.3112}",
+            "vitals": {"systolic_bp": 130.0, "diastolic_bp": 85.0, "blood_sugar": 7.1, "body_temp": 98.4, "heart_rate": 82.0},
+        }
+        for i in range(PAYLOAD_ROWS)
+    ]
+
+
+# APPOINTMENT LISTS (10k rows)
+@pytest.mark.benchmark(group="serialize-appointments")
+def test_serialize_stdlib_jsonable_encoder(benchmark, appointment_rows):
+    """What a plain dict route did before: jsonable_encoder + stdlib json."""
+    body = benchmark(lambda: json.dumps(jsonable_encoder(appointment_rows)).encode("utf-8"))
+    assert body.startswith(b"[{")
+
+
+@pytest.mark.benchmark(group="serialize-appointments")
+def test_serialize_response_model(benchmark, appointment_rows):
+    """What a response_model route did before: validate every row, then dump."""
+    adapter = TypeAdapter(list[schemas.AppointmentResponse])
+    benchmark(lambda: adapter.dump_json(adapter.validate_python(appointment_rows)))
+
+
+@pytest.mark.benchmark(group="serialize-appointments")
+def test_serialize_fast_response(benchmark, appointment_rows):
+    body = benchmark(lambda: FastJSONResponse(appointment_rows).body)
+    assert len(json.loads(body)) == PAYLOAD_ROWS
+
+
+# RISK HISTORY (10k rows, nested vitals)
+@pytest.mark.benchmark(group="serialize-risk-history")
+def test_serialize_risk_history_stdlib(benchmark, risk_rows):
+    benchmark(lambda: json.dumps(jsonable_encoder(risk_rows)).encode("utf-8"))
+
+
+@pytest.mark.benchmark(group="serialize-risk-history")
+def test_serialize_risk_history_fast(benchmark, risk_rows):
+    body = benchmark(dumps, risk_rows)
+    assert json.loads(body)[0]["timestamp"] == "2025-01-01T09:00:00"
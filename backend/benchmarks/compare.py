@@ -0,0 +1,68 @@
+"""
+Compare a pytest-benchmark JSON report against a stored baseline.
+
+    python -m backend.benchmarks.compare results.json baseline.json --threshold 0.2
+
+Exits with status 1 when any benchmark is slower than the baseline by more
+than the threshold (a fraction, 0.2 = 20%).
+"""
+import argparse
+import json
+import sys
+from typing import Optional
+
+
+def load_stats(path: str, stat: str = "median") -> dict[str, float]:
+    """Map benchmark fullname -> chosen statistic (seconds)."""
+    with open(path) as f:
+        report = json.load(f)
+    return {b["fullname"]: b["stats"][stat] for b in report.get("benchmarks", [])}
+
+
+def compare(current: dict[str, float], baseline: dict[str, float], threshold: float = 0.2) -> list[dict]:
+    """
+    Return one row per benchmark present in both reports, with the relative
+    change and whether it counts as a regression.
+    """
+    rows = []
+    for name, value in sorted(current.items()):
+        base = baseline.get(name)
+        if base is None or base <= 0:
+            continue
+        change = (value - base) / base
+        rows.append({
+            "name": name,
+            "baseline": base,
+            "current": value,
+            "change": change,
+            "regressed": change > threshold,
+        })
+    return rows
+
+
+def print_report(rows: list[dict], threshold: float) -> None:
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(
+            f"{flag:>10}  {row['change']:+7.1%}  "
+            f"{row['baseline'] * 1e3:10.3f} ms -> {row['current'] * 1e3:10.3f} ms  {row['name']}"
+        )
+    regressions = sum(r["regressed"] for r in rows)
+    print(f"\n{len(rows)} benchmarks compared, {regressions} slower than baseline by more than {threshold:.0%}.")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a baseline.")
+    parser.add_argument("current", help="pytest-benchmark JSON report for this run")
+    parser.add_argument("baseline", help="Stored baseline JSON report")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--stat", default="median", choices=["min", "mean", "median", "max"])
+    args = parser.parse_args(argv)
+
+    rows = compare(load_stats(args.current, args.stat), load_stats(args.baseline, args.stat), args.threshold)
+    print_report(rows, args.threshold)
+    return 1 if any(r["regressed"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Pytest plugin for the benchmark suite.
+
+Loaded with `-p backend.benchmarks.plugin` (see `python -m backend.benchmarks`)
+rather than as a conftest so the regular test run never picks it up.
+Dataset size is configurable through environment variables:
+
+    BENCH_PATIENTS      patients seeded for the provider (default 500)
+    BENCH_HISTORY       risk history rows per patient (default 20)
+    BENCH_APPOINTMENTS  appointments per patient (default 5)
+"""
+import os
+import random
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", "sqlite:///./benchmark.db")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from backend import models
+from backend.database import Base, SessionLocal, engine
+from backend.main import app
+from backend.utils import create_access_token, hash_password
+
+BENCH_HOSPITAL = "UzaziSafe Health Center"
+BENCH_PASSWORD = "BenchPass123!"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def seed_benchmark_data(db, patients: int, history: int, appointments: int, seed: int = 42) -> dict:
+    """Insert one provider with a caseload of `patients` using bulk inserts."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    hashed_pw = hash_password(BENCH_PASSWORD)
+
+    provider = models.User(
+        full_name="Dr Bench",
+        email="bench.provider@example.com",
+        hashed_password=hashed_pw,
+        is_provider=True,
+        role="Doctor",
+        hospital_name=BENCH_HOSPITAL,
+    )
+    db.add(provider)
+    db.commit()
+
+    user_ids = db.execute(
+        insert(models.User).returning(models.User.id),
+        [
+            {
+                "full_name": f"Bench Patient {i}",
+                "email": f"bench.patient{i}@example.com",
+                "hashed_password": hashed_pw,
+                "is_provider": False,
+                "hospital_name": BENCH_HOSPITAL,
+            }
+            for i in range(patients)
+        ],
+    ).scalars().all()
+
+    patient_ids = db.execute(
+        insert(models.Patient).returning(models.Patient.id),
+        [
+            {
+                "full_name": f"Bench Patient {i}",
+                "age": rng.randint(18, 45),
+                "hospital_name": BENCH_HOSPITAL,
+                "risk_level": rng.choice(["High Risk", "Low Risk"]),
+                "provider_id": provider.id,
+                "user_id": user_id,
+                "created_at": now - timedelta(days=rng.randint(0, 30)),
+            }
+            for i, user_id in enumerate(user_ids)
+        ],
+    ).scalars().all()
+
+    history_rows = []
+    appointment_rows = []
+    for i, patient_id in enumerate(patient_ids):
+        for _ in range(history):
+            high = rng.random()
+            history_rows.append({
+                "patient_id": patient_id,
+                "risk_level": "High Risk" if high >= 0.5 else "Low Risk",
+                "high_risk_probability": high,
+                "low_risk_probability": 1 - high,
+                "contributing_factors": "{'Blood Sugar': 0.5, 'Age': -0.1}",
+                "created_at": now - timedelta(hours=rng.randint(0, 24 * 30)),
+                "systolic_bp": rng.uniform(90, 160),
+                "diastolic_bp": rng.uniform(60, 100),
+                "blood_sugar": rng.uniform(6, 15),
+                "body_temp": rng.uniform(97, 101),
+                "heart_rate": rng.uniform(60, 100),
+            })
+        for _ in range(appointments):
+            appointment_rows.append({
+                "patient_name": f"Bench Patient {i}",
+                "date": now + timedelta(days=rng.randint(-30, 30)),
+                "appointment_type": "Checkup",
+                "status": rng.choice(["Scheduled", "Completed", "Cancelled"]),
+                "hospital_name": BENCH_HOSPITAL,
+                "provider_id": provider.id,
+                "updated_at": now - timedelta(days=rng.randint(0, 10)),
+            })
+
+    if history_rows:
+        db.execute(insert(models.RiskHistory), history_rows)
+    if appointment_rows:
+        db.execute(insert(models.Appointment), appointment_rows)
+    db.commit()
+
+    return {
+        "provider_id": provider.id,
+        "provider_email": provider.email,
+        "patient_id": patient_ids[0] if patient_ids else None,
+        "patient_email": "bench.patient0@example.com",
+    }
+
+
+def pytest_report_header(config):
+    return (
+        f"benchmark dataset: patients={_env_int('BENCH_PATIENTS', 500)} "
+        f"history={_env_int('BENCH_HISTORY', 20)} "
+        f"appointments={_env_int('BENCH_APPOINTMENTS', 5)}"
+    )
+
+
+@pytest.fixture(scope="session")
+def seeded():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        info = seed_benchmark_data(
+            db,
+            patients=max(1, _env_int("BENCH_PATIENTS", 500)),
+            history=_env_int("BENCH_HISTORY", 20),
+            appointments=_env_int("BENCH_APPOINTMENTS", 5),
+        )
+    finally:
+        db.close()
+
+    info["provider_headers"] = {
+        "Authorization": f"Bearer {create_access_token({'sub': info['provider_email']})}"
+    }
+    info["patient_headers"] = {
+        "Authorization": f"Bearer {create_access_token({'sub': info['patient_email']})}"
+    }
+    yield info
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="session")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def db_session():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
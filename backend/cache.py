@@ -0,0 +1,204 @@
+"""
+Read-through cache for hot read endpoints.
+
+`/patients/{id}/latest-risk` and `/providers/{id}/patients` are cached as
+rendered JSON bytes, so a hit skips both the queries and serialization.
+Writers call `invalidate_patient(...)` / `invalidate_provider(...)` after
+they commit; entries also expire after CACHE_TTL_SECONDS as a safety net
+(writes from other processes when the LRU backend is used).
+
+    CACHE_BACKEND       lru (default), redis or none
+    CACHE_URL           redis://host:6379/0 for the redis backend
+    CACHE_MAX_ENTRIES   LRU capacity (default 10000)
+    CACHE_TTL_SECONDS   entry lifetime (default 60)
+
+The redis backend works with any client exposing get / set(ex=) / delete
+(redis-py, or a compatible stand-in); `redis` is only imported for CACHE_URL.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "lru")
+CACHE_URL = os.getenv("CACHE_URL")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+
+def latest_risk_key(patient_id: int) -> str:
+    return f"latest-risk:{patient_id}"
+
+
+def provider_patients_key(provider_id: int) -> str:
+    return f"provider-patients:{provider_id}"
+
+
+# BACKENDS
+class LRUBackend:
+    """In-process LRU with per-entry expiry."""
+
+    name = "lru"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared cache across workers on a Redis-compatible client."""
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "uzazisafe:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package: pip install redis")
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+# READ-THROUGH LAYER
+class ReadThroughCache:
+    def __init__(self, backend=None, ttl: float = CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        # Bumped on every invalidation, so a load that raced a write is not stored
+        self._versions: dict[str, int] = {}
+
+    def get_or_load(self, key: str, load: Callable[[], bytes]) -> bytes:
+        """Cached bytes for `key`, or `load()` stored for next time. Exceptions from load are not cached."""
+        if self.backend is None:
+            return load()
+        try:
+            cached = self.backend.get(key)
+        except Exception:
+            # A cache outage degrades to uncached reads, never to errors
+            cached = None
+            self.errors += 1
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            version = self._versions.get(key, 0)
+
+        value = load()
+        with self._lock:
+            stale = self._versions.get(key, 0) != version
+        if not stale:
+            try:
+                self.backend.set(key, value, self.ttl)
+            except Exception:
+                self.errors += 1
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        if self.backend is None or not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+            self.invalidations += len(keys)
+        try:
+            self.backend.delete(*keys)
+        except Exception:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else "none",
+            "entries": self.backend.size() if self.backend else 0,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.invalidations = self.errors = 0
+
+
+def create_backend(name: str = CACHE_BACKEND, url: Optional[str] = CACHE_URL):
+    if name == "none":
+        return None
+    if name == "redis":
+        if not url:
+            raise RuntimeError("CACHE_BACKEND=redis requires CACHE_URL")
+        return RedisBackend.from_url(url)
+    return LRUBackend(CACHE_MAX_ENTRIES)
+
+
+cache = ReadThroughCache(create_backend())
+
+
+# INVALIDATION (call after the write has committed)
+def invalidate_patient(patient_id: Optional[int], provider_id: Optional[int] = None) -> None:
+    """A patient's risk or static details changed, or the patient was removed."""
+    keys = []
+    if patient_id is not None:
+        keys.append(latest_risk_key(patient_id))
+    if provider_id is not None:
+        keys.append(provider_patients_key(provider_id))
+    cache.invalidate(*keys)
+
+
+def invalidate_provider(*provider_ids: Optional[int]) -> None:
+    """Patients were added to or removed from these providers' lists."""
+    cache.invalidate(*(provider_patients_key(p) for p in set(provider_ids) if p is not None))
@@ -1,5 +1,11 @@
 # database.py
-from sqlalchemy import create_engine
+import math
+import re
+import time
+from contextlib import contextmanager
+from http.cookies import CookieError, SimpleCookie
+from fastapi import Request
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 import os
@@ -16,11 +22,155 @@ connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite")
 engine = create_engine(DATABASE_URL, echo=False, future=True, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
+# Optional read replica for read-only routes (see get_read_db); defaults to the primary
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+if DATABASE_READ_URL:
+    read_connect_args = {"check_same_thread": False} if DATABASE_READ_URL.startswith("sqlite") else {}
+    read_engine = create_engine(DATABASE_READ_URL, echo=False, future=True, connect_args=read_connect_args)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, future=True)
+
+# How long a caller's reads stay on the primary after they wrote (covers replica lag)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
 Base = declarative_base()
 
+def add_missing_columns(bind, table) -> list[str]:
+    """
+    Add columns the model declares but an existing table lacks (create_all only creates tables).
+    New columns must be nullable or have a server default.
+    """
+    existing = {column["name"] for column in inspect(bind).get_columns(table.name)}
+    added = []
+    with bind.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=bind.dialect)}"
+            if column.server_default is not None:
+                default = column.server_default.arg
+                if not isinstance(default, str):
+                    default = default.compile(dialect=bind.dialect)
+                ddl += f" DEFAULT {default}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            conn.execute(text(ddl))
+            added.append(column.name)
+    return added
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# READ-REPLICA ROUTING
+# The caller carries the time of their last write, in a cookie or (for clients without
+# cookies) a header echoed back from the write's response, so any worker can route them
+WRITE_COOKIE = "uzazisafe_last_write"
+WRITE_HEADER = "x-last-write"
+# POSTs that change nothing; they must not send their caller's reads to the primary
+NOT_WRITES = re.compile(r"^/auth/login$|^/providers/\d+/events/token$")
+
+
+def last_write(scope) -> float:
+    """Unix time of the caller's last write according to the request, 0 if unknown."""
+    for name, value in scope.get("headers", ()):
+        try:
+            if name == WRITE_HEADER.encode():
+                return float(value.decode("latin-1"))
+            if name == b"cookie":
+                cookie = SimpleCookie(value.decode("latin-1")).get(WRITE_COOKIE)
+                if cookie is not None:
+                    return float(cookie.value)
+        except (ValueError, CookieError):
+            continue
+    return 0.0
+
+
+def wrote_recently(scope, window: float = None) -> bool:
+    window = READ_YOUR_WRITES_SECONDS if window is None else window
+    return time.time() - last_write(scope) < window
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only routes: the replica in DATABASE_READ_URL, except for
+    callers that wrote in the last READ_YOUR_WRITES_SECONDS, who read from the
+    primary so they always see their own writes.
+    """
+    replica = read_engine is not engine and not wrote_recently(request.scope)
+    db = (ReadSessionLocal if replica else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: a successful write sets the last-write cookie and
+    X-Last-Write header on its response. Only that caller carries them, so
+    nobody else sharing their address is pinned to the primary.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http" or scope["method"] in self.SAFE_METHODS
+            or read_engine is engine or NOT_WRITES.match(scope["path"])
+        ):
+            return await self.app(scope, receive, send)
+
+        async def send_and_mark(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                now = f"{time.time():.3f}"
+                max_age = math.ceil(READ_YOUR_WRITES_SECONDS)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", f"{WRITE_COOKIE}={now}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax".encode()),
+                    (WRITE_HEADER.encode(), now.encode()),
+                ]
+            await send(message)
+
+        return await self.app(scope, receive, send_and_mark)
+
+
+class QueryCount:
+    """SQL statements and commits seen by count_queries(); each one is a database round trip."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.statements) + self.commits
+
+
+@contextmanager
+def count_queries(bind=None):
+    """Count the statements and commits issued on `bind` (default: the app engine) inside the block."""
+    bind = bind or engine
+    counter = QueryCount()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    def on_commit(conn):
+        counter.commits += 1
+
+    event.listen(bind, "before_cursor_execute", on_execute)
+    event.listen(bind, "commit", on_commit)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", on_execute)
+        event.remove(bind, "commit", on_commit)
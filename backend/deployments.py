@@ -0,0 +1,98 @@
+"""
+Model deployments shared by every worker.
+
+`POST /admin/model/reload` records the deployment (backend and model name)
+in model_deployments and reloads the worker that handled it straight away.
+Every worker polls the latest row every MODEL_SYNC_SECONDS (default 5, 0
+turns polling off) and reloads when it has not applied that row yet, so all
+workers serve the deployed model within one interval and a worker started
+later loads it too. Model names are resolved inside MODELS_DIR on every
+worker; a raw path is never accepted.
+
+Shadow scoring is not broadcast: it runs in the worker that started it, and
+`DELETE /admin/model/shadow` only reaches that worker's statistics.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .ml.backends import resolve_model_name
+
+logger = logging.getLogger(__name__)
+
+MODEL_SYNC_SECONDS = float(os.getenv("MODEL_SYNC_SECONDS", "5"))
+
+# Id of the deployment this process serves (or is loading); inherited by forked workers
+_applied_id: Optional[int] = None
+
+
+def record(db: Session, backend: str, model: Optional[str], user_id: Optional[int] = None) -> models.ModelDeployment:
+    """Store a deployment this process has already started loading."""
+    global _applied_id
+    deployment = models.ModelDeployment(backend=backend, model=model, deployed_by=user_id)
+    db.add(deployment)
+    db.commit()
+    db.refresh(deployment)
+    _applied_id = deployment.id
+    return deployment
+
+
+def latest(db: Session) -> Optional[models.ModelDeployment]:
+    return db.query(models.ModelDeployment).order_by(models.ModelDeployment.id.desc()).first()
+
+
+def sync(db: Session, registry) -> bool:
+    """Start loading the latest deployment if this process has not; True if a reload started."""
+    global _applied_id
+    deployment = latest(db)
+    if deployment is None or deployment.id == _applied_id:
+        return False
+    path = resolve_model_name(deployment.model) if deployment.model else None
+    # Load the configured model first, so a reload of "the current artifact" has one to keep
+    registry.current()
+    if not registry.reload_async(deployment.backend, path):
+        # Another reload is running; the next poll retries
+        return False
+    _applied_id = deployment.id
+    return True
+
+
+def load_latest(db: Session, registry) -> None:
+    """Load the latest deployment synchronously (pre-fork master, before the workers exist)."""
+    global _applied_id
+    deployment = latest(db)
+    if deployment is None or deployment.id == _applied_id:
+        return
+    path = resolve_model_name(deployment.model) if deployment.model else None
+    active = registry.current()
+    # Same rule as ModelRegistry.reload_async: no model name keeps the active backend's artifact
+    if path is not None or deployment.backend != active.name:
+        registry.load(deployment.backend, path)
+    _applied_id = deployment.id
+
+
+def start_sync(registry, interval: float = MODEL_SYNC_SECONDS) -> Optional[threading.Thread]:
+    """Poll for new deployments every `interval` seconds on a daemon thread."""
+    if interval <= 0:
+        return None
+    from .database import SessionLocal
+
+    def loop():
+        while True:
+            db = SessionLocal()
+            try:
+                sync(db, registry)
+            except Exception:
+                logger.exception("Model deployment sync failed; retrying in %ss", interval)
+            finally:
+                db.close()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="model-sync", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,122 @@
+"""
+In-process publish/subscribe hub for provider dashboard updates.
+
+Write paths call `hub.publish(provider_id, type, data)` after they commit;
+`GET /providers/{provider_id}/events` streams those events to connected
+dashboards as Server-Sent Events, so they no longer poll /providers/me,
+/risk-summary and /activity on a timer.
+
+Each event is serialized once, however many dashboards receive it. Every
+connection has a bounded queue: a client that falls behind gets its
+backlog replaced by a single `resync` event (refetch everything) instead
+of growing memory. Idle connections are coroutines waiting on their queue,
+with a comment line every EVENTS_HEARTBEAT_SECONDS to keep proxies open;
+they hold no thread and no database connection.
+
+Events only reach dashboards connected to the worker that handled the write.
+"""
+import asyncio
+import itertools
+import os
+import threading
+from typing import Optional
+
+from .responses import dumps
+
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+RESYNC = b"event: resync\ndata: {}\n\n"
+HEARTBEAT = b": keep-alive\n\n"
+
+
+def sse_frame(event_id: int, event_type: str, data: dict) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_type.encode(), dumps(data))
+
+
+class Subscriber:
+    """One connected dashboard. Only touched from its event loop."""
+
+    def __init__(self, provider_id: int, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.provider_id = provider_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.resyncs = 0
+
+    def offer(self, frame: bytes) -> None:
+        if self.queue.full():
+            # Too far behind: drop the backlog, the client refetches on resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            self.resyncs += 1
+            return
+        self.queue.put_nowait(frame)
+
+
+class EventHub:
+    def __init__(self, max_queue: int = EVENTS_QUEUE_SIZE, heartbeat: float = EVENTS_HEARTBEAT_SECONDS):
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self.published = 0
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, provider_id: int) -> Subscriber:
+        """Register a dashboard; call from the event loop that will read it."""
+        subscriber = Subscriber(provider_id, asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(provider_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.provider_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.provider_id]
+
+    def publish(self, provider_id: Optional[int], event_type: str, data: dict) -> int:
+        """Send an event to the provider's dashboards from any thread; returns how many were connected."""
+        if provider_id is None:
+            return 0
+        with self._lock:
+            subscribers = list(self._subscribers.get(provider_id, ()))
+            self.published += 1
+        if not subscribers:
+            return 0
+        frame = sse_frame(next(self._ids), event_type, data)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, frame)
+            except RuntimeError:
+                # Loop already closed (shutdown); the stream's cleanup will unsubscribe it
+                pass
+        return len(subscribers)
+
+    async def stream(self, provider_id: int):
+        """SSE byte stream for one dashboard; unsubscribes when the client disconnects."""
+        subscriber = self.subscribe(provider_id)
+        try:
+            yield b"retry: 5000\nevent: ready\ndata: {}\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        with self._lock:
+            connections = sum(len(s) for s in self._subscribers.values())
+            return {
+                "connections": connections,
+                "providers": len(self._subscribers),
+                "published": self.published,
+            }
+
+
+hub = EventHub()
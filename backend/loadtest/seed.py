@@ -0,0 +1,107 @@
+"""
+Create load-test accounts directly in the database.
+
+    DATABASE_URL=sqlite:///./loadtest.db python -m backend.loadtest.seed --patients 200 --providers 12
+
+Writes an accounts file that `backend/locustfile.py` hands out so every
+simulated user logs in as a different patient or provider.
+"""
+import argparse
+import json
+import sys
+from typing import Optional
+
+from sqlalchemy import insert
+
+from .. import models, schemas
+from ..database import Base, SessionLocal, engine
+from ..utils import hash_password
+
+DEFAULT_PASSWORD = "LoadTest123!"
+DEFAULT_ACCOUNTS_FILE = "loadtest_accounts.json"
+
+
+def seed_accounts(db, patients: int, providers: int, password: str = DEFAULT_PASSWORD, prefix: str = "lt") -> dict:
+    """Bulk insert providers across every hospital and patients assigned to them."""
+    hospitals = [h.value for h in schemas.HospitalName]
+    # Every account shares one bcrypt hash; logins still pay the full verify cost
+    hashed_pw = hash_password(password)
+
+    provider_rows = [
+        {
+            "full_name": f"Load Provider {i}",
+            "email": f"{prefix}.provider{i}@loadtest.local",
+            "hashed_password": hashed_pw,
+            "is_provider": True,
+            "role": "Doctor",
+            "hospital_name": hospitals[i % len(hospitals)],
+        }
+        for i in range(providers)
+    ]
+    provider_ids = db.execute(
+        insert(models.User).returning(models.User.id), provider_rows
+    ).scalars().all() if provider_rows else []
+
+    # Patients are assigned round-robin and belong to their provider's hospital
+    assigned = [i % providers if providers else None for i in range(patients)]
+    patient_rows = [
+        {
+            "full_name": f"Load Patient {prefix} {i}",
+            "email": f"{prefix}.patient{i}@loadtest.local",
+            "hashed_password": hashed_pw,
+            "is_provider": False,
+            "hospital_name": provider_rows[p]["hospital_name"] if p is not None else hospitals[i % len(hospitals)],
+        }
+        for i, p in enumerate(assigned)
+    ]
+    user_ids = db.execute(
+        insert(models.User).returning(models.User.id), patient_rows
+    ).scalars().all() if patient_rows else []
+
+    if user_ids:
+        db.execute(insert(models.Patient), [
+            {
+                "full_name": row["full_name"],
+                "hospital_name": row["hospital_name"],
+                "risk_level": "Unknown",
+                "user_id": user_id,
+                "provider_id": provider_ids[p] if p is not None else None,
+            }
+            for row, user_id, p in zip(patient_rows, user_ids, assigned)
+        ])
+    db.commit()
+
+    return {
+        "password": password,
+        "patients": [{"email": r["email"], "full_name": r["full_name"]} for r in patient_rows],
+        "providers": [
+            {"email": r["email"], "id": provider_id}
+            for r, provider_id in zip(provider_rows, provider_ids)
+        ],
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Seed accounts for the Locust scenarios.")
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--providers", type=int, default=12)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--prefix", default="lt", help="Email prefix, change it to seed a second batch")
+    parser.add_argument("--output", default=DEFAULT_ACCOUNTS_FILE)
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        accounts = seed_accounts(db, args.patients, args.providers, args.password, args.prefix)
+    finally:
+        db.close()
+
+    with open(args.output, "w") as f:
+        json.dump(accounts, f, indent=2)
+    print(f"Seeded {len(accounts['patients'])} patients and {len(accounts['providers'])} providers -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Latency percentiles and SLO checks for the Locust scenarios.
+
+Kept free of Locust imports so the report logic can be unit tested.
+SLO files look like `slos.json` in this folder: a `default` budget,
+optional per-endpoint budgets keyed by "METHOD name" (milliseconds),
+and a `max_failure_ratio`.
+"""
+import csv
+import json
+from typing import Optional
+
+PERCENTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+
+def load_slos(path: Optional[str]) -> dict:
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def budget_for(slos: dict, key: str) -> dict:
+    """Per-endpoint budget merged over the default budget."""
+    return {**slos.get("default", {}), **slos.get("endpoints", {}).get(key, {})}
+
+
+def evaluate(rows: list[dict], slos: dict) -> list[str]:
+    """Return a human readable line for every SLO breach in `rows`."""
+    breaches = []
+    max_failure_ratio = slos.get("max_failure_ratio")
+    for row in rows:
+        key = f"{row['method']} {row['name']}"
+        for metric, limit in budget_for(slos, key).items():
+            value = row.get(metric)
+            if value is not None and value > limit:
+                breaches.append(f"{key}: {metric} {value:.0f} ms > {limit} ms")
+        if max_failure_ratio is not None and row["num_requests"]:
+            ratio = row["num_failures"] / row["num_requests"]
+            if ratio > max_failure_ratio:
+                breaches.append(f"{key}: failure ratio {ratio:.2%} > {max_failure_ratio:.2%}")
+    return breaches
+
+
+def write_report(rows: list[dict], breaches: list[str], path: str) -> None:
+    """Write the per-endpoint table as JSON, or CSV when `path` ends in .csv."""
+    if path.endswith(".csv"):
+        fields = ["method", "name", "num_requests", "num_failures", *PERCENTILES]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+    with open(path, "w") as f:
+        json.dump({"endpoints": rows, "slo_breaches": breaches}, f, indent=2)
@@ -0,0 +1,381 @@
+"""
+Synthetic production-shaped data for capacity testing.
+
+    DATABASE_URL=sqlite:///./capacity.db python -m backend.loadtest.synthetic \
+        --providers 2000 --patients 300000 --history 8 --appointments 4 --seed 7
+
+Vitals, ages and Yes/No flags are drawn from per-risk-class distributions
+fitted to `Maternal Health Data.csv`. Rows are generated with NumPy in
+chunks and written with COPY on PostgreSQL and executemany on SQLite,
+using explicit ids so no RETURNING round-trips are needed. The same seed
+always produces the same data.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import NullPool
+
+from .. import models, schemas
+from ..database import Base, engine as default_engine
+from ..utils import hash_password
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "Maternal Health Data.csv")
+VITAL_COLUMNS = ["Age", "Systolic BP", "Diastolic BP", "Blood Sugar", "Body Temp", "Heart Rate"]
+FLAG_COLUMNS = ["Pre-existing Diabetes", "Gestational Diabetes", "Previous Complications"]
+
+# Clip sampled values to physiologically plausible ranges
+VITAL_BOUNDS = {
+    "Age": (15, 50),
+    "Systolic BP": (70, 200),
+    "Diastolic BP": (40, 130),
+    "Blood Sugar": (3, 25),
+    "Body Temp": (95, 104),
+    "Heart Rate": (50, 130),
+}
+PROVIDER_ROLES = [r.value for r in schemas.ProviderRole]
+APPOINTMENT_TYPES = ["Checkup", "Consultation", "Ultrasound", "Lab Review"]
+FACTOR_TEMPLATES = [
+    "{'Blood Sugar': 0.42, 'Systolic BP': 0.18, 'Age': -0.05}",
+    "{'Diastolic BP': 0.31, 'Heart Rate': 0.12, 'Body Temp': -0.02}",
+    "{'Previous Complications': 0.55, 'Blood Sugar': 0.21}",
+    "{'Blood Sugar': -0.38, 'Systolic BP': -0.11}",
+]
+DAY_US = 86_400 * 1_000_000
+
+
+# DISTRIBUTION FITTING
+def fit_distributions(csv_path: str = CSV_PATH) -> dict:
+    """Per risk class: prior, mean/covariance of the vitals and Yes rates of the flags."""
+    df = pd.read_csv(csv_path).dropna()
+    fitted = {}
+    for label, group in df.groupby("Risk Level"):
+        vitals = group[VITAL_COLUMNS].to_numpy(dtype=float)
+        fitted[label] = {
+            "prior": len(group) / len(df),
+            "mean": vitals.mean(axis=0),
+            "cov": np.cov(vitals, rowvar=False),
+            "flag_rates": np.array([(group[c] == "Yes").mean() for c in FLAG_COLUMNS]),
+        }
+    return fitted
+
+
+def sample_vitals(rng: np.random.Generator, fitted: dict, is_high: np.ndarray) -> np.ndarray:
+    """Draw one row of vitals per entry of `is_high` from the matching class."""
+    out = np.empty((len(is_high), len(VITAL_COLUMNS)))
+    for label, mask in (("High", is_high), ("Low", ~is_high)):
+        n = int(mask.sum())
+        if n:
+            out[mask] = rng.multivariate_normal(fitted[label]["mean"], fitted[label]["cov"], size=n)
+    for i, col in enumerate(VITAL_COLUMNS):
+        low, high = VITAL_BOUNDS[col]
+        np.clip(out[:, i], low, high, out=out[:, i])
+    return out
+
+
+def _timestamps(epoch_us: np.ndarray) -> list[str]:
+    """Microsecond epochs -> 'YYYY-MM-DD HH:MM:SS.ffffff' strings (SQLAlchemy's SQLite format)."""
+    as_str = np.datetime_as_string(epoch_us.astype("datetime64[us]"), unit="us")
+    return np.char.replace(as_str, "T", " ").tolist()
+
+
+# ROW GENERATION
+def generate_providers(rng, start_id: int, count: int, hashed_pw: str, now_us: int) -> dict:
+    hospitals = np.array([h.value for h in schemas.HospitalName])
+    ids = np.arange(start_id, start_id + count)
+    created = now_us - rng.integers(30, 720, size=count) * DAY_US
+    return {
+        "id": ids.tolist(),
+        "full_name": [f"Dr Synthetic {i}" for i in ids],
+        "email": [f"synthetic.provider{i}@uzazisafe.test" for i in ids],
+        "hashed_password": [hashed_pw] * count,
+        "is_provider": [True] * count,
+        "role": np.array(PROVIDER_ROLES)[rng.integers(0, len(PROVIDER_ROLES), size=count)].tolist(),
+        "hospital_name": hospitals[ids % len(hospitals)].tolist(),
+        "created_at": _timestamps(created),
+    }
+
+
+def generate_patient_chunk(
+    rng: np.random.Generator,
+    fitted: dict,
+    provider_ids: np.ndarray,
+    provider_hospitals: np.ndarray,
+    user_start: int,
+    patient_start: int,
+    history_start: int,
+    appointment_start: int,
+    count: int,
+    history_mean: float,
+    appointments_mean: float,
+    hashed_pw: str,
+    now_us: int,
+    days: int,
+) -> dict[str, dict]:
+    """Generate users, patients, risk history and appointments for `count` patients."""
+    high_prior = fitted["High"]["prior"]
+    is_high = rng.random(count) < high_prior
+    base_vitals = sample_vitals(rng, fitted, is_high)
+    ages = base_vitals[:, 0].round().astype(int)
+
+    flag_rates = np.where(is_high[:, None], fitted["High"]["flag_rates"], fitted["Low"]["flag_rates"])
+    flags = np.where(rng.random((count, len(FLAG_COLUMNS))) < flag_rates, "Yes", "No")
+
+    owner = rng.integers(0, len(provider_ids), size=count)
+    provider_col = provider_ids[owner]
+    hospital_col = provider_hospitals[owner]
+    user_ids = np.arange(user_start, user_start + count)
+    patient_ids = np.arange(patient_start, patient_start + count)
+    names = [f"Synthetic Patient {i}" for i in patient_ids]
+
+    # Risk history: Poisson number of assessments per patient, sorted in time
+    n_hist = rng.poisson(history_mean, size=count)
+    owner_idx = np.repeat(np.arange(count), n_hist)
+    hist_times = now_us - rng.integers(0, days * DAY_US, size=len(owner_idx))
+    order = np.lexsort((hist_times, owner_idx))
+    owner_idx, hist_times = owner_idx[order], hist_times[order]
+    hist_high = is_high[owner_idx]
+    hist_vitals = sample_vitals(rng, fitted, hist_high)
+    high_prob = np.where(hist_high, rng.beta(8, 2, len(owner_idx)), rng.beta(2, 8, len(owner_idx))).round(3)
+    hist_level = np.where(high_prob >= 0.5, "High Risk", "Low Risk")
+
+    # Patient summary mirrors the latest assessment
+    has_hist = n_hist > 0
+    last_idx = np.cumsum(n_hist) - 1
+    first_idx = last_idx - n_hist + 1
+    patient_level = np.full(count, "Unknown", dtype=object)
+    patient_level[has_hist] = hist_level[last_idx[has_hist]]
+    last_assessment = np.full(count, now_us, dtype=np.int64)
+    last_assessment[has_hist] = hist_times[last_idx[has_hist]]
+    patient_created = now_us - rng.integers(0, days * DAY_US, size=count)
+    patient_created[has_hist] = np.minimum(patient_created[has_hist], hist_times[first_idx[has_hist]])
+    user_created = patient_created
+
+    # Appointments: past ones mostly completed, future ones scheduled
+    n_appt = rng.poisson(appointments_mean, size=count)
+    appt_owner = np.repeat(np.arange(count), n_appt)
+    appt_dates = now_us + rng.integers(-days * DAY_US, 60 * DAY_US, size=len(appt_owner))
+    past = appt_dates < now_us
+    past_status = np.array(["Completed", "Cancelled", "Scheduled"])[
+        np.searchsorted([0.75, 0.9], rng.random(len(appt_owner)))
+    ]
+    appt_status = np.where(past, past_status, "Scheduled")
+    appt_created = np.minimum(appt_dates, now_us) - rng.integers(1, 30, size=len(appt_owner)) * DAY_US
+    appt_updated = np.where(appt_status == "Scheduled", appt_created,
+                            np.minimum(appt_dates + DAY_US, now_us))
+
+    hist_count, appt_count = len(owner_idx), len(appt_owner)
+    return {
+        "users": {
+            "id": user_ids.tolist(),
+            "full_name": names,
+            "email": [f"synthetic.patient{i}@uzazisafe.test" for i in patient_ids],
+            "hashed_password": [hashed_pw] * count,
+            "is_provider": [False] * count,
+            "role": [None] * count,
+            "hospital_name": hospital_col.tolist(),
+            "created_at": _timestamps(user_created),
+        },
+        "patients": {
+            "id": patient_ids.tolist(),
+            "full_name": names,
+            "age": ages.tolist(),
+            "pre_existing_diabetes": flags[:, 0].tolist(),
+            "gestational_diabetes": flags[:, 1].tolist(),
+            "previous_complications": flags[:, 2].tolist(),
+            "risk_level": patient_level.tolist(),
+            "last_assessment_date": _timestamps(last_assessment),
+            "hospital_name": hospital_col.tolist(),
+            "provider_id": provider_col.tolist(),
+            "user_id": user_ids.tolist(),
+            "created_at": _timestamps(patient_created),
+        },
+        "risk_history": {
+            "id": np.arange(history_start, history_start + hist_count).tolist(),
+            "patient_id": patient_ids[owner_idx].tolist(),
+            "risk_level": hist_level.tolist(),
+            "high_risk_probability": high_prob.tolist(),
+            "low_risk_probability": (1 - high_prob).round(3).tolist(),
+            "contributing_factors": np.array(FACTOR_TEMPLATES)[
+                rng.integers(0, len(FACTOR_TEMPLATES), size=hist_count)
+            ].tolist(),
+            "created_at": _timestamps(hist_times),
+            "systolic_bp": hist_vitals[:, 1].round(0).tolist(),
+            "diastolic_bp": hist_vitals[:, 2].round(0).tolist(),
+            "blood_sugar": hist_vitals[:, 3].round(1).tolist(),
+            "body_temp": hist_vitals[:, 4].round(1).tolist(),
+            "heart_rate": hist_vitals[:, 5].round(0).tolist(),
+        },
+        "appointments": {
+            "id": np.arange(appointment_start, appointment_start + appt_count).tolist(),
+            "patient_name": [names[i] for i in appt_owner],
+            "date": _timestamps(appt_dates),
+            "appointment_type": np.array(APPOINTMENT_TYPES)[
+                rng.integers(0, len(APPOINTMENT_TYPES), size=appt_count)
+            ].tolist(),
+            "status": appt_status.tolist(),
+            "hospital_name": hospital_col[appt_owner].tolist(),
+            "provider_id": provider_col[appt_owner].tolist(),
+            "created_at": _timestamps(appt_created),
+            "updated_at": _timestamps(appt_updated),
+        },
+    }
+
+
+# BULK WRITERS
+def _write_sqlite(raw_conn, table: str, columns: dict) -> None:
+    names = list(columns)
+    placeholders = ", ".join("?" for _ in names)
+    cursor = raw_conn.cursor()
+    cursor.executemany(
+        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})",
+        zip(*columns.values()),
+    )
+    cursor.close()
+
+
+def _write_postgres(raw_conn, table: str, columns: dict) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(zip(*columns.values()))
+    buffer.seek(0)
+    cursor = raw_conn.cursor()
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.close()
+
+
+def _next_id(conn, model) -> int:
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+# MAIN SEEDING ENTRY POINT
+def seed_synthetic(
+    engine=default_engine,
+    providers: int = 1000,
+    patients: int = 100_000,
+    history_mean: float = 8.0,
+    appointments_mean: float = 4.0,
+    days: int = 365,
+    seed: int = 7,
+    chunk_size: int = 50_000,
+    now: Optional[datetime] = None,
+    log=print,
+) -> dict:
+    """Generate and insert synthetic data; returns inserted row counts per table."""
+    rng = np.random.default_rng(seed)
+    fitted = fit_distributions()
+    now_us = int(((now or datetime.utcnow()) - datetime(1970, 1, 1)).total_seconds() * 1_000_000)
+    # One bcrypt hash shared by every synthetic account keeps generation CPU-bound on NumPy
+    hashed_pw = hash_password(f"synthetic-{seed}")
+    is_postgres = engine.dialect.name == "postgresql"
+    write = _write_postgres if is_postgres else _write_sqlite
+
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        user_id = _next_id(conn, models.User)
+        patient_id = _next_id(conn, models.Patient)
+        history_id = _next_id(conn, models.RiskHistory)
+        appointment_id = _next_id(conn, models.Appointment)
+
+    counts = {"users": 0, "patients": 0, "risk_history": 0, "appointments": 0}
+    started = time.perf_counter()
+    # A connection of its own, closed afterwards: the relaxed SQLite pragmas below
+    # must never reach a pooled connection the app keeps using
+    bulk_engine = create_engine(engine.url, poolclass=NullPool)
+    raw_conn = bulk_engine.raw_connection()
+    try:
+        if not is_postgres:
+            cursor = raw_conn.cursor()
+            cursor.execute("PRAGMA synchronous = OFF")
+            cursor.execute("PRAGMA journal_mode = MEMORY")
+            cursor.close()
+
+        provider_rows = generate_providers(rng, user_id, providers, hashed_pw, now_us)
+        write(raw_conn, "users", provider_rows)
+        raw_conn.commit()
+        counts["users"] += providers
+        user_id += providers
+        provider_ids = np.array(provider_rows["id"])
+        provider_hospitals = np.array(provider_rows["hospital_name"])
+
+        remaining = patients
+        while remaining > 0:
+            n = min(chunk_size, remaining)
+            chunk = generate_patient_chunk(
+                rng, fitted, provider_ids, provider_hospitals,
+                user_id, patient_id, history_id, appointment_id,
+                n, history_mean, appointments_mean, hashed_pw, now_us, days,
+            )
+            for table in ("users", "patients", "risk_history", "appointments"):
+                write(raw_conn, table, chunk[table])
+                counts[table] += len(chunk[table]["id"])
+            raw_conn.commit()
+
+            user_id += n
+            patient_id += n
+            history_id += len(chunk["risk_history"]["id"])
+            appointment_id += len(chunk["appointments"]["id"])
+            remaining -= n
+
+            total = sum(counts.values())
+            elapsed = time.perf_counter() - started
+            log(f"{patients - remaining}/{patients} patients, {total} rows, {total / elapsed:,.0f} rows/s")
+
+        if is_postgres:
+            cursor = raw_conn.cursor()
+            for table in counts:
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                )
+            cursor.execute("ANALYZE")
+            cursor.close()
+            raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+        bulk_engine.dispose()
+
+    return counts
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Seed synthetic production-shaped data.")
+    parser.add_argument("--providers", type=int, default=1000)
+    parser.add_argument("--patients", type=int, default=100_000)
+    parser.add_argument("--history", type=float, default=8.0, help="Mean risk assessments per patient")
+    parser.add_argument("--appointments", type=float, default=4.0, help="Mean appointments per patient")
+    parser.add_argument("--days", type=int, default=365, help="Spread history over this many days")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--now", type=datetime.fromisoformat, default=None,
+                        help="Reference time (ISO format); fix it for byte-identical reruns")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    counts = seed_synthetic(
+        providers=args.providers,
+        patients=args.patients,
+        history_mean=args.history,
+        appointments_mean=args.appointments,
+        days=args.days,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        now=args.now,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Inserted {counts} in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
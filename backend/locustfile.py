@@ -1,75 +1,262 @@
-from locust import HttpUser, task, between
+"""
+UzaziSafe load-test scenarios.
+
+1. Start a local API:     DATABASE_URL=sqlite:///./loadtest.db uvicorn backend.main:app
+2. Seed accounts:         DATABASE_URL=sqlite:///./loadtest.db python -m backend.loadtest.seed
+3. Run headless with SLOs:
+       locust -f backend/locustfile.py --headless -u 50 -r 10 -t 2m \
+              --host http://127.0.0.1:8000 --slo-file backend/loadtest/slos.json
+
+In headless mode the run writes p50/p95/p99 per endpoint to --report-file
+and exits with status 1 when an SLO in --slo-file is breached.
+"""
+import csv
+import itertools
+import json
+import os
 import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from locust import HttpUser, between, events, task
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.loadtest.slo import PERCENTILES, evaluate, load_slos, write_report  # noqa: E402
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, "..", "Maternal Health Data.csv")
+DEFAULT_HOSPITAL = "MediCare Clinic"
+
+ACCOUNTS = {"password": None, "patients": [], "providers": []}
+_patient_counter = itertools.count()
+_provider_counter = itertools.count()
+
+
+def load_vitals(path: str) -> list[dict]:
+    """Complete rows of the maternal health dataset shaped as assessment payloads."""
+    vitals = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            if any(value in ("", None) for value in row.values()):
+                continue
+            vitals.append({
+                "Age": int(row["Age"]),
+                "Systolic_BP": float(row["Systolic BP"]),
+                "Diastolic_BP": float(row["Diastolic BP"]),
+                "Blood_Sugar": float(row["Blood Sugar"]),
+                "Body_Temp": float(row["Body Temp"]),
+                "Heart_Rate": float(row["Heart Rate"]),
+                "Previous_Complications": row["Previous Complications"],
+                "Pre_existing_Diabetes": row["Pre-existing Diabetes"],
+                "Gestational_Diabetes": row["Gestational Diabetes"],
+            })
+    return vitals
+
+
+VITALS = load_vitals(DATASET_PATH)
+
+
+# COMMAND LINE OPTIONS
+@events.init_command_line_parser.add_listener
+def _add_options(parser):
+    parser.add_argument("--accounts-file", default="loadtest_accounts.json",
+                        help="Accounts written by `python -m backend.loadtest.seed`")
+    parser.add_argument("--slo-file", default="", help="JSON SLO budgets, see backend/loadtest/slos.json")
+    parser.add_argument("--report-file", default="loadtest-report.json",
+                        help="Per-endpoint percentile report (.json or .csv)")
+
+
+@events.test_start.add_listener
+def _load_accounts(environment, **kwargs):
+    path = environment.parsed_options.accounts_file
+    if os.path.exists(path):
+        with open(path) as f:
+            ACCOUNTS.update(json.load(f))
+        print(f"Loaded {len(ACCOUNTS['patients'])} patient and {len(ACCOUNTS['providers'])} provider accounts")
+    else:
+        print(f"No accounts file at {path}; patients will sign up on start and provider personas stay idle")
+
+
+# SLO REPORT (HEADLESS)
+def collect_rows(stats) -> list[dict]:
+    rows = []
+    for entry in stats.entries.values():
+        row = {
+            "method": entry.method,
+            "name": entry.name,
+            "num_requests": entry.num_requests,
+            "num_failures": entry.num_failures,
+        }
+        for label, pct in PERCENTILES.items():
+            row[label] = entry.get_response_time_percentile(pct) if entry.num_requests else None
+        rows.append(row)
+    return sorted(rows, key=lambda r: (r["name"], r["method"]))
+
+
+@events.quitting.add_listener
+def _report_slos(environment, **kwargs):
+    options = environment.parsed_options
+    if not options or not options.headless:
+        return
 
-PATIENT_EMAIL = "adrian@gmail.com"
-PATIENT_PASSWORD = "1234"
-PATIENT_NAME = "adrian"
-HOSPITAL = "Medicare Clinic"
+    rows = collect_rows(environment.stats)
+    breaches = evaluate(rows, load_slos(options.slo_file))
+    write_report(rows, breaches, options.report_file)
 
+    print(f"\n{'Endpoint':<45}{'reqs':>8}{'fails':>7}{'p50':>8}{'p95':>8}{'p99':>8}")
+    for row in rows:
+        print(f"{row['method'] + ' ' + row['name']:<45}{row['num_requests']:>8}{row['num_failures']:>7}"
+              + "".join(f"{row[p] or 0:>8.0f}" for p in PERCENTILES))
+    if breaches:
+        print("\nSLO breaches:")
+        for line in breaches:
+            print(f"  {line}")
+        environment.process_exit_code = 1
+    else:
+        print("\nAll SLOs met.")
 
-class HealthcareUser(HttpUser):
+
+# PERSONAS
+class AuthenticatedUser(HttpUser):
+    abstract = True
     wait_time = between(1, 3)
+    headers: dict = {}
+
+    def login(self, email: str, password: str) -> dict:
+        with self.client.post("/auth/login", json={"email": email, "password": password},
+                              catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure(f"Login failed for {email}: {response.status_code}")
+                return {}
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            return response.json()
+
+
+class PatientUser(AuthenticatedUser):
+    """Expectant mother checking her dashboard and submitting vitals."""
+    weight = 4
 
     def on_start(self):
-        """Ensure test user exists, then log in and store JWT token."""
-        response = self.client.post(
-            "/auth/login",
-            data={"email": PATIENT_EMAIL, "password": PATIENT_PASSWORD}
-        )
-
-        if response.status_code != 200:
-            print("User missing — creating test patient...")
-            signup = self.client.post(
-                "/auth/signup/patient",
-                data={
-                    "full_name": PATIENT_NAME,
-                    "email": PATIENT_EMAIL,
-                    "password": PATIENT_PASSWORD,
-                    "hospital_name": HOSPITAL,
-                }
-            )
-
-            # Try login again
-            response = self.client.post(
-                "/auth/login",
-                data={"email": PATIENT_EMAIL, "password": PATIENT_PASSWORD}
-            )
-
-        # Final check
-        try:
-            token = response.json().get("access_token")
-            self.headers = {"Authorization": f"Bearer {token}"}
-        except:
-            print("Login failed, response was not JSON:", response.text)
-            self.headers = {}
-
-    @task
-    def load_patient_dashboard(self):
-        """Patient opens dashboard."""
-        self.client.get("/patients/me", headers=self.headers)
-
-    @task
-    def make_prediction(self):
-        """Simulates a risk assessment call."""
-        fake_data = {
-            "Age": random.randint(20, 40),
-            "Systolic_BP": 120,
-            "Diastolic_BP": 80,
-            "Blood_Sugar": 95,
-            "Body_Temp": 37.0,
-            "Heart_Rate": 82,
-            "Pre_existing_Diabetes": "No",
-            "Gestational_Diabetes": "No",
-            "Previous_Complications": "No",
-        }
+        self.patient_id = None
+        self.provider_id = None
+        patients = ACCOUNTS["patients"]
+        if patients:
+            account = patients[next(_patient_counter) % len(patients)]
+            self.email, self.full_name = account["email"], account["full_name"]
+            password = ACCOUNTS["password"]
+        else:
+            suffix = uuid.uuid4().hex[:10]
+            self.email = f"locust.{suffix}@loadtest.local"
+            self.full_name = f"Locust Patient {suffix}"
+            password = "LoadTest123!"
+            self.client.post("/auth/signup/patient", data={
+                "full_name": self.full_name,
+                "email": self.email,
+                "password": password,
+                "hospital_name": DEFAULT_HOSPITAL,
+            })
+        self.login(self.email, password)
+        self.load_dashboard()
 
-        self.client.post(
-            "/assess-risk/",
-            json=fake_data,
-            headers=self.headers,
-        )
+    @task(5)
+    def load_dashboard(self):
+        response = self.client.get("/patients/me", headers=self.headers)
+        if response.status_code == 200:
+            data = response.json()
+            self.patient_id = data.get("patient_id")
+            self.provider_id = data.get("provider_id")
 
-    @task
+    @task(3)
+    def submit_assessment(self):
+        self.client.post("/assess-risk/", json=random.choice(VITALS), headers=self.headers)
+
+    @task(2)
+    def view_history(self):
+        if not self.patient_id:
+            return
+        with self.client.get(f"/assess-risk/patient/{self.patient_id}",
+                             name="/assess-risk/patient/[id]", catch_response=True) as response:
+            # No history yet is an expected state for a fresh account
+            if response.status_code == 404:
+                response.success()
+
+    @task(2)
     def view_appointments(self):
-        """Patient views appointment history."""
-        self.client.get(f"/appointments/patient/{PATIENT_EMAIL}", headers=self.headers)
+        self.client.get(f"/appointments/patient/{self.email}",
+                        name="/appointments/patient/[email]", headers=self.headers)
+
+    @task(1)
+    def book_appointment(self):
+        if not self.provider_id:
+            return
+        when = datetime.utcnow() + timedelta(days=random.randint(1, 60), hours=random.randint(8, 16))
+        self.client.post("/appointments/book", json={
+            "patient_name": self.full_name,
+            "date": when.isoformat(),
+            "appointment_type": random.choice(["Checkup", "Consultation", "Ultrasound"]),
+            "status": "Scheduled",
+            "provider_id": self.provider_id,
+        })
+
+
+class ProviderUser(AuthenticatedUser):
+    """Clinician watching the dashboard, reviewing patients and closing appointments."""
+    weight = 1
+
+    def on_start(self):
+        self.provider_id = None
+        self.patient_ids: list[int] = []
+        self.appointment_ids: list[int] = []
+        providers = ACCOUNTS["providers"]
+        if not providers:
+            self.stop()
+            return
+        account = providers[next(_provider_counter) % len(providers)]
+        self.provider_id = account["id"]
+        self.login(account["email"], ACCOUNTS["password"])
+
+    @task(5)
+    def load_dashboard(self):
+        self.client.get("/providers/me", headers=self.headers)
+
+    @task(3)
+    def risk_summary(self):
+        self.client.get(f"/providers/{self.provider_id}/risk-summary", name="/providers/[id]/risk-summary")
+
+    @task(3)
+    def activity_feed(self):
+        self.client.get(f"/providers/{self.provider_id}/activity", name="/providers/[id]/activity")
+
+    @task(2)
+    def patient_list(self):
+        response = self.client.get(f"/providers/{self.provider_id}/patients", name="/providers/[id]/patients")
+        if response.status_code == 200:
+            self.patient_ids = [p["id"] for p in response.json()]
+
+    @task(2)
+    def patient_summary(self):
+        if not self.patient_ids:
+            return
+        patient_id = random.choice(self.patient_ids)
+        with self.client.get(f"/patients/{patient_id}/latest-risk",
+                             name="/patients/[id]/latest-risk", catch_response=True) as response:
+            if response.status_code == 404:
+                response.success()
+
+    @task(2)
+    def appointments(self):
+        response = self.client.get(f"/providers/{self.provider_id}/appointments",
+                                   name="/providers/[id]/appointments")
+        if response.status_code == 200:
+            self.appointment_ids = [a["id"] for a in response.json() if a["status"] == "Scheduled"]
+
+    @task(1)
+    def update_appointment_status(self):
+        if not self.appointment_ids:
+            return
+        appointment_id = self.appointment_ids.pop(random.randrange(len(self.appointment_ids)))
+        self.client.put(f"/appointments/{appointment_id}/status",
+                        name="/appointments/[id]/status",
+                        json={"status": random.choice(["Completed", "Cancelled"])})
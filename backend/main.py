@@ -1,20 +1,79 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.openapi.utils import get_openapi
-from backend import models
-from backend.database import engine
-from backend.routes import patients, appointments, auth, provider, risk_assess
-import joblib
-import shap
-
-# Create Database Tables
-models.Base.metadata.create_all(bind=engine)
+from backend.startup import FirstResponseMiddleware, milestone, phase, log_report, report
+
+with phase("import_framework"):
+    import os
+    import threading
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.openapi.utils import get_openapi
+
+with phase("import_app"):
+    from backend import models
+    from backend.database import ReadYourWritesMiddleware, add_missing_columns, engine
+    from backend.responses import FastJSONResponse
+    from backend.search import install_search_index
+    from backend.routes import patients, appointments, auth, provider, risk_assess, admin, hospitals
+    from backend.analytics import install_indexes, start_refresher
+    from backend.deployments import start_sync
+    from backend.rescore import install as install_rescore
+    from backend.ml.predictor import MODEL_PATH, MODEL_WATCH_SECONDS, registry as model_registry
+
+# MODEL_PRELOAD: "background" (default) loads the model on a thread after startup so the
+# first requests are not blocked, "eager" loads it before serving, "lazy" on first use
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "background")
+# Skip create_all on every cold start once the schema exists (DB_CREATE_ALL=0)
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "1") == "1"
+
+
+def _load_model():
+    from backend.ml import predictor
+
+    with phase("model_load"):
+        predictor.registry.current()
+    milestone("model_ready")
+    log_report()
+
+
+def setup_database():
+    """Create missing tables, columns and indexes (idempotent)."""
+    models.Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine, models.User.__table__)
+    install_rescore(engine)
+    install_search_index(engine)
+    install_indexes(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create Database Tables
+    if DB_CREATE_ALL:
+        with phase("create_all"):
+            setup_database()
+
+    if MODEL_PRELOAD == "eager":
+        _load_model()
+    elif MODEL_PRELOAD == "background":
+        threading.Thread(target=_load_model, name="model-preload", daemon=True).start()
+
+    start_refresher()
+    start_sync(model_registry)
+    # Background threads start here, in each serving process, never in a pre-fork master
+    if MODEL_WATCH_SECONDS > 0 and MODEL_PATH:
+        model_registry.watch(MODEL_PATH, MODEL_WATCH_SECONDS)
+
+    milestone("app_ready")
+    log_report()
+    yield
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="UzaziSafe API",
     description="Backend API for the UzaziSafe maternal health system",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS Settings
@@ -30,21 +89,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Clients that do not keep cookies echo it back to read their own writes (see database.py)
+    expose_headers=["X-Last-Write"],
 )
 
-# Load Machine Learning Model
-try:
-    model = joblib.load("backend/xgboost_model.pkl")
-    explainer = shap.TreeExplainer(model)
-    print("Model loaded successfully.")
-except Exception as e:
-    print(" Model could not be loaded:", e)
+app.add_middleware(FirstResponseMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 
 # Root endpoint
 @app.get("/")
 def home():
     return {"message": "UzaziSafe Backend is running successfully!"}
 
+
+# Startup timings (cold-start profiling)
+@app.get("/health/startup")
+def startup_timings():
+    return report()
+
 # ==========================================================
 # Include Routers
 # ==========================================================
@@ -53,14 +115,17 @@ app.include_router(patients.router)
 app.include_router(appointments.router)
 app.include_router(provider.router)
 app.include_router(risk_assess.router)
+app.include_router(admin.router)
+app.include_router(hospitals.router)
 
 # Add Bearer Token Authorization in Swagger
 def custom_openapi():
     """
-    Ensures Swagger UI shows and applies Bearer token globally
+    Ensures Swagger UI shows and applies Bearer token globally.
+    Built once per process; routes do not change after startup.
     """
     if app.openapi_schema:
-        del app.openapi_schema  # Force refresh schema each time
+        return app.openapi_schema
     openapi_schema = get_openapi(
         title=app.title,
         version=app.version,
@@ -0,0 +1,301 @@
+"""
+Model backends behind assess_risk().
+
+Every backend takes a float32 feature matrix in FEATURE_NAMES order and
+returns high-risk probabilities, plus optional per-feature contributions
+for the "Top_Contributing_Factors" explanation. The served backend is
+picked per deployment with the MODEL_BACKEND environment variable:
+
+    xgboost (default), random_forest, logistic, nn_optimized, nn_vanilla,
+    cascade (logistic first, XGBoost only inside CASCADE_BAND_LOW..HIGH)
+
+The neural networks are served from their NumPy export (models/*.npz, see
+backend.ml.numpy_nn) when present, so TensorFlow is never imported.
+MODEL_RUNTIME=onnx scores xgboost / random_forest / logistic with their
+ONNX export (models/<name>.onnx, see backend.ml.onnx_export) instead.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+from .features import FEATURE_NAMES
+
+# joblib and pandas are imported where used so importing this module (and the
+# API routes) stays cheap; the first model load pays for them instead.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.getenv("MODELS_DIR", os.path.join(BASE_DIR, "..", "..", "models"))
+
+
+def load_model(path: str):
+    """Load a pickled model or a training artifact bundle directory."""
+    if os.path.isdir(path):
+        with open(os.path.join(path, "metadata.json")) as f:
+            metadata = json.load(f)
+        if metadata.get("feature_names") != FEATURE_NAMES:
+            raise ValueError(f"Artifact at {path} was trained on a different feature order")
+        path = os.path.join(path, metadata.get("model_file", "model.pkl"))
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model file not found at {path}")
+    import joblib
+
+    return joblib.load(path)
+
+
+class ModelBackend:
+    """Common interface for every servable model."""
+
+    name = "base"
+
+    def __init__(self, model, scaler=None):
+        self.model = model
+        self.scaler = scaler
+        self.explainer = None
+
+    def _scaled(self, X: np.ndarray):
+        import pandas as pd
+
+        frame = pd.DataFrame(X, columns=FEATURE_NAMES)
+        return self.scaler.transform(frame) if self.scaler is not None else frame
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """High-risk probability for every row of X."""
+        return np.asarray(self.model.predict_proba(self._scaled(X)))[:, 1]
+
+    def explain(self, X: np.ndarray):
+        """Per-feature contributions (rows, features), or None when unsupported."""
+        return None
+
+
+class TreeBackend(ModelBackend):
+    """XGBoost / random forest, explained with SHAP's TreeExplainer."""
+
+    def __init__(self, model, name: str):
+        super().__init__(model)
+        self.name = name
+        try:
+            import shap
+
+            self.explainer = shap.TreeExplainer(model)
+        except Exception as e:
+            print(f"Warning: SHAP explainer initialization failed — {e}")
+            self.explainer = None
+
+    def explain(self, X: np.ndarray):
+        if self.explainer is None:
+            return None
+        import pandas as pd
+
+        values = np.array(self.explainer.shap_values(pd.DataFrame(X, columns=FEATURE_NAMES)))
+        if values.ndim == 3:
+            # Per-class output: (classes, rows, features) or (rows, features, classes)
+            values = values[1] if values.shape[-1] == len(FEATURE_NAMES) else values[..., 1]
+        return values
+
+
+class LinearBackend(ModelBackend):
+    """Logistic regression on standardized features."""
+
+    name = "logistic"
+
+    def explain(self, X: np.ndarray):
+        # Exact SHAP values of a linear model against the (zero) mean of the scaled data
+        return np.asarray(self._scaled(X)) * self.model.coef_[0]
+
+
+class KerasBackend(ModelBackend):
+    """Keras network with a sigmoid output; TensorFlow is imported only when selected."""
+
+    def __init__(self, model, scaler, name: str):
+        super().__init__(model, scaler)
+        self.name = name
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        scaled = np.asarray(self._scaled(X), dtype=np.float32)
+        return np.asarray(self.model(scaled, training=False)).reshape(-1)
+
+
+class NumpyNNBackend(ModelBackend):
+    """Exported Keras network scored with a pure NumPy forward pass (scaler folded in)."""
+
+    def __init__(self, model, name: str):
+        super().__init__(model)
+        self.name = name
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict_proba(X)
+
+
+class OnnxBackend(ModelBackend):
+    """
+    onnxruntime session for an exported model. Explanations are delegated to
+    the native backend, since SHAP needs the original trees / coefficients.
+    """
+
+    def __init__(self, session, name: str, native: ModelBackend = None):
+        super().__init__(session)
+        self.name = name
+        self.native = native
+        self.explainer = native.explainer if native is not None else None
+        self._input = session.get_inputs()[0].name
+        # Converters emit (label, probabilities); only the probabilities are fetched
+        self._output = session.get_outputs()[1].name
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        prob = self.model.run([self._output], {self._input: np.ascontiguousarray(X, dtype=np.float32)})[0]
+        return np.asarray(prob)[:, 1]
+
+    def explain(self, X: np.ndarray):
+        return self.native.explain(X) if self.native is not None else None
+
+
+class CascadeBackend(ModelBackend):
+    """
+    Two-stage scoring: every row is scored by the cheap model and only rows
+    whose cheap probability falls inside [band_low, band_high] are re-scored
+    (and explained) by the full model.
+    """
+
+    name = "cascade"
+
+    def __init__(self, cheap: ModelBackend, full: ModelBackend, band_low: float, band_high: float):
+        super().__init__(full.model)
+        self.cheap = cheap
+        self.full = full
+        self.explainer = full.explainer
+        self.band_low = band_low
+        self.band_high = band_high
+        self.scored = 0
+        self.escalated = 0
+        self._lock = threading.Lock()
+        # Escalation mask of this thread's last predict_proba, reused when the same rows are explained
+        self._last = threading.local()
+
+    def escalation_mask(self, cheap_prob: np.ndarray) -> np.ndarray:
+        return (cheap_prob >= self.band_low) & (cheap_prob <= self.band_high)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        prob = self.cheap.predict_proba(X)
+        mask = self.escalation_mask(prob)
+        self._last.X, self._last.mask = X, mask
+        if mask.any():
+            prob[mask] = self.full.predict_proba(X[mask])
+        with self._lock:
+            self.scored += len(prob)
+            self.escalated += int(mask.sum())
+        return prob
+
+    def _mask_for(self, X: np.ndarray) -> np.ndarray:
+        if getattr(self._last, "X", None) is X:
+            return self._last.mask
+        return self.escalation_mask(self.cheap.predict_proba(X))
+
+    def explain(self, X: np.ndarray):
+        contributions = self.cheap.explain(X)
+        mask = self._mask_for(X)
+        if mask.any():
+            full = self.full.explain(X[mask])
+            if full is not None:
+                contributions[mask] = full
+        return contributions
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "scored": self.scored,
+                "escalated": self.escalated,
+                "escalation_rate": round(self.escalated / self.scored, 4) if self.scored else 0.0,
+                "band": [self.band_low, self.band_high],
+            }
+
+
+def _load_keras(path: str):
+    try:
+        import keras
+    except ImportError:
+        raise RuntimeError("The neural-network backends require TensorFlow/Keras to be installed")
+    return keras.saving.load_model(path, compile=False)
+
+
+def _models_path(name: str) -> str:
+    return os.path.join(MODELS_DIR, name)
+
+
+def resolve_model_name(model: str) -> str:
+    """
+    Path of the artifact called `model` (a file or bundle directory) in MODELS_DIR.
+    Raises ValueError for names that resolve outside it, so callers never load an arbitrary path.
+    """
+    root = os.path.realpath(MODELS_DIR)
+    path = os.path.realpath(os.path.join(root, model))
+    if path == root or os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Model names must refer to an artifact inside the models directory: {model}")
+    if not os.path.exists(path):
+        raise ValueError(f"No model named {model} in the models directory")
+    return path
+
+
+# BACKEND REGISTRY
+def load_backend(name: str, model_path: str = None) -> ModelBackend:
+    """
+    Build a backend by name. `model_path` overrides the default artifact
+    location for tree models (a .pkl file or a training bundle directory).
+    """
+    if os.getenv("MODEL_RUNTIME", "native") == "onnx" and name in ("xgboost", "random_forest", "logistic"):
+        from .onnx_export import convert, create_session
+
+        if model_path and not model_path.endswith(".onnx"):
+            # A retrained artifact has no export yet: convert it now, so scores and SHAP come from the same model
+            native = _load_native(name, model_path)
+            try:
+                return OnnxBackend(create_session(convert(native).SerializeToString()), name, native)
+            except Exception as e:
+                print(f"Warning: ONNX conversion of {model_path} failed, serving it natively — {e}")
+                return native
+
+        default_path = _models_path(f"{name}.onnx")
+        onnx_path = model_path or default_path
+        # The shipped native model only explains the shipped export; another export is served unexplained
+        same_model = os.path.realpath(onnx_path) == os.path.realpath(default_path)
+        return OnnxBackend(create_session(onnx_path), name, _load_native(name) if same_model else None)
+    return _load_native(name, model_path)
+
+
+def _load_native(name: str, model_path: str = None) -> ModelBackend:
+    if name == "xgboost":
+        return TreeBackend(load_model(model_path or os.path.join(BASE_DIR, "xgboost_model.pkl")), name)
+    if name == "random_forest":
+        return TreeBackend(load_model(model_path or _models_path("random_forest_model.pkl")), name)
+    if name == "logistic":
+        if model_path:
+            # Training bundles store the scaler inside a Pipeline
+            pipeline = load_model(model_path)
+            return LinearBackend(pipeline.named_steps["model"], pipeline.named_steps["scaler"])
+        return LinearBackend(load_model(_models_path("logistic_model.pkl")), load_model(_models_path("scaler.pkl")))
+    if name in ("nn_optimized", "nn_vanilla"):
+        stem = "optimized_nn_model" if name == "nn_optimized" else "vanilla_nn_model"
+        npz_path = model_path if model_path and model_path.endswith(".npz") else _models_path(f"{stem}.npz")
+        if (not model_path or model_path == npz_path) and os.path.exists(npz_path):
+            from .numpy_nn import NumpyMLP
+
+            return NumpyNNBackend(NumpyMLP.load(npz_path), name)
+        return KerasBackend(
+            _load_keras(model_path or _models_path(f"{stem}.keras")),
+            load_model(_models_path("scaler.pkl")),
+            name,
+        )
+    if name == "cascade":
+        return CascadeBackend(
+            cheap=load_backend("logistic"),
+            full=load_backend(os.getenv("CASCADE_FULL_MODEL", "xgboost"), model_path),
+            band_low=float(os.getenv("CASCADE_BAND_LOW", DEFAULT_CASCADE_BAND[0])),
+            band_high=float(os.getenv("CASCADE_BAND_HIGH", DEFAULT_CASCADE_BAND[1])),
+        )
+    raise ValueError(f"Unknown model backend: {name}")
+
+
+BACKEND_NAMES = ("xgboost", "random_forest", "logistic", "nn_optimized", "nn_vanilla", "cascade")
+# Tuned with `python -m backend.ml.cascade`
+DEFAULT_CASCADE_BAND = (0.1, 0.9)
@@ -0,0 +1,165 @@
+"""
+Offline batch scoring for CSV extracts shaped like `Maternal Health Data.csv`.
+
+    python -m backend.ml.batch_score extract.csv scored.parquet --workers 4 --shap
+
+The input is streamed in chunks, each chunk is scored with one vectorized
+predict_proba call (plus SHAP when requested) in a process pool, and
+results are appended to the output as soon as they are ready, in input
+order. Memory use depends on the chunk size, not the file size.
+Parquet output requires `pyarrow`.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import pandas as pd
+
+from . import predictor
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _init_worker():
+    # One process per core already; stop XGBoost from spawning its own threads on top
+    try:
+        predictor.model.set_params(n_jobs=1)
+    except Exception:
+        pass
+
+
+def score_chunk(chunk: pd.DataFrame, with_shap: bool = False) -> pd.DataFrame:
+    """Append prediction columns (and optional SHAP columns) to a chunk."""
+    X = predictor.features_from_frame(chunk)
+    labels, high_prob = predictor.predict_batch(X)
+    scored = chunk.copy()
+    scored["Prediction"] = labels
+    scored["High_Risk_Probability"] = high_prob.round(3)
+    scored["Low_Risk_Probability"] = (1 - high_prob).round(3)
+    if with_shap:
+        shap_values = predictor.explain_batch(X).round(4)
+        for i, feature in enumerate(predictor.FEATURE_NAMES):
+            scored[f"SHAP {feature}"] = shap_values[:, i]
+    return scored
+
+
+class _CsvSink:
+    def __init__(self, path: str):
+        self.path = path
+        self.header = True
+
+    def write(self, frame: pd.DataFrame):
+        frame.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+class _ParquetSink:
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+        self.pa, self.pq = pa, pq
+        self.path = path
+        self.writer = None
+
+    def write(self, frame: pd.DataFrame):
+        table = self.pa.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_sink(path: str, fmt: Optional[str] = None):
+    fmt = fmt or ("parquet" if path.endswith((".parquet", ".pq")) else "csv")
+    return _ParquetSink(path) if fmt == "parquet" else _CsvSink(path)
+
+
+# MAIN SCORING LOOP
+def score_file(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    with_shap: bool = False,
+    output_format: Optional[str] = None,
+    log=print,
+) -> dict:
+    """Score `input_path` chunk by chunk into `output_path`; returns run statistics."""
+    workers = workers or os.cpu_count() or 1
+    sink = open_sink(output_path, output_format)
+    reader = pd.read_csv(input_path, chunksize=chunk_size)
+    rows = 0
+    started = time.perf_counter()
+
+    def _written(frame):
+        nonlocal rows
+        sink.write(frame)
+        rows += len(frame)
+        elapsed = time.perf_counter() - started
+        log(f"{rows:,} rows scored ({rows / elapsed:,.0f} rows/s)")
+
+    try:
+        if workers <= 1:
+            for chunk in reader:
+                _written(score_chunk(chunk, with_shap))
+        else:
+            # Keep a bounded number of chunks in flight so memory stays flat
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                pending = deque()
+                for chunk in reader:
+                    pending.append(pool.submit(score_chunk, chunk, with_shap))
+                    if len(pending) >= workers * 2:
+                        _written(pending.popleft().result())
+                while pending:
+                    _written(pending.popleft().result())
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score a maternal health CSV extract offline.")
+    parser.add_argument("input", help="Input CSV (dataset or API column names)")
+    parser.add_argument("output", help="Output file (.csv or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: all cores)")
+    parser.add_argument("--shap", action="store_true", help="Add per-feature SHAP columns")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="Output format (default: from the output extension)")
+    args = parser.parse_args(argv)
+
+    stats = score_file(
+        args.input, args.output,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        with_shap=args.shap,
+        output_format=args.format,
+        log=lambda msg: print(msg, file=sys.stderr),
+    )
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']}s ({stats['rows_per_second']:,} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Tune the uncertainty band of the cascade backend.
+
+    python -m backend.ml.cascade
+    python -m backend.ml.cascade --bands 0.1:0.9 0.2:0.8 --full-model random_forest
+
+For each band the report shows how often the cheap logistic model has to
+escalate to the full model, how often the cascade agrees with the full
+model, and accuracy / ROC-AUC of both on the hold-out split used by
+backend.ml.training. The recommended band is the one with the lowest
+escalation rate whose accuracy is at least the full model's.
+Serve it with MODEL_BACKEND=cascade CASCADE_BAND_LOW=.. CASCADE_BAND_HIGH=..
+"""
+import argparse
+import sys
+from typing import Optional
+
+import numpy as np
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+DEFAULT_BANDS = [
+    (0.5, 0.5), (0.4, 0.6), (0.3, 0.7), (0.2, 0.8), (0.15, 0.85),
+    (0.1, 0.9), (0.05, 0.95), (0.02, 0.98),
+]
+
+
+def evaluate_band(cheap_prob: np.ndarray, full_prob: np.ndarray, y: np.ndarray, low: float, high: float) -> dict:
+    """Cascade metrics for one band, given both models' probabilities on the same rows."""
+    escalate = (cheap_prob >= low) & (cheap_prob <= high)
+    cascade_prob = np.where(escalate, full_prob, cheap_prob)
+    cascade_pred = cascade_prob >= 0.5
+    full_pred = full_prob >= 0.5
+    return {
+        "band": [low, high],
+        "escalation_rate": round(float(escalate.mean()), 4),
+        "agreement": round(float((cascade_pred == full_pred).mean()), 4),
+        "accuracy": round(float(accuracy_score(y, cascade_pred)), 4),
+        "roc_auc": round(float(roc_auc_score(y, cascade_prob)), 4),
+        "full_accuracy": round(float(accuracy_score(y, full_pred)), 4),
+        "full_roc_auc": round(float(roc_auc_score(y, full_prob)), 4),
+    }
+
+
+def recommend(results: list[dict]) -> Optional[dict]:
+    """Cheapest band that keeps accuracy at or above the full model."""
+    eligible = [r for r in results if r["accuracy"] >= r["full_accuracy"]]
+    return min(eligible, key=lambda r: r["escalation_rate"]) if eligible else None
+
+
+def tune(bands=DEFAULT_BANDS, full_model: str = "xgboost") -> list[dict]:
+    from .backends import load_backend
+    from .training import load_dataset
+
+    X, y = load_dataset()
+    _, X_test, _, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    cheap_prob = load_backend("logistic").predict_proba(X_test)
+    full_prob = load_backend(full_model).predict_proba(X_test)
+    return [evaluate_band(cheap_prob, full_prob, y_test, low, high) for low, high in bands]
+
+
+def _parse_band(text: str) -> tuple[float, float]:
+    low, high = (float(v) for v in text.split(":"))
+    if not 0 <= low <= high <= 1:
+        raise argparse.ArgumentTypeError("band must be low:high with 0 <= low <= high <= 1")
+    return low, high
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep cascade uncertainty bands.")
+    parser.add_argument("--bands", nargs="+", type=_parse_band, default=DEFAULT_BANDS,
+                        help="Bands as low:high, e.g. 0.2:0.8")
+    parser.add_argument("--full-model", default="xgboost", choices=["xgboost", "random_forest"])
+    args = parser.parse_args(argv)
+
+    results = tune(args.bands, args.full_model)
+    print(f"{'band':<14}{'escalated':>10}{'agree':>8}{'acc':>8}{'auc':>8}   full acc / auc")
+    for r in results:
+        print(f"{r['band'][0]:.2f}-{r['band'][1]:.2f}{'':<5}{r['escalation_rate']:>10.1%}{r['agreement']:>8.1%}"
+              f"{r['accuracy']:>8.3f}{r['roc_auc']:>8.3f}   {r['full_accuracy']:.3f} / {r['full_roc_auc']:.3f}")
+
+    best = recommend(results)
+    if best:
+        print(f"\nRecommended: CASCADE_BAND_LOW={best['band'][0]} CASCADE_BAND_HIGH={best['band'][1]} "
+              f"({best['escalation_rate']:.1%} escalated, accuracy {best['accuracy']:.3f})")
+    else:
+        print("\nNo band matched the full model's accuracy; widen the band.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# Model feature order, mapped to the field names used in API payloads
+FEATURE_FIELDS = {
+    "Age": "Age",
+    "Systolic BP": "Systolic_BP",
+    "Diastolic BP": "Diastolic_BP",
+    "Blood Sugar": "Blood_Sugar",
+    "Body Temp": "Body_Temp",
+    "Heart Rate": "Heart_Rate",
+    "Previous Complications": "Previous_Complications",
+    "Pre-existing Diabetes": "Pre_existing_Diabetes",
+    "Gestational Diabetes": "Gestational_Diabetes",
+}
+FEATURE_NAMES = list(FEATURE_FIELDS)
+YES_NO_FEATURES = {"Previous Complications", "Pre-existing Diabetes", "Gestational Diabetes"}
+YES_NO_MAPPING = {"Yes": 1, "No": 0}
+
+# Dataset label column and its positive class
+TARGET_COLUMN = "Risk Level"
+POSITIVE_LABEL = "High"
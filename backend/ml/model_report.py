@@ -0,0 +1,136 @@
+"""
+Latency / accuracy / memory report for every model backend.
+
+    python -m backend.ml.model_report
+    python -m backend.ml.model_report --models xgboost logistic --json report.json
+
+Each backend is measured in a fresh process so load time and resident
+memory are not polluted by the other models. Accuracy and ROC-AUC are
+computed on `Maternal Health Data.csv` (use --holdout to score only the
+split held out by backend.ml.training).
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from .backends import BACKEND_NAMES
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def measure_backend(name: str, holdout: bool = False, repeats: int = 300, batch_rows: int = 10_000) -> dict:
+    """Load one backend and measure it. Runs inside a dedicated process."""
+    from sklearn.metrics import accuracy_score, roc_auc_score
+    from sklearn.model_selection import train_test_split
+
+    from .backends import load_backend
+    from .training import load_dataset
+
+    X, y = load_dataset()
+    if holdout:
+        _, X, _, y = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    backend = load_backend(name)
+    load_seconds = time.perf_counter() - started
+    backend.predict_proba(X[:1])  # warm-up
+    rss_after = _rss_mb()
+
+    prob = backend.predict_proba(X)
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X)][None, :]
+        started = time.perf_counter()
+        backend.predict_proba(row)
+        timings.append(time.perf_counter() - started)
+
+    batch = np.resize(X, (batch_rows, X.shape[1]))
+    started = time.perf_counter()
+    backend.predict_proba(batch)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "model": name,
+        "accuracy": round(float(accuracy_score(y, prob >= 0.5)), 4),
+        "roc_auc": round(float(roc_auc_score(y, prob)), 4),
+        "single_row_p50_ms": round(float(np.median(timings)) * 1e3, 3),
+        "single_row_p95_ms": round(float(np.percentile(timings, 95)) * 1e3, 3),
+        "batch_rows_per_second": round(batch_rows / batch_seconds, 1),
+        "load_seconds": round(load_seconds, 3),
+        "model_rss_mb": round(rss_after - rss_before, 1),
+        "process_rss_mb": round(rss_after, 1),
+        "explanations": backend.explain(X[:1]) is not None,
+    }
+
+
+def _worker(name, holdout, queue):
+    try:
+        queue.put(measure_backend(name, holdout))
+    except Exception as e:
+        queue.put({"model": name, "error": str(e)})
+
+
+def run_report(models, holdout: bool = False) -> list[dict]:
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for name in models:
+        queue = ctx.Queue()
+        process = ctx.Process(target=_worker, args=(name, holdout, queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+    return results
+
+
+def print_report(results: list[dict]) -> None:
+    header = f"{'model':<15}{'acc':>7}{'auc':>7}{'p50 ms':>9}{'p95 ms':>9}{'batch rows/s':>14}{'load s':>8}{'RSS MB':>8}  shap"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['model']:<15}skipped: {r['error']}")
+            continue
+        print(
+            f"{r['model']:<15}{r['accuracy']:>7.3f}{r['roc_auc']:>7.3f}"
+            f"{r['single_row_p50_ms']:>9.3f}{r['single_row_p95_ms']:>9.3f}"
+            f"{r['batch_rows_per_second']:>14,.0f}{r['load_seconds']:>8.2f}{r['model_rss_mb']:>8.1f}"
+            f"  {'yes' if r['explanations'] else 'no'}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare served model backends.")
+    parser.add_argument("--models", nargs="+", choices=BACKEND_NAMES, default=list(BACKEND_NAMES))
+    parser.add_argument("--holdout", action="store_true", help="Evaluate on the training hold-out split only")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_report(args.models, args.holdout)
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
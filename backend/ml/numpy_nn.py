@@ -0,0 +1,200 @@
+"""
+TensorFlow-free inference for the Keras networks in models/.
+
+Export once (needs h5py, not TensorFlow):
+
+    python -m backend.ml.numpy_nn export models/optimized_nn_model.keras \
+        models/optimized_nn_model.npz --scaler models/scaler.pkl
+
+The .npz holds every Dense layer's kernel, bias and activation (Dropout is
+an identity at inference and is dropped; a standalone Activation layer
+becomes the activation of a linear Dense layer before it, or an identity
+layer of its own), plus the StandardScaler
+statistics so the NumPy model takes raw features. Check it against Keras:
+
+    python -m backend.ml.numpy_nn parity models/optimized_nn_model.keras models/optimized_nn_model.npz
+"""
+import argparse
+import json
+import os
+import sys
+import zipfile
+from typing import Optional
+
+import numpy as np
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+    "tanh": np.tanh,
+    "elu": lambda x: np.where(x > 0, x, np.expm1(np.minimum(x, 0))),
+}
+# Layers that do nothing at inference time
+PASSTHROUGH_LAYERS = {"InputLayer", "Dropout", "GaussianNoise", "GaussianDropout"}
+
+
+def _snake_case(class_name: str) -> str:
+    out = []
+    for i, ch in enumerate(class_name):
+        if ch.isupper() and i:
+            out.append("_")
+        out.append(ch.lower())
+    return "".join(out)
+
+
+# EXPORT
+def _append_activation(layers: list[dict], activation: str) -> None:
+    """Apply a standalone Activation layer after the layers read so far."""
+    if activation not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy export: {activation}")
+    if not layers:
+        raise ValueError("Unsupported model for NumPy export: Activation before any Dense layer")
+    if layers[-1]["activation"] == "linear":
+        layers[-1]["activation"] = activation
+        return
+    # The previous Dense layer has its own activation: compose with an identity layer
+    width = layers[-1]["kernel"].shape[1]
+    layers.append({"kernel": np.eye(width, dtype=np.float32), "bias": None, "activation": activation})
+
+
+def read_keras_archive(path: str) -> list[dict]:
+    """Read Dense layers (kernel, bias, activation) from a Keras 3 `.keras` file."""
+    try:
+        import h5py
+    except ImportError:
+        raise RuntimeError("Exporting requires h5py: pip install h5py")
+
+    with zipfile.ZipFile(path) as archive:
+        config = json.loads(archive.read("config.json"))
+        with archive.open("model.weights.h5") as weights_file:
+            weights = h5py.File(weights_file, "r")
+            layers = []
+            seen: dict[str, int] = {}
+            for layer in config["config"]["layers"]:
+                class_name = layer["class_name"]
+                # Keras stores weights as layers/<snake_case>, <snake_case>_1, ... in model order
+                base = _snake_case(class_name)
+                index = seen.get(base, 0)
+                seen[base] = index + 1
+                h5_name = base if index == 0 else f"{base}_{index}"
+
+                if class_name in PASSTHROUGH_LAYERS:
+                    continue
+                if class_name == "Activation":
+                    _append_activation(layers, layer["config"]["activation"])
+                    continue
+                if class_name != "Dense":
+                    raise ValueError(f"Unsupported layer type for NumPy export: {class_name}")
+
+                variables = weights[f"layers/{h5_name}/vars"]
+                activation = layer["config"].get("activation", "linear")
+                if activation not in ACTIVATIONS:
+                    raise ValueError(f"Unsupported activation for NumPy export: {activation}")
+                layers.append({
+                    "kernel": np.asarray(variables["0"], dtype=np.float32),
+                    "bias": (np.asarray(variables["1"], dtype=np.float32)
+                             if layer["config"].get("use_bias", True) else None),
+                    "activation": activation,
+                })
+            weights.close()
+    return layers
+
+
+def export(keras_path: str, output_path: str, scaler_path: Optional[str] = None) -> None:
+    layers = read_keras_archive(keras_path)
+    arrays = {"activations": np.array([layer["activation"] for layer in layers])}
+    for i, layer in enumerate(layers):
+        arrays[f"kernel_{i}"] = layer["kernel"]
+        arrays[f"bias_{i}"] = (layer["bias"] if layer["bias"] is not None
+                               else np.zeros(layer["kernel"].shape[1], dtype=np.float32))
+    if scaler_path:
+        import joblib
+
+        scaler = joblib.load(scaler_path)
+        arrays["scaler_mean"] = scaler.mean_.astype(np.float32)
+        arrays["scaler_scale"] = scaler.scale_.astype(np.float32)
+    np.savez_compressed(output_path, **arrays)
+
+
+# INFERENCE
+class NumpyMLP:
+    """Forward pass of an exported Dense network using only NumPy."""
+
+    def __init__(self, kernels, biases, activations, mean=None, scale=None):
+        self.kernels = kernels
+        self.biases = biases
+        self.activations = [ACTIVATIONS[name] for name in activations]
+        self.mean = mean
+        self.scale = scale
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyMLP":
+        with np.load(path) as data:
+            activations = [str(a) for a in data["activations"]]
+            kernels = [data[f"kernel_{i}"] for i in range(len(activations))]
+            biases = [data[f"bias_{i}"] for i in range(len(activations))]
+            mean = data["scaler_mean"] if "scaler_mean" in data else None
+            scale = data["scaler_scale"] if "scaler_scale" in data else None
+        return cls(kernels, biases, activations, mean, scale)
+
+    def forward(self, X: np.ndarray) -> np.ndarray:
+        out = np.asarray(X, dtype=np.float32)
+        if self.mean is not None:
+            out = (out - self.mean) / self.scale
+        for kernel, bias, activation in zip(self.kernels, self.biases, self.activations):
+            out = activation(out @ kernel + bias)
+        return out
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """High-risk probability per row (sigmoid output unit)."""
+        return self.forward(X).reshape(-1)
+
+
+def parity(keras_path: str, npz_path: str, scaler_path: str) -> float:
+    """Max absolute difference between Keras and NumPy outputs on the dataset."""
+    import joblib
+    import keras
+    import pandas as pd
+
+    from .features import FEATURE_NAMES
+    from .training import load_dataset
+
+    X, _ = load_dataset()
+    scaler = joblib.load(scaler_path)
+    keras_model = keras.saving.load_model(keras_path, compile=False)
+    expected = np.asarray(keras_model(scaler.transform(pd.DataFrame(X, columns=FEATURE_NAMES)).astype(np.float32),
+                                      training=False)).reshape(-1)
+    actual = NumpyMLP.load(npz_path).predict_proba(X)
+    return float(np.max(np.abs(expected - actual)))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export Keras networks for NumPy inference.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="Write a .npz from a .keras file")
+    exp.add_argument("keras_path")
+    exp.add_argument("output_path")
+    exp.add_argument("--scaler", default=None, help="Fold a StandardScaler pickle into the export")
+    chk = sub.add_parser("parity", help="Compare Keras and NumPy outputs (needs Keras)")
+    chk.add_argument("keras_path")
+    chk.add_argument("npz_path")
+    chk.add_argument("--scaler", default=None, help="StandardScaler pickle (default: scaler.pkl in MODELS_DIR)")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export(args.keras_path, args.output_path, args.scaler)
+        print(f"Exported {args.keras_path} -> {args.output_path}")
+        return 0
+
+    if args.scaler is None:
+        from .backends import MODELS_DIR
+
+        args.scaler = os.path.join(MODELS_DIR, "scaler.pkl")
+    diff = parity(args.keras_path, args.npz_path, args.scaler)
+    print(f"Max |keras - numpy| = {diff:.2e}")
+    return 0 if diff < 1e-4 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
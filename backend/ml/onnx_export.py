@@ -0,0 +1,128 @@
+"""
+ONNX export and onnxruntime sessions for the tree and linear models.
+
+    python -m backend.ml.onnx_export                       # all models -> models/<name>.onnx
+    python -m backend.ml.onnx_export --models xgboost --output-dir /tmp
+    python -m backend.ml.onnx_export --parity              # compare against the native models
+
+Serve the exports with MODEL_RUNTIME=onnx (predictions come from
+onnxruntime, SHAP explanations still from the native model). Thread
+counts are read from ONNX_INTRA_OP_THREADS / ONNX_INTER_OP_THREADS.
+Exporting needs skl2onnx and onnxmltools; serving needs onnxruntime only,
+except that a deployed .pkl or bundle is converted when it loads.
+"""
+import argparse
+import os
+import sys
+from typing import Optional, Union
+
+import numpy as np
+
+from .features import FEATURE_NAMES
+
+ONNX_MODELS = ("xgboost", "random_forest", "logistic")
+
+
+# EXPORT
+def _sklearn_model(backend):
+    """The estimator to convert; the logistic scaler is folded into a Pipeline."""
+    if backend.scaler is None:
+        return backend.model
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([("scaler", backend.scaler), ("model", backend.model)])
+
+
+def convert(backend):
+    """Convert a loaded ModelBackend to an ONNX ModelProto with a float32 [N, features] input."""
+    try:
+        import onnxmltools
+        import skl2onnx
+    except ImportError:
+        raise RuntimeError("ONNX export requires skl2onnx and onnxmltools: pip install skl2onnx onnxmltools")
+    shape = [None, len(FEATURE_NAMES)]
+
+    if backend.name == "xgboost":
+        from onnxmltools.convert.common.data_types import FloatTensorType
+
+        # The converter only understands f0..fN feature names
+        booster = backend.model.get_booster().copy()
+        booster.feature_names = None
+        model = backend.model.__class__(**backend.model.get_params())
+        model._Booster = booster
+        model.n_classes_ = backend.model.n_classes_
+        return onnxmltools.convert_xgboost(model, initial_types=[("input", FloatTensorType(shape))], target_opset=15)
+
+    from skl2onnx.common.data_types import FloatTensorType
+
+    return skl2onnx.convert_sklearn(
+        _sklearn_model(backend),
+        initial_types=[("input", FloatTensorType(shape))],
+        options={"zipmap": False},
+        target_opset=15,
+    )
+
+
+def export(name: str, output_path: str) -> str:
+    from .backends import load_backend
+
+    onnx_model = convert(load_backend(name))
+    with open(output_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    return output_path
+
+
+# INFERENCE
+def create_session(path: Union[str, bytes], intra_op_threads: Optional[int] = None,
+                   inter_op_threads: Optional[int] = None):
+    """CPU onnxruntime session with explicit thread pools, from a file or a serialized model."""
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        raise RuntimeError("MODEL_RUNTIME=onnx requires onnxruntime to be installed")
+    if isinstance(path, str) and not os.path.exists(path):
+        raise FileNotFoundError(f"ONNX model not found at {path}; run python -m backend.ml.onnx_export")
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads or int(os.getenv("ONNX_INTRA_OP_THREADS", "1"))
+    options.inter_op_num_threads = inter_op_threads or int(os.getenv("ONNX_INTER_OP_THREADS", "1"))
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def parity(name: str, onnx_path: str) -> float:
+    """Max absolute probability difference between the native model and its export on the dataset."""
+    from .backends import OnnxBackend, load_backend
+    from .training import load_dataset
+
+    X, _ = load_dataset()
+    native = load_backend(name)
+    exported = OnnxBackend(create_session(onnx_path), name)
+    return float(np.max(np.abs(native.predict_proba(X) - exported.predict_proba(X))))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from .backends import MODELS_DIR
+
+    parser = argparse.ArgumentParser(description="Export risk models to ONNX.")
+    parser.add_argument("--models", nargs="+", choices=ONNX_MODELS, default=list(ONNX_MODELS))
+    parser.add_argument("--output-dir", default=MODELS_DIR)
+    parser.add_argument("--parity", action="store_true", help="Check existing exports instead of writing")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name in args.models:
+        path = os.path.join(args.output_dir, f"{name}.onnx")
+        if args.parity:
+            diff = parity(name, path)
+            failed |= diff > 1e-4
+            print(f"{name:<15} max |native - onnx| = {diff:.2e}")
+        else:
+            export(name, path)
+            print(f"Exported {name} -> {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
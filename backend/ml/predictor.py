@@ -1,106 +1,82 @@
-import joblib
 import numpy as np
-import shap
-import pandas as pd
 import os
 
+from .backends import load_backend, load_model
+from .features import FEATURE_FIELDS, FEATURE_NAMES, YES_NO_FEATURES, YES_NO_MAPPING
+from .registry import ModelRegistry
 
-# Load Model and SHAP Explainer
+
+# Load Model Backend and SHAP Explainer
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-MODEL_PATH = os.path.join(BASE_DIR, "xgboost_model.pkl")
+# MODEL_BACKEND picks the served model (see backends.py); MODEL_PATH may point
+# at a .pkl file or at an artifact bundle from backend.ml.training
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "xgboost")
+MODEL_PATH = os.getenv("MODEL_PATH") or None
+MODEL_WATCH_SECONDS = float(os.getenv("MODEL_WATCH_SECONDS", "0"))
 
-if not os.path.exists(MODEL_PATH):
-    raise FileNotFoundError(f"Model file not found at {MODEL_PATH}")
+# The registry owns the served model so it can be swapped without a restart.
+# Nothing is loaded at import; the app preloads it after startup (see main.py)
+# and the first prediction loads it otherwise. The MODEL_WATCH_SECONDS poll
+# starts with the app too, so a pre-fork master never forks with it running.
+registry = ModelRegistry(MODEL_BACKEND, MODEL_PATH)
 
-model = joblib.load(MODEL_PATH)
 
-# SHAP explainer initialization
-try:
-    explainer = shap.TreeExplainer(model)
-except Exception as e:
-    print(f"Warning: SHAP explainer initialization failed — {e}")
-    explainer = None
+def __getattr__(name):
+    # `predictor.backend` / `.model` / `.explainer` always reflect the active model
+    if name == "backend":
+        return registry.current().backend
+    if name in ("model", "explainer"):
+        return getattr(registry.current().backend, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def safe_float(value, default=0.0):
-    try:
-        if value is None or str(value).lower() in ["nan", "none", "null"]:
-            return default
-        return float(value)
-    except Exception:
-        return default
+_YES_NO_COLUMNS = [i for i, feature in enumerate(FEATURE_NAMES) if feature in YES_NO_FEATURES]
+
+
+# Request -> Feature Array
+def features_from_requests(requests) -> np.ndarray:
+    """
+    Feature matrix (rows, features) from validated RiskAssessmentRequest
+    objects. Missing values become 0 ("No" for the history questions).
+    """
+    rows = [[getattr(request, field) for field in FEATURE_FIELDS.values()] for request in requests]
+    for row in rows:
+        for i in _YES_NO_COLUMNS:
+            row[i] = YES_NO_MAPPING.get(row[i], 0)
+    X = np.array(rows, dtype=np.float32).reshape(len(rows), len(FEATURE_NAMES))
+    return np.nan_to_num(X, nan=0.0)
 
 
 # Main Risk Assessment Function
-def assess_risk(data: dict):
+def assess_risk(X_input: np.ndarray):
     """
-    Takes patient health data as a dict and returns:
+    Takes a single-row feature array (see features_from_requests) and returns:
     - Prediction label ("High Risk" / "Low Risk")
     - High / Low risk probabilities
     - SHAP feature contributions
     """
 
-    mapping = {"Yes": 1, "No": 0}
-
-    # Convert and sanitize inputs
-    try:
-        prev_comp = mapping.get(data.get("Previous_Complications", "No"), 0)
-        pre_diab = mapping.get(data.get("Pre_existing_Diabetes", "No"), 0)
-        gest_diab = mapping.get(data.get("Gestational_Diabetes", "No"), 0)
-
-        X_input = pd.DataFrame([{
-            "Age": safe_float(data.get("Age")),
-            "Systolic BP": safe_float(data.get("Systolic_BP")),
-            "Diastolic BP": safe_float(data.get("Diastolic_BP")),
-            "Blood Sugar": safe_float(data.get("Blood_Sugar")),
-            "Body Temp": safe_float(data.get("Body_Temp")),
-            "Heart Rate": safe_float(data.get("Heart_Rate")),
-            "Previous Complications": prev_comp,
-            "Pre-existing Diabetes": pre_diab,
-            "Gestational Diabetes": gest_diab,
-        }])
-    except Exception as e:
-        raise ValueError(f"Invalid input data: {e}")
+    # Pin the active model for the whole request, even if a reload swaps it meanwhile
+    backend = registry.current().backend
 
     # Model Prediction
     try:
-        pred = model.predict(X_input)[0]
-        probs = model.predict_proba(X_input)
+        prob = backend.predict_proba(X_input)
+        high_prob = float(prob[0])
+        low_prob = 1 - high_prob
     except Exception as e:
         raise RuntimeError(f"Model prediction failed: {e}")
 
-    # Normalize probability shape
-    high_prob = 0.0
-    low_prob = 0.0
-
-    if isinstance(probs, (list, np.ndarray)):
-        probs = np.array(probs)
-        if probs.ndim == 2 and probs.shape[1] >= 2:
-            low_prob = safe_float(probs[0][0])
-            high_prob = safe_float(probs[0][1])
-        elif probs.ndim == 1:
-            high_prob = safe_float(probs[0])
-            low_prob = safe_float(1 - high_prob)
-    else:
-        high_prob = safe_float(probs)
-        low_prob = safe_float(1 - high_prob)
-
-    risk_label = "High Risk" if int(pred) == 1 else "Low Risk"
+    risk_label = "High Risk" if high_prob >= 0.5 else "Low Risk"
+    registry.observe(X_input, prob)
 
     # SHAP Values for Explainability
     try:
-        if explainer is not None:
-            shap_values = explainer.shap_values(X_input)
-            shap_values = np.array(shap_values)
-            if shap_values.ndim == 2:
-                shap_values = shap_values[0]
-            elif shap_values.ndim == 3:
-                shap_values = shap_values[0][0]
-
-            feature_names = list(X_input.columns)
+        contributions = backend.explain(X_input)
+        if contributions is not None:
             feature_impacts = {
                 feature: float(np.round(value, 4))
-                for feature, value in zip(feature_names, shap_values)
+                for feature, value in zip(FEATURE_NAMES, contributions[0])
             }
 
             # Sort by absolute impact
@@ -128,3 +104,41 @@ def assess_risk(data: dict):
         "Low_Risk_Probability": round(low_prob, 3),
         "Top_Contributing_Factors": sorted_impacts,
     }
+
+
+# Vectorized Batch Scoring
+def features_from_frame(df: "pd.DataFrame") -> np.ndarray:
+    """
+    Vectorized equivalent of the input mapping in assess_risk().
+    Accepts either dataset column names ("Systolic BP") or API field
+    names ("Systolic_BP"); returns a float32 array in model feature order.
+    """
+    import pandas as pd
+
+    X = np.zeros((len(df), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, (feature, field) in enumerate(FEATURE_FIELDS.items()):
+        column = feature if feature in df.columns else field if field in df.columns else None
+        if column is None:
+            continue
+        values = df[column]
+        if feature in YES_NO_FEATURES:
+            X[:, i] = values.map(YES_NO_MAPPING).fillna(0).to_numpy(dtype=np.float32)
+        else:
+            X[:, i] = pd.to_numeric(values, errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+    return X
+
+
+def predict_batch(X: np.ndarray):
+    """Return (labels, high-risk probabilities) for a feature matrix in one model call."""
+    high_prob = registry.current().backend.predict_proba(X)
+    labels = np.where(high_prob >= 0.5, "High Risk", "Low Risk")
+    return labels, high_prob
+
+
+def explain_batch(X: np.ndarray) -> np.ndarray:
+    """Per-feature contributions for every row, shape (rows, features)."""
+    backend = registry.current().backend
+    contributions = backend.explain(X)
+    if contributions is None:
+        raise RuntimeError(f"The {backend.name} backend does not provide explanations")
+    return contributions
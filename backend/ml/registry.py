@@ -0,0 +1,253 @@
+"""
+Live model slot behind assess_risk(), with hot reload and shadow scoring.
+
+A reload builds the new backend on a background thread, warms it up on a
+few rows (first-call costs such as SHAP/onnxruntime initialization)
+and only then replaces the active model with a single reference
+assignment, so requests in flight finish on the model they started with.
+
+Shadow mode scores a sampled fraction of live requests with a candidate
+model on a separate single worker thread and records agreement with the
+active model and the candidate's latency. Its results are never returned.
+
+MODEL_WATCH_SECONDS > 0 polls MODEL_PATH (file or bundle directory) and
+reloads when its modification time changes.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from .backends import ModelBackend, load_backend
+from .features import FEATURE_NAMES
+
+
+class LoadedModel:
+    """A backend plus where it came from. Never mutated once active."""
+
+    def __init__(self, backend: ModelBackend, name: str, model_path: Optional[str]):
+        self.backend = backend
+        self.name = name
+        self.model_path = model_path
+        self.loaded_at = datetime.utcnow()
+
+    def describe(self) -> dict:
+        return {
+            "backend": self.name,
+            "model_path": self.model_path,
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+def _warm_up(backend: ModelBackend, rows: int = 8) -> None:
+    X = np.zeros((rows, len(FEATURE_NAMES)), dtype=np.float32)
+    backend.predict_proba(X)
+    backend.predict_proba(X[:1])
+    backend.explain(X[:1])
+
+
+def _mtime(path: str) -> float:
+    if os.path.isdir(path):
+        return max([os.path.getmtime(path)] + [
+            os.path.getmtime(os.path.join(path, f)) for f in os.listdir(path)
+        ])
+    return os.path.getmtime(path)
+
+
+class ShadowScorer:
+    """Candidate model scored off the request path on sampled traffic."""
+
+    def __init__(self, candidate: LoadedModel, sample_rate: float, max_latencies: int = 1000):
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.submitted = 0
+        self.scored = 0
+        self.agreed = 0
+        self.errors = 0
+        self.abs_diff_total = 0.0
+        self.latencies = deque(maxlen=max_latencies)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+
+    def maybe_submit(self, X: np.ndarray, active_prob: np.ndarray) -> bool:
+        if random.random() >= self.sample_rate:
+            return False
+        with self._lock:
+            self.submitted += 1
+        self._executor.submit(self._score, X.copy(), np.array(active_prob, copy=True))
+        return True
+
+    def _score(self, X: np.ndarray, active_prob: np.ndarray) -> None:
+        try:
+            started = time.perf_counter()
+            prob = self.candidate.backend.predict_proba(X)
+            elapsed = time.perf_counter() - started
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.scored += len(prob)
+            self.agreed += int(((prob >= 0.5) == (active_prob >= 0.5)).sum())
+            self.abs_diff_total += float(np.abs(prob - active_prob).sum())
+            self.latencies.append(elapsed)
+
+    def drain(self) -> None:
+        """Wait for queued shadow scores (used by tests and on shutdown)."""
+        self._executor.submit(lambda: None).result()
+
+    def stop(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = np.array(self.latencies) * 1e3
+            return {
+                **self.candidate.describe(),
+                "sample_rate": self.sample_rate,
+                "submitted": self.submitted,
+                "scored": self.scored,
+                "errors": self.errors,
+                "agreement": round(self.agreed / self.scored, 4) if self.scored else None,
+                "mean_abs_prob_diff": round(self.abs_diff_total / self.scored, 4) if self.scored else None,
+                "latency_p50_ms": round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None,
+                "latency_p95_ms": round(float(np.percentile(latencies, 95)), 3) if len(latencies) else None,
+            }
+
+
+class ModelRegistry:
+    def __init__(self, default_name: str = "xgboost", default_path: Optional[str] = None,
+                 loader=load_backend, warm_up=_warm_up):
+        self.default_name = default_name
+        self.default_path = default_path
+        self._loader = loader
+        self._warm_up = warm_up
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.active: Optional[LoadedModel] = None
+        self.shadow: Optional[ShadowScorer] = None
+        self.state = "idle"
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+        self._reload_thread: Optional[threading.Thread] = None
+        self._watch_thread: Optional[threading.Thread] = None
+
+    # LOADING
+    def _build(self, name: str, model_path: Optional[str]) -> LoadedModel:
+        backend = self._loader(name, model_path)
+        self._warm_up(backend)
+        return LoadedModel(backend, name, model_path)
+
+    def load(self, name: str, model_path: Optional[str] = None) -> LoadedModel:
+        """Load and activate synchronously (startup, CLI)."""
+        loaded = self._build(name, model_path)
+        self.active = loaded
+        return loaded
+
+    def current(self) -> LoadedModel:
+        """The active model, loading the default one on first use."""
+        loaded = self.active
+        if loaded is None:
+            with self._load_lock:
+                if self.active is None:
+                    self.load(self.default_name, self.default_path)
+                loaded = self.active
+        return loaded
+
+    def _reload(self, name: str, model_path: Optional[str]) -> None:
+        try:
+            loaded = self._build(name, model_path)
+        except Exception as e:
+            with self._lock:
+                self.state = "failed"
+                self.last_error = f"{type(e).__name__}: {e}"
+            print(f"Model reload failed, keeping {self.active.name if self.active else 'nothing'}: {e}")
+            return
+        with self._lock:
+            # Single reference swap; requests holding the old LoadedModel finish on it
+            self.active = loaded
+            self.state = "idle"
+            self.last_error = None
+            self.reloads += 1
+        print(f"Model reloaded: {loaded.describe()}")
+
+    def reload_async(self, name: Optional[str] = None, model_path: Optional[str] = None) -> bool:
+        """
+        Start a background reload. Returns False if one is already running.
+        Without `model_path`, reloading the active backend keeps its current artifact;
+        switching backend loads the new backend's default one.
+        """
+        with self._lock:
+            if self.state == "loading":
+                return False
+            self.state = "loading"
+        active = self.active
+        name = name or (active.name if active else self.default_name)
+        if model_path is None and active is not None and name == active.name:
+            model_path = active.model_path
+        self._reload_thread = threading.Thread(target=self._reload, args=(name, model_path), daemon=True)
+        self._reload_thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if self._reload_thread is not None:
+            self._reload_thread.join(timeout)
+
+    # SHADOW MODE
+    def start_shadow(self, name: str, model_path: Optional[str] = None, sample_rate: float = 0.1) -> dict:
+        scorer = ShadowScorer(self._build(name, model_path), sample_rate)
+        previous, self.shadow = self.shadow, scorer
+        if previous is not None:
+            previous.stop()
+        return scorer.stats()
+
+    def stop_shadow(self) -> Optional[dict]:
+        scorer, self.shadow = self.shadow, None
+        if scorer is None:
+            return None
+        scorer.stop()
+        return scorer.stats()
+
+    def observe(self, X: np.ndarray, active_prob: np.ndarray) -> None:
+        """Hand a scored request to the shadow model, if any. Never raises."""
+        scorer = self.shadow
+        if scorer is not None:
+            try:
+                scorer.maybe_submit(X, active_prob)
+            except Exception as e:
+                print(f"Shadow scoring skipped: {e}")
+
+    # FILE WATCH
+    def watch(self, path: str, interval: float) -> None:
+        """Reload the active backend whenever `path` changes on disk."""
+
+        last = _mtime(path) if os.path.exists(path) else None
+
+        def poll():
+            nonlocal last
+            while True:
+                time.sleep(interval)
+                if not os.path.exists(path):
+                    continue
+                current = _mtime(path)
+                if current != last:
+                    last = current
+                    self.reload_async(None, path)
+
+        self._watch_thread = threading.Thread(target=poll, name="model-watch", daemon=True)
+        self._watch_thread.start()
+
+    def status(self) -> dict:
+        return {
+            "active": self.active.describe() if self.active else None,
+            "state": self.state,
+            "last_error": self.last_error,
+            "reloads": self.reloads,
+            "shadow": self.shadow.stats() if self.shadow else None,
+        }
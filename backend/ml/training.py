@@ -0,0 +1,265 @@
+"""
+Reproducible training for the risk models.
+
+    python -m backend.ml.training --model xgboost --n-iter 30 --output-dir models/
+
+Loads `Maternal Health Data.csv` into typed NumPy arrays, runs a
+cross-validated randomized hyperparameter search on all cores, evaluates
+on a stratified hold-out split and writes a versioned artifact bundle:
+
+    models/xgboost-20250101T120000/
+        model.pkl        fitted estimator (predictor.load_model() reads the folder)
+        metadata.json    feature order, params, metrics, timings, latency
+
+Serve a bundle with MODEL_PATH=models/xgboost-20250101T120000.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy.stats import loguniform, randint, uniform
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .features import FEATURE_NAMES, POSITIVE_LABEL, TARGET_COLUMN, YES_NO_FEATURES, YES_NO_MAPPING
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, "..", "..", "Maternal Health Data.csv")
+DEFAULT_OUTPUT_DIR = os.path.join(BASE_DIR, "..", "..", "models")
+
+NUMERIC_DTYPES = {name: "float32" for name in FEATURE_NAMES if name not in YES_NO_FEATURES}
+
+
+# DATA LOADING
+def load_dataset(csv_path: str = DATASET_PATH) -> tuple[np.ndarray, np.ndarray]:
+    """Return (X float32 [rows, features] in model order, y int8) with incomplete rows dropped."""
+    df = pd.read_csv(
+        csv_path,
+        usecols=[*FEATURE_NAMES, TARGET_COLUMN],
+        dtype={**NUMERIC_DTYPES, **{name: "category" for name in YES_NO_FEATURES}},
+    ).dropna()
+    X = np.empty((len(df), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, name in enumerate(FEATURE_NAMES):
+        column = df[name]
+        if name in YES_NO_FEATURES:
+            column = column.map(YES_NO_MAPPING).astype("float32")
+        X[:, i] = column.to_numpy(dtype=np.float32)
+    y = (df[TARGET_COLUMN] == POSITIVE_LABEL).to_numpy(dtype=np.int8)
+    return X, y
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# MODEL SEARCH SPACES
+def search_space(model_type: str, seed: int):
+    """Return (estimator, parameter distributions) for a model type."""
+    if model_type == "xgboost":
+        from xgboost import XGBClassifier
+
+        # Parallelism comes from the search itself, one thread per fit
+        estimator = XGBClassifier(eval_metric="logloss", n_jobs=1, random_state=seed, tree_method="hist")
+        params = {
+            "n_estimators": randint(100, 600),
+            "max_depth": randint(2, 8),
+            "learning_rate": loguniform(0.01, 0.3),
+            "subsample": uniform(0.6, 0.4),
+            "colsample_bytree": uniform(0.6, 0.4),
+            "min_child_weight": randint(1, 8),
+        }
+    elif model_type == "random_forest":
+        estimator = RandomForestClassifier(n_jobs=1, random_state=seed)
+        params = {
+            "n_estimators": randint(100, 500),
+            "max_depth": [None, 4, 6, 8, 12, 16],
+            "min_samples_leaf": randint(1, 6),
+            "max_features": ["sqrt", "log2", None],
+        }
+    elif model_type == "logistic":
+        estimator = Pipeline([
+            ("scaler", StandardScaler()),
+            ("model", LogisticRegression(max_iter=2000, random_state=seed)),
+        ])
+        params = {
+            "model__C": loguniform(1e-3, 1e2),
+            "model__class_weight": [None, "balanced"],
+        }
+    else:
+        raise ValueError(f"Unknown model type: {model_type}")
+    return estimator, params
+
+
+MODEL_TYPES = ("xgboost", "random_forest", "logistic")
+
+
+# EVALUATION
+def evaluate(model, X: np.ndarray, y: np.ndarray) -> dict:
+    frame = pd.DataFrame(X, columns=FEATURE_NAMES)
+    prob = model.predict_proba(frame)[:, 1]
+    pred = (prob >= 0.5).astype(int)
+    return {
+        "accuracy": round(float(accuracy_score(y, pred)), 4),
+        "roc_auc": round(float(roc_auc_score(y, prob)), 4),
+        "f1": round(float(f1_score(y, pred)), 4),
+        "precision": round(float(precision_score(y, pred)), 4),
+        "recall": round(float(recall_score(y, pred)), 4),
+    }
+
+
+def benchmark_latency(model, X: np.ndarray, repeats: int = 200, batch_rows: int = 10_000) -> dict:
+    """Median single-row predict_proba latency and batch throughput."""
+    single = pd.DataFrame(X[:1], columns=FEATURE_NAMES)
+    model.predict_proba(single)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        model.predict_proba(single)
+        timings.append(time.perf_counter() - started)
+
+    batch = pd.DataFrame(np.resize(X, (batch_rows, X.shape[1])), columns=FEATURE_NAMES)
+    started = time.perf_counter()
+    model.predict_proba(batch)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "single_row_p50_ms": round(float(np.median(timings)) * 1e3, 4),
+        "single_row_p95_ms": round(float(np.percentile(timings, 95)) * 1e3, 4),
+        "batch_rows": batch_rows,
+        "batch_rows_per_second": round(batch_rows / batch_seconds, 1),
+    }
+
+
+# TRAINING ENTRY POINT
+def train(
+    model_type: str = "xgboost",
+    csv_path: str = DATASET_PATH,
+    output_dir: str = DEFAULT_OUTPUT_DIR,
+    n_iter: int = 30,
+    cv: int = 5,
+    test_size: float = 0.2,
+    seed: int = 42,
+    n_jobs: int = -1,
+    log=print,
+) -> str:
+    """Search, fit, evaluate and save one model. Returns the bundle directory."""
+    X, y = load_dataset(csv_path)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, stratify=y, random_state=seed
+    )
+    train_frame = pd.DataFrame(X_train, columns=FEATURE_NAMES)
+
+    estimator, params = search_space(model_type, seed)
+    search = RandomizedSearchCV(
+        estimator,
+        params,
+        n_iter=n_iter,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed),
+        scoring="roc_auc",
+        n_jobs=n_jobs,
+        random_state=seed,
+        refit=True,
+    )
+    log(f"Searching {n_iter} candidates x {cv} folds for {model_type} on {len(X_train)} rows...")
+    started = time.perf_counter()
+    search.fit(train_frame, y_train)
+    training_seconds = time.perf_counter() - started
+
+    model = search.best_estimator_
+    if model_type == "xgboost":
+        model.set_params(n_jobs=None)
+
+    metrics = evaluate(model, X_test, y_test)
+    latency = benchmark_latency(model, X_test)
+    log(f"Hold-out metrics: {metrics}")
+
+    version = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    bundle_dir = os.path.join(output_dir, f"{model_type}-{version}")
+    os.makedirs(bundle_dir, exist_ok=False)
+    joblib.dump(model, os.path.join(bundle_dir, "model.pkl"))
+
+    best_params = {
+        key: (value.item() if isinstance(value, np.generic) else value)
+        for key, value in search.best_params_.items()
+    }
+    metadata = {
+        "model_type": model_type,
+        "version": version,
+        "model_file": "model.pkl",
+        "feature_names": FEATURE_NAMES,
+        "positive_label": POSITIVE_LABEL,
+        "best_params": best_params,
+        "cv_roc_auc": round(float(search.best_score_), 4),
+        "holdout_metrics": metrics,
+        "training_seconds": round(training_seconds, 2),
+        "inference_latency": latency,
+        "dataset": {
+            "path": os.path.basename(csv_path),
+            "sha256": _file_sha256(csv_path),
+            "rows": int(len(X)),
+            "train_rows": int(len(X_train)),
+            "test_rows": int(len(X_test)),
+        },
+        "search": {"n_iter": n_iter, "cv": cv, "seed": seed, "test_size": test_size},
+        "environment": {
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+    }
+    if model_type == "xgboost":
+        import xgboost
+
+        metadata["environment"]["xgboost"] = xgboost.__version__
+    with open(os.path.join(bundle_dir, "metadata.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    log(f"Saved {model_type} artifact to {bundle_dir} ({training_seconds:.1f}s search)")
+    return bundle_dir
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train risk models and write versioned artifacts.")
+    parser.add_argument("--model", choices=[*MODEL_TYPES, "all"], default="xgboost")
+    parser.add_argument("--data", default=DATASET_PATH, help="Training CSV")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--n-iter", type=int, default=30, help="Hyperparameter candidates per model")
+    parser.add_argument("--cv", type=int, default=5, help="Cross-validation folds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel fits (-1 = all cores)")
+    args = parser.parse_args(argv)
+
+    model_types = MODEL_TYPES if args.model == "all" else (args.model,)
+    for model_type in model_types:
+        train(
+            model_type,
+            csv_path=args.data,
+            output_dir=args.output_dir,
+            n_iter=args.n_iter,
+            cv=args.cv,
+            seed=args.seed,
+            n_jobs=args.n_jobs,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,10 +5,14 @@ from sqlalchemy import (
     String,
     Float,
     DateTime,
+    Date,
     Boolean,
     ForeignKey,
+    Index,
     Text,
-    func
+    false,
+    func,
+    text
 )
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -24,6 +28,8 @@ class User(Base):
     is_provider = Column(Boolean, default=False)
     role = Column(String, nullable=True)
     hospital_name = Column(String, nullable=False)
+    # Granted with `python -m backend.admin_users grant <email>`, never through signup
+    is_admin = Column(Boolean, default=False, server_default=false(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -69,11 +75,18 @@ class Patient(Base):
     user = relationship("User", back_populates="patient_profile", foreign_keys=[user_id])
 
     risk_history = relationship("RiskHistory", back_populates="patient", cascade="all, delete")
+    vitals_state = relationship("PatientVitalsState", back_populates="patient", uselist=False, cascade="all, delete")
 
     # Added timestamps for tracking
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Caseload search filters (backend/search.py); the name index is created per dialect there
+    __table_args__ = (
+        Index("ix_patients_provider_risk_assessed", "provider_id", "risk_level", "last_assessment_date"),
+        Index("ix_patients_provider_age", "provider_id", "age"),
+    )
+
 
 # APPOINTMENT MODEL
 class Appointment(Base):
@@ -105,6 +118,9 @@ class RiskHistory(Base):
     low_risk_probability = Column(Float)
     contributing_factors = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # "assessment" (submitted vitals) or "rescore" (a model update re-scoring the latest vitals);
+    # charts, history, trends and assessment counts only use assessments
+    source = Column(String, default="assessment", server_default="assessment", nullable=False)
 
     # Optional: include vital metrics used during risk analysis
     systolic_bp = Column(Float, nullable=True)
@@ -114,3 +130,131 @@ class RiskHistory(Base):
     heart_rate = Column(Float, nullable=True)
 
     patient = relationship("Patient", back_populates="risk_history")
+
+    # Per-patient history in time order (charts, latest risk, time series)
+    # Hospital assessment volume by day (backend/analytics.py) scans only the recent days
+    __table_args__ = (
+        Index("ix_risk_history_patient_created", "patient_id", "created_at"),
+        Index("ix_risk_history_created", "created_at"),
+    )
+
+
+
+# PER-PATIENT VITALS TREND STATE (updated on every assessment, read by provider alerts)
+class PatientVitalsState(Base):
+    __tablename__ = "patient_vitals_state"
+
+    patient_id = Column(Integer, ForeignKey("patients.id"), primary_key=True)
+    assessments = Column(Integer, default=0, nullable=False)
+
+    # Exponentially weighted mean, min / max and slope (per assessment) over the last few readings
+    systolic_bp_ewma = Column(Float, nullable=True)
+    systolic_bp_min = Column(Float, nullable=True)
+    systolic_bp_max = Column(Float, nullable=True)
+    systolic_bp_slope = Column(Float, nullable=True)
+    diastolic_bp_ewma = Column(Float, nullable=True)
+    diastolic_bp_min = Column(Float, nullable=True)
+    diastolic_bp_max = Column(Float, nullable=True)
+    diastolic_bp_slope = Column(Float, nullable=True)
+    blood_sugar_ewma = Column(Float, nullable=True)
+    blood_sugar_min = Column(Float, nullable=True)
+    blood_sugar_max = Column(Float, nullable=True)
+    blood_sugar_slope = Column(Float, nullable=True)
+    body_temp_ewma = Column(Float, nullable=True)
+    body_temp_min = Column(Float, nullable=True)
+    body_temp_max = Column(Float, nullable=True)
+    body_temp_slope = Column(Float, nullable=True)
+    heart_rate_ewma = Column(Float, nullable=True)
+    heart_rate_min = Column(Float, nullable=True)
+    heart_rate_max = Column(Float, nullable=True)
+    heart_rate_slope = Column(Float, nullable=True)
+    high_risk_probability_ewma = Column(Float, nullable=True)
+    high_risk_probability_min = Column(Float, nullable=True)
+    high_risk_probability_max = Column(Float, nullable=True)
+    high_risk_probability_slope = Column(Float, nullable=True)
+
+    # JSON: last readings per metric (bounded window) and the active alert reasons
+    recent_values = Column(Text, nullable=True)
+    alert = Column(Boolean, default=False, nullable=False, index=True)
+    alert_reasons = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    patient = relationship("Patient", back_populates="vitals_state")
+
+    # Optimistic locking: an UPDATE only applies if `assessments` is still what was read,
+    # so two concurrent assessments of one patient cannot overwrite each other's fold
+    __mapper_args__ = {"version_id_col": assessments, "version_id_generator": False}
+
+
+# COHORT RESCORING JOBS (checkpoint for backend.rescore, resumable after a crash)
+class RescoreJob(Base):
+    __tablename__ = "rescore_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, default="running", nullable=False)  # pending / running / stopped / failed / completed
+    model = Column(String, nullable=True)
+    # The runner holding the job; it must renew the lease before lease_expires_at (naive UTC) or lose it
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    # Keyset cursor: every patient with id <= last_patient_id has been rescored
+    last_patient_id = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    total = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # At most one running job across every worker and the CLI
+    __table_args__ = (
+        Index(
+            "uq_rescore_jobs_running", "status", unique=True,
+            sqlite_where=text("status = 'running'"), postgresql_where=text("status = 'running'"),
+        ),
+    )
+
+
+# MODEL DEPLOYMENTS (the latest row is the model every worker should serve, see backend.deployments)
+class ModelDeployment(Base):
+    __tablename__ = "model_deployments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    backend = Column(String, nullable=False)
+    # Artifact name inside MODELS_DIR; NULL keeps the worker's current artifact for the same backend
+    model = Column(String, nullable=True)
+    deployed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# HOSPITAL ANALYTICS SUMMARIES (maintained by backend.analytics, read by /hospitals/*/analytics)
+class ProviderCaseloadSummary(Base):
+    __tablename__ = "provider_caseload_summary"
+
+    provider_id = Column(Integer, primary_key=True)
+    hospital_name = Column(String, nullable=False, index=True)
+    provider_name = Column(String, nullable=False)
+    role = Column(String, nullable=True)
+    patients = Column(Integer, default=0, nullable=False)
+    high_risk_patients = Column(Integer, default=0, nullable=False)
+    appointments = Column(Integer, default=0, nullable=False)
+    completed_appointments = Column(Integer, default=0, nullable=False)
+    cancelled_appointments = Column(Integer, default=0, nullable=False)
+
+
+class DailyAssessmentSummary(Base):
+    __tablename__ = "daily_assessment_summary"
+
+    hospital_name = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    assessments = Column(Integer, default=0, nullable=False)
+    high_risk_assessments = Column(Integer, default=0, nullable=False)
+
+
+class AnalyticsRefresh(Base):
+    __tablename__ = "analytics_refresh"
+
+    id = Column(Integer, primary_key=True)
+    # Days up to and including this one are final in daily_assessment_summary
+    settled_through = Column(Date, nullable=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
+    duration_ms = Column(Float, nullable=True)
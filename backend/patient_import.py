@@ -0,0 +1,290 @@
+"""
+Bulk patient onboarding from CSV.
+
+Used by `POST /admin/patients/import` and from the command line:
+
+    python -m backend.patient_import patients.csv --hospital "MediCare Clinic"
+
+Expected columns: full_name, email, password and optionally hospital_name,
+age, pre_existing_diabetes, gestational_diabetes, previous_complications.
+
+Over the API, rows go to the importing admin's hospital and bcrypt runs on
+one shared pool of IMPORT_HASH_WORKERS processes (default: CPU count), so
+concurrent uploads queue for it instead of each starting a pool of its own.
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import threading
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+from .cache import invalidate_provider
+from .events import hub
+from .utils import hash_password, normalize_email
+
+DEFAULT_BATCH_SIZE = 500
+IMPORT_HASH_WORKERS = int(os.getenv("IMPORT_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    # Forking a threaded web worker can copy held locks into the child; start hashers from a clean process
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+def shared_hash_pool() -> Optional[ProcessPoolExecutor]:
+    """The process-wide hashing pool used by API imports (None when IMPORT_HASH_WORKERS <= 1)."""
+    global _shared_pool
+    if IMPORT_HASH_WORKERS <= 1:
+        return None
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = _process_pool(IMPORT_HASH_WORKERS)
+        return _shared_pool
+
+
+def _clean_row(raw: dict, default_hospital: Optional[str]) -> dict:
+    """Strip whitespace and drop empty cells so Pydantic defaults apply."""
+    row = {
+        (key or "").strip(): value.strip()
+        for key, value in raw.items()
+        if isinstance(value, str) and value.strip() != ""
+    }
+    if "email" in row:
+        row["email"] = normalize_email(row["email"])
+    if "hospital_name" not in row and default_hospital:
+        row["hospital_name"] = default_hospital
+    return row
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+    )
+
+
+def _hash_passwords(passwords: list[str], pool: Optional[ProcessPoolExecutor], workers: int) -> list[str]:
+    """Hash a batch of passwords, spreading the bcrypt work across the pool."""
+    if pool is None or len(passwords) < 2:
+        return [hash_password(p) for p in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(pool.map(hash_password, passwords, chunksize=chunksize))
+
+
+def _providers_by_hospital(db: Session) -> dict[str, list[int]]:
+    """Load every provider id grouped by hospital in a single query."""
+    providers: dict[str, list[int]] = {}
+    rows = db.query(models.User.id, models.User.hospital_name).filter(
+        models.User.is_provider == True
+    )
+    for provider_id, hospital in rows:
+        providers.setdefault(hospital, []).append(provider_id)
+    return providers
+
+
+def _import_batch(
+    db: Session,
+    batch: list[tuple[int, dict]],
+    seen_emails: set[str],
+    providers: dict[str, list[int]],
+    pool: Optional[ProcessPoolExecutor],
+    workers: int,
+    default_hospital: Optional[str],
+    only_hospital: Optional[str],
+    errors: list[schemas.PatientImportError],
+) -> int:
+    """Validate, hash and insert one batch of rows. Returns the number created."""
+    valid: list[tuple[int, schemas.PatientImportRow]] = []
+    for row_number, raw in batch:
+        cleaned = _clean_row(raw, default_hospital)
+        try:
+            row = schemas.PatientImportRow(**cleaned)
+        except ValidationError as e:
+            errors.append(schemas.PatientImportError(
+                row=row_number, email=cleaned.get("email"), error=_validation_message(e)
+            ))
+            continue
+        if only_hospital is not None and row.hospital_name != only_hospital:
+            errors.append(schemas.PatientImportError(
+                row=row_number, email=row.email, error=f"Can only import patients into {only_hospital}"
+            ))
+            continue
+        if row.email in seen_emails:
+            errors.append(schemas.PatientImportError(
+                row=row_number, email=row.email, error="Duplicate email in file"
+            ))
+            continue
+        seen_emails.add(row.email)
+        valid.append((row_number, row))
+
+    if not valid:
+        return 0
+
+    # One set-based lookup for the whole batch instead of a query per row
+    emails = [row.email for _, row in valid]
+    existing = {
+        email.lower() for (email,) in
+        db.query(models.User.email).filter(func.lower(models.User.email).in_(emails))
+    }
+    to_create = []
+    for row_number, row in valid:
+        if row.email in existing:
+            errors.append(schemas.PatientImportError(
+                row=row_number, email=row.email, error="Email already registered"
+            ))
+        else:
+            to_create.append((row_number, row))
+
+    if not to_create:
+        return 0
+
+    hashed = _hash_passwords([row.password for _, row in to_create], pool, workers)
+
+    try:
+        user_ids = dict(db.execute(
+            insert(models.User).returning(models.User.email, models.User.id),
+            [
+                {
+                    "full_name": row.full_name,
+                    "email": row.email,
+                    "hashed_password": hashed_pw,
+                    "is_provider": False,
+                    "hospital_name": row.hospital_name,
+                }
+                for (_, row), hashed_pw in zip(to_create, hashed)
+            ],
+        ).all())
+
+        patient_rows = []
+        for _, row in to_create:
+            candidates = providers.get(row.hospital_name)
+            patient_rows.append({
+                "full_name": row.full_name,
+                "age": row.age,
+                "pre_existing_diabetes": row.pre_existing_diabetes,
+                "gestational_diabetes": row.gestational_diabetes,
+                "previous_complications": row.previous_complications,
+                "hospital_name": row.hospital_name,
+                "risk_level": "Unknown",
+                "user_id": user_ids[row.email],
+                "provider_id": random.choice(candidates) if candidates else None,
+            })
+        db.execute(insert(models.Patient), patient_rows)
+        db.commit()
+        invalidate_provider(*(row["provider_id"] for row in patient_rows))
+        for provider_id, added in Counter(row["provider_id"] for row in patient_rows).items():
+            hub.publish(provider_id, "patients_imported", {"count": added})
+    except Exception as e:
+        db.rollback()
+        for row_number, row in to_create:
+            errors.append(schemas.PatientImportError(
+                row=row_number, email=row.email, error=f"Batch insert failed: {e}"
+            ))
+        return 0
+
+    return len(to_create)
+
+
+# MAIN IMPORT ENTRY POINT
+def import_patients(
+    db: Session,
+    lines: Iterable[str],
+    default_hospital: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: Optional[int] = None,
+    only_hospital: Optional[str] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> schemas.PatientImportResult:
+    """
+    Stream a patient CSV and register every valid row.
+    Rows are processed in batches; a bad row is reported and skipped
+    without aborting the rest of the file. Rows naming a hospital other
+    than `only_hospital` (when given) are rejected. Passwords are hashed
+    on `pool` if given (`workers` is then its size), otherwise on a pool
+    of `workers` processes started for this import.
+    """
+    own_pool = pool is None
+    workers = workers or os.cpu_count() or 1
+    reader = csv.DictReader(lines)
+    missing = {"full_name", "email", "password"} - {(name or "").strip() for name in reader.fieldnames or []}
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+
+    providers = _providers_by_hospital(db)
+    errors: list[schemas.PatientImportError] = []
+    seen_emails: set[str] = set()
+    created = 0
+    total = 0
+
+    # Row numbers are 1-based and count the header line, matching a spreadsheet view
+    numbered = enumerate(reader, start=2)
+    if own_pool and workers > 1:
+        pool = _process_pool(workers)
+    try:
+        while True:
+            batch = list(islice(numbered, batch_size))
+            if not batch:
+                break
+            total += len(batch)
+            created += _import_batch(
+                db, batch, seen_emails, providers, pool, workers, default_hospital, only_hospital, errors
+            )
+    finally:
+        if own_pool and pool is not None:
+            pool.shutdown()
+
+    return schemas.PatientImportResult(
+        total_rows=total,
+        created=created,
+        failed=total - created,
+        errors=errors,
+    )
+
+
+# COMMAND LINE
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import patients from a CSV file.")
+    parser.add_argument("csv_path", help="Path to the patient CSV file")
+    parser.add_argument("--hospital", choices=[h.value for h in schemas.HospitalName],
+                        help="Hospital used for rows without a hospital_name column")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Password hashing processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with open(args.csv_path, newline="", encoding="utf-8-sig") as f:
+            result = import_patients(
+                db, f,
+                default_hospital=args.hospital,
+                batch_size=args.batch_size,
+                workers=args.workers,
+            )
+    finally:
+        db.close()
+
+    print(f"Imported {result.created} of {result.total_rows} rows ({result.failed} failed).")
+    for err in result.errors:
+        print(f"  row {err.row} ({err.email or '-'}): {err.error}", file=sys.stderr)
+    return 0 if result.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Admission control for the expensive endpoints.
+
+Two layers, both rejecting immediately instead of queueing:
+
+* Per-caller token buckets. Each caller (the user in a valid bearer token,
+  otherwise the client address) gets RATE_LIMIT_BURST tokens, refilled at
+  RATE_LIMIT_PER_SECOND. Routes spend a per-route cost (a login costs more
+  than an assessment); an empty bucket answers 429 with Retry-After set to
+  when enough tokens will be back. One address can be a whole clinic behind
+  NAT, so address buckets are RATE_LIMIT_ADDRESS_SCALE times larger; a login
+  also spends from a bucket of the target account at the normal size, which
+  keeps guessing one account's password at the per-user rate.
+* Global concurrency slots on CPU-bound work: model inference and bcrypt.
+  When every slot is busy for ADMISSION_WAIT_SECONDS the request gets 503
+  with Retry-After, so overload shows up as fast rejections rather than an
+  unbounded threadpool queue and exploding tail latency.
+
+    RATE_LIMIT_BACKEND       memory (default, per process) or redis (shared)
+    RATE_LIMIT_URL           redis://host:6379/0 for the redis backend
+    RATE_LIMIT_PER_SECOND    bucket refill rate; 0 disables rate limiting
+    RATE_LIMIT_BURST         bucket size
+    RATE_LIMIT_ADDRESS_SCALE size and refill of address buckets relative to user buckets (default 5)
+    TRUSTED_PROXY_HEADER     client address header set by your proxy (e.g. X-Forwarded-For); unset trusts none
+    TRUSTED_PROXY_HOPS       proxies you run that append to that header (default 1)
+    INFERENCE_CONCURRENCY    concurrent model calls per process (default: CPU count)
+    HASH_CONCURRENCY         concurrent bcrypt calls per process (default: CPU count)
+    ADMISSION_WAIT_SECONDS   how long to wait for a slot before 503 (default 0.05)
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+
+from .utils import ALGORITHM, SECRET_KEY
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL")
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "2"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "20"))
+RATE_LIMIT_ADDRESS_SCALE = float(os.getenv("RATE_LIMIT_ADDRESS_SCALE", "5"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+INFERENCE_CONCURRENCY = int(os.getenv("INFERENCE_CONCURRENCY", str(os.cpu_count() or 2)))
+HASH_CONCURRENCY = int(os.getenv("HASH_CONCURRENCY", str(os.cpu_count() or 2)))
+ADMISSION_WAIT_SECONDS = float(os.getenv("ADMISSION_WAIT_SECONDS", "0.05"))
+# Only read when the app is reachable solely through your proxy, or any client can pick its address
+TRUSTED_PROXY_HEADER = os.getenv("TRUSTED_PROXY_HEADER", "").strip().lower()
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+
+# Tokens spent per request; bcrypt dominates login and signup
+ROUTE_COSTS = {
+    "login": 4,
+    "signup": 4,
+    "assess": 1,
+}
+
+
+def client_address(request: Request) -> str:
+    """The address TRUSTED_PROXY_HOPS entries from the right of the trusted header, else the socket peer."""
+    if TRUSTED_PROXY_HEADER:
+        hops = [part.strip() for part in request.headers.get(TRUSTED_PROXY_HEADER, "").split(",") if part.strip()]
+        if len(hops) >= TRUSTED_PROXY_HOPS > 0:
+            # Entries further left were written by the client and prove nothing
+            return hops[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+def caller_key(request: Request) -> str:
+    """The user a valid bearer token names, otherwise the client address."""
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("bearer "):
+        try:
+            payload = jwt.decode(header[7:], SECRET_KEY, algorithms=[ALGORITHM])
+            if payload.get("sub") and "scope" not in payload:
+                return f"user:{payload['sub']}"
+        except JWTError:
+            pass
+    return f"ip:{client_address(request)}"
+
+
+# TOKEN BUCKET BACKENDS
+class MemoryBuckets:
+    """Buckets for this process, least recently used dropped beyond max_keys (a dropped bucket is full)."""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        """Spend `cost` tokens; returns 0 if allowed, else seconds until they would be available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._buckets)
+
+
+# Atomic refill-and-take on the server, so every worker shares one bucket per caller
+_TAKE_SCRIPT = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 't') or ARGV[3])
+local updated = tonumber(redis.call('HGET', KEYS[1], 'u') or ARGV[4])
+local rate, burst, now, cost = tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[1])
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Buckets shared across workers on a Redis-compatible client with EVAL."""
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "uzazisafe:rate:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBuckets":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the redis package: pip install redis")
+        return cls(redis.Redis.from_url(url))
+
+    def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        return float(self.client.eval(_TAKE_SCRIPT, 1, self.prefix + key, cost, rate, burst, time.time()))
+
+    def clear(self) -> None:
+        pass
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class RateLimiter:
+    def __init__(self, backend, rate: float = RATE_LIMIT_PER_SECOND, burst: float = RATE_LIMIT_BURST):
+        self.backend = backend
+        self.rate = rate
+        self.burst = burst
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+
+    def check(self, key: str, cost: float, scale: float = 1.0) -> float:
+        """0 if the request may proceed, else the Retry-After in seconds; `scale` multiplies rate and burst."""
+        if self.rate <= 0:
+            return 0.0
+        rate, burst = self.rate * scale, self.burst * scale
+        try:
+            wait = self.backend.take(key, min(cost, burst), rate, burst)
+        except Exception:
+            # A limiter outage lets traffic through rather than failing every request
+            self.errors += 1
+            return 0.0
+        if wait > 0:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "tracked_callers": self.backend.size(),
+            "per_second": self.rate,
+            "burst": self.burst,
+            "address_scale": RATE_LIMIT_ADDRESS_SCALE,
+            "costs": ROUTE_COSTS,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "errors": self.errors,
+        }
+
+
+def create_limiter(name: str = RATE_LIMIT_BACKEND, url: Optional[str] = RATE_LIMIT_URL) -> RateLimiter:
+    if name == "redis":
+        if not url:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires RATE_LIMIT_URL")
+        return RateLimiter(RedisBuckets.from_url(url))
+    return RateLimiter(MemoryBuckets())
+
+
+limiter = create_limiter()
+
+
+def spend(key: str, route: str) -> None:
+    """Spend ROUTE_COSTS[route] from the bucket `key`, raising 429 when it is empty."""
+    scale = RATE_LIMIT_ADDRESS_SCALE if key.startswith("ip:") else 1.0
+    wait = limiter.check(key, ROUTE_COSTS[route], scale)
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, slow down",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+def rate_limit(route: str):
+    """Dependency spending ROUTE_COSTS[route] from the caller's bucket; list it before auth and DB dependencies."""
+
+    def dependency(request: Request) -> None:
+        spend(caller_key(request), route)
+
+    return dependency
+
+
+# CONCURRENCY SLOTS
+class ConcurrencyLimit:
+    """At most `limit` holders at once; others wait up to `wait` seconds, then get 503."""
+
+    def __init__(self, name: str, limit: int, wait: float = ADMISSION_WAIT_SECONDS):
+        self.name = name
+        self.limit = limit
+        self.wait = wait
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        # Smoothed time a holder keeps its slot, for Retry-After
+        self._hold_seconds = 0.0
+
+    @contextmanager
+    def slot(self):
+        if self.wait > 0:
+            acquired = self._slots.acquire(timeout=self.wait)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Server busy ({self.name}), retry shortly",
+                headers={"Retry-After": str(max(1, math.ceil(self._hold_seconds)))},
+            )
+        started = time.perf_counter()
+        with self._lock:
+            self.active += 1
+            self.admitted += 1
+        try:
+            yield
+        finally:
+            held = time.perf_counter() - started
+            with self._lock:
+                self.active -= 1
+                self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_hold_ms": round(self._hold_seconds * 1000, 1),
+        }
+
+
+inference_slots = ConcurrencyLimit("inference", INFERENCE_CONCURRENCY)
+hashing_slots = ConcurrencyLimit("hashing", HASH_CONCURRENCY)
+
+
+def admission_stats() -> dict:
+    return {
+        "rate_limit": limiter.stats(),
+        "inference": inference_slots.stats(),
+        "hashing": hashing_slots.stats(),
+    }
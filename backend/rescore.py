@@ -0,0 +1,387 @@
+"""
+Background cohort rescoring after a model update.
+
+Re-scores every patient's latest RiskHistory vitals with the active model,
+so `patients.risk_level` is not stale until each patient submits vitals
+again. Started from `POST /admin/rescore` or the command line:
+
+    python -m backend.rescore --chunk-size 1000
+
+Patients are walked in keyset-paginated chunks (patient_id > cursor), each
+chunk is scored with one vectorized model call and written with bulk
+statements: new RiskHistory rows (source "rescore", so they show as the
+latest risk but stay out of vitals charts, assessment lists, trends and
+assessment counts), the patients' risk_level and the job's checkpoint, all
+in one transaction. A crashed or stopped job resumes after the last
+committed chunk with no duplicate rows. The job runs on its own
+single-connection engine, so it never takes connections from the API pool.
+
+A runner claims the job in the database before running it and renews a
+RESCORE_LEASE_SECONDS lease with every chunk, so only one worker (or CLI
+run) works on it at a time; a job whose runner died is taken over once its
+lease expires.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+import numpy as np
+from sqlalchemy import create_engine, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from . import models
+from .cache import invalidate_patient
+from .events import hub
+from .ml.features import FEATURE_NAMES, YES_NO_FEATURES, YES_NO_MAPPING
+
+RESCORE_CHUNK_SIZE = int(os.getenv("RESCORE_CHUNK_SIZE", "500"))
+# Short pause between chunks so online writes get the database in between
+RESCORE_PAUSE_SECONDS = float(os.getenv("RESCORE_PAUSE_SECONDS", "0.01"))
+RESCORE_LEASE_SECONDS = float(os.getenv("RESCORE_LEASE_SECONDS", "60"))
+RESUMABLE = ("running", "stopped", "failed")
+
+# Model feature -> column of the rescoring query
+FEATURE_COLUMNS = {
+    "Age": "age",
+    "Systolic BP": "systolic_bp",
+    "Diastolic BP": "diastolic_bp",
+    "Blood Sugar": "blood_sugar",
+    "Body Temp": "body_temp",
+    "Heart Rate": "heart_rate",
+    "Previous Complications": "previous_complications",
+    "Pre-existing Diabetes": "pre_existing_diabetes",
+    "Gestational Diabetes": "gestational_diabetes",
+}
+VITALS = ("systolic_bp", "diastolic_bp", "blood_sugar", "body_temp", "heart_rate")
+
+_session_factory = None
+
+
+def job_sessions() -> sessionmaker:
+    """Sessions on a dedicated one-connection engine, separate from the API's pool."""
+    global _session_factory
+    if _session_factory is None:
+        from .database import DATABASE_URL, connect_args
+
+        job_engine = create_engine(
+            DATABASE_URL, future=True, connect_args=connect_args, pool_size=1, max_overflow=0,
+        )
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=job_engine, future=True)
+    return _session_factory
+
+
+def install(bind) -> None:
+    """Bring the rescore_jobs and risk_history tables of an existing database up to date."""
+    from .database import add_missing_columns
+
+    models.Base.metadata.create_all(bind=bind, tables=[models.RescoreJob.__table__])
+    add_missing_columns(bind, models.RiskHistory.__table__)
+    add_missing_columns(bind, models.RescoreJob.__table__)
+    with bind.begin() as conn:
+        for index in models.RescoreJob.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# CHUNK QUERY + FEATURES
+def fetch_chunk(db: Session, after_patient_id: int, limit: int) -> list:
+    """Latest assessment of the next `limit` patients after the cursor, in patient_id order."""
+    R, P = models.RiskHistory, models.Patient
+    latest = (
+        select(R.patient_id, func.max(R.id).label("history_id"))
+        .where(R.patient_id > after_patient_id, R.source == "assessment")
+        .group_by(R.patient_id)
+        .order_by(R.patient_id)
+        .limit(limit)
+        .subquery()
+    )
+    query = (
+        select(
+            R.patient_id, R.systolic_bp, R.diastolic_bp, R.blood_sugar, R.body_temp, R.heart_rate,
+            P.provider_id, P.age, P.pre_existing_diabetes, P.gestational_diabetes, P.previous_complications,
+        )
+        .join(latest, R.id == latest.c.history_id)
+        .join(P, P.id == R.patient_id)
+        .order_by(R.patient_id)
+    )
+    return db.execute(query).all()
+
+
+def features_from_rows(rows) -> np.ndarray:
+    """Model feature matrix from fetch_chunk() rows; missing values become 0 as in assess_risk()."""
+    X = np.zeros((len(rows), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, feature in enumerate(FEATURE_NAMES):
+        column = FEATURE_COLUMNS[feature]
+        if feature in YES_NO_FEATURES:
+            X[:, i] = [YES_NO_MAPPING.get(getattr(row, column), 0) for row in rows]
+        else:
+            X[:, i] = [getattr(row, column) or 0 for row in rows]
+    return X
+
+
+def _default_score(X: np.ndarray):
+    from .ml import predictor
+
+    return predictor.predict_batch(X)
+
+
+class LostClaim(Exception):
+    """Another runner took the job over after this one's lease expired."""
+
+
+def _lease_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=RESCORE_LEASE_SECONDS)
+
+
+def write_chunk(db: Session, job_id: int, rows, labels, high_prob, claim: Optional[str] = None) -> None:
+    """History rows, patient risk levels and the checkpoint for one chunk, in one transaction."""
+    J = models.RescoreJob
+    checkpoint = db.execute(
+        update(J)
+        .where(J.id == job_id, J.claimed_by == claim)
+        .values(
+            last_patient_id=rows[-1].patient_id,
+            processed=J.processed + len(rows),
+            lease_expires_at=_lease_expiry(),
+            updated_at=func.now(),
+        )
+    )
+    if checkpoint.rowcount != 1:
+        db.rollback()
+        raise LostClaim(f"Rescoring job {job_id} was claimed by another runner")
+    db.execute(insert(models.RiskHistory), [
+        {
+            "patient_id": row.patient_id,
+            "risk_level": str(label),
+            "high_risk_probability": round(float(prob), 3),
+            "low_risk_probability": round(1 - float(prob), 3),
+            "contributing_factors": str({}),
+            "source": "rescore",
+            **{vital: getattr(row, vital) for vital in VITALS},
+        }
+        for row, label, prob in zip(rows, labels, high_prob)
+    ])
+    db.execute(update(models.Patient), [
+        {"id": row.patient_id, "risk_level": str(label)} for row, label in zip(rows, labels)
+    ])
+    db.commit()
+    rescored: dict[int, list[int]] = {}
+    for row in rows:
+        invalidate_patient(row.patient_id, row.provider_id)
+        rescored.setdefault(row.provider_id, []).append(row.patient_id)
+    for provider_id, patient_ids in rescored.items():
+        hub.publish(provider_id, "patients_rescored", {"patient_ids": patient_ids})
+
+
+# JOB LIFECYCLE
+def prepare_job(db: Session) -> Optional[models.RescoreJob]:
+    """
+    Claim the latest unfinished job, or a new one over every assessed patient.
+    Returns None while another runner holds a live lease on a running job.
+    """
+    J = models.RescoreJob
+    job = db.query(J).filter(J.status.in_(RESUMABLE)).order_by(J.id.desc()).first()
+    if job is None:
+        total = (
+            db.query(func.count(func.distinct(models.RiskHistory.patient_id)))
+            .filter(models.RiskHistory.source == "assessment")
+            .scalar() or 0
+        )
+        job = J(status="pending", total=total, last_patient_id=0, processed=0)
+        db.add(job)
+        db.flush()
+    now = datetime.utcnow()
+    claim = uuid.uuid4().hex
+    try:
+        claimed = db.execute(
+            update(J)
+            .where(J.id == job.id, or_(J.status != "running", J.lease_expires_at.is_(None), J.lease_expires_at < now))
+            .values(status="running", error=None, claimed_by=claim, lease_expires_at=_lease_expiry(), updated_at=func.now())
+        ).rowcount
+    except IntegrityError:
+        # uq_rescore_jobs_running: another runner started a new job concurrently
+        claimed = 0
+    if not claimed:
+        db.rollback()
+        return None
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def run_job(
+    job_id: int,
+    chunk_size: int = RESCORE_CHUNK_SIZE,
+    pause: float = RESCORE_PAUSE_SECONDS,
+    stop: Optional[threading.Event] = None,
+    sessions: Optional[sessionmaker] = None,
+    score: Callable = _default_score,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Rescore from the job's checkpoint until done, stopped, failed or lost to another runner; returns this run's statistics."""
+    db = (sessions or job_sessions())()
+    job = db.get(models.RescoreJob, job_id)
+    claim = job.claimed_by
+    cursor, scored = job.last_patient_id, 0
+    started = time.perf_counter()
+
+    def stats(status: str) -> dict:
+        elapsed = time.perf_counter() - started
+        return {
+            "job_id": job_id,
+            "status": status,
+            "scored": scored,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(scored / elapsed, 1) if elapsed else 0.0,
+            "last_patient_id": cursor,
+        }
+
+    def finish(status: str, error: Optional[str] = None) -> dict:
+        db.rollback()
+        # Release the claim; a runner that lost it leaves the job to the new holder
+        db.execute(
+            update(models.RescoreJob)
+            .where(models.RescoreJob.id == job_id, models.RescoreJob.claimed_by == claim)
+            .values(
+                status=status, error=error, updated_at=func.now(), claimed_by=None, lease_expires_at=None,
+                finished_at=datetime.utcnow() if status == "completed" else None,
+            )
+        )
+        db.commit()
+        return stats(status)
+
+    try:
+        if job.model is None:
+            from .ml import predictor
+
+            job.model = predictor.registry.current().name
+            db.commit()
+        while True:
+            if stop is not None and stop.is_set():
+                return finish("stopped")
+            rows = fetch_chunk(db, cursor, chunk_size)
+            if not rows:
+                return finish("completed")
+            labels, high_prob = score(features_from_rows(rows))
+            write_chunk(db, job_id, rows, labels, high_prob, claim)
+            cursor, scored = rows[-1].patient_id, scored + len(rows)
+            if progress is not None:
+                progress(stats("running"))
+            if pause:
+                time.sleep(pause)
+    except LostClaim:
+        return stats("lost")
+    except Exception as e:
+        # Everything up to the last committed chunk is kept; the next run resumes from there
+        return finish("failed", f"{type(e).__name__}: {e}")
+    finally:
+        db.close()
+
+
+class RescoreRunner:
+    """At most one rescoring job per process, on a background thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_run: Optional[dict] = None
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, chunk_size: Optional[int] = None, **kwargs) -> Optional[int]:
+        """Start (or resume) a job; returns its id, or None if one is already running here or elsewhere."""
+        with self._lock:
+            if self.running():
+                return None
+            db = job_sessions()()
+            try:
+                job = prepare_job(db)
+            finally:
+                db.close()
+            if job is None:
+                return None
+            job_id = job.id
+            self._stop.clear()
+            self.last_run = None
+
+            def _run():
+                self.last_run = run_job(
+                    job_id, chunk_size or RESCORE_CHUNK_SIZE, stop=self._stop,
+                    progress=lambda s: setattr(self, "last_run", s), **kwargs,
+                )
+
+            self._thread = threading.Thread(target=_run, name="rescore", daemon=True)
+            self._thread.start()
+            return job_id
+
+    def stop(self) -> bool:
+        if not self.running():
+            return False
+        self._stop.set()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self, db: Session) -> Optional[dict]:
+        job = db.query(models.RescoreJob).order_by(models.RescoreJob.id.desc()).first()
+        if job is None:
+            return None
+        run = self.last_run if self.last_run and self.last_run["job_id"] == job.id else None
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "model": job.model,
+            "processed": job.processed,
+            "total": job.total,
+            "percent": round(100 * job.processed / job.total, 1) if job.total else 100.0,
+            "last_patient_id": job.last_patient_id,
+            "error": job.error,
+            "started_at": job.started_at,
+            "updated_at": job.updated_at,
+            "finished_at": job.finished_at,
+            "running": self.running(),
+            "rows_per_second": run["rows_per_second"] if run else None,
+        }
+
+
+runner = RescoreRunner()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rescore every patient's latest vitals with the active model.")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE)
+    parser.add_argument("--pause", type=float, default=RESCORE_PAUSE_SECONDS, help="Seconds to sleep between chunks")
+    args = parser.parse_args(argv)
+
+    sessions = job_sessions()
+    install(sessions.kw["bind"])
+    db = sessions()
+    try:
+        job = prepare_job(db)
+        if job is None:
+            print("A rescoring job is already running", file=sys.stderr)
+            return 1
+        print(f"Rescoring job {job.id}: {job.processed:,}/{job.total:,} done, resuming after patient {job.last_patient_id}")
+    finally:
+        db.close()
+
+    def log(s):
+        print(f"{s['scored']:,} patients rescored ({s['rows_per_second']:,.0f} rows/s)", file=sys.stderr)
+
+    result = run_job(job.id, args.chunk_size, args.pause, sessions=sessions, progress=log)
+    print(f"Job {result['job_id']} {result['status']}: {result['scored']:,} patients in "
+          f"{result['seconds']}s ({result['rows_per_second']:,} rows/s)")
+    return 0 if result["status"] == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
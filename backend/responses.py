@@ -0,0 +1,48 @@
+"""
+Fast JSON responses for the whole API.
+
+FastJSONResponse is the app's default response class. It renders with
+orjson when installed (datetimes, enums and NumPy values natively) and
+falls back to the stdlib json module otherwise. List endpoints build plain
+dict rows themselves and return `FastJSONResponse(rows)` directly, which
+skips FastAPI's jsonable_encoder / response_model validation pass.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows(result, **extra) -> list[dict]:
+    """Column-only query results as dicts, with constant extra keys merged in."""
+    return [{**row._asdict(), **extra} for row in result]
@@ -0,0 +1,198 @@
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..cache import cache
+from ..events import hub
+from ..database import get_db
+from ..deployments import record as record_deployment
+from ..ml.backends import BACKEND_NAMES, resolve_model_name
+from ..ml.predictor import registry
+from ..patient_import import IMPORT_HASH_WORKERS, import_patients, shared_hash_pool
+from ..ratelimit import admission_stats
+from ..rescore import runner as rescore_runner
+from ..utils import get_current_user
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def _require_provider(user: models.User, action: str):
+    if not user.is_provider:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only providers can {action}",
+        )
+
+
+def _require_admin(user: models.User, action: str):
+    if not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only administrators can {action}",
+        )
+
+
+def _check_backend_name(name):
+    if name is not None and name not in BACKEND_NAMES:
+        raise HTTPException(status_code=400, detail=f"Unknown model backend: {name}")
+
+
+def _model_path(model):
+    if model is None:
+        return None
+    try:
+        return resolve_model_name(model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# BULK PATIENT IMPORT (CSV)
+@router.post("/patients/import", response_model=schemas.PatientImportResult)
+def import_patients_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Register many patients from a CSV upload into the administrator's hospital.
+    Rows naming another hospital are reported and skipped.
+    """
+    _require_admin(current_user, "import patients")
+
+    # Stream the upload row by row instead of reading it all into memory
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_patients(
+            db, text,
+            default_hospital=current_user.hospital_name,
+            only_hospital=current_user.hospital_name,
+            pool=shared_hash_pool(),
+            workers=IMPORT_HASH_WORKERS,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV file must be UTF-8 encoded")
+    finally:
+        text.detach()
+
+
+# SERVED MODEL STATUS
+@router.get("/model")
+def get_model_status(current_user: models.User = Depends(get_current_user)):
+    """Active model, reload state and shadow-scoring statistics."""
+    _require_provider(current_user, "manage models")
+    return registry.status()
+
+
+# HOT RELOAD
+@router.post("/model/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload_model(
+    request: schemas.ModelReloadRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Load a model artifact in the background and swap it in once warmed up.
+    Requests keep using the current model until the swap; a failed load keeps it.
+    The other workers pick the deployment up within MODEL_SYNC_SECONDS.
+    """
+    _require_admin(current_user, "manage models")
+    _check_backend_name(request.backend)
+    model_path = _model_path(request.model)
+    backend = request.backend or registry.current().name
+    if not registry.reload_async(backend, model_path):
+        raise HTTPException(status_code=409, detail="A model reload is already in progress")
+    deployment = record_deployment(db, backend, request.model, current_user.id)
+    return {"message": "Model reload started", "deployment_id": deployment.id, "status": registry.status()}
+
+
+# SHADOW SCORING
+@router.post("/model/shadow")
+def start_shadow_model(
+    request: schemas.ShadowModelRequest,
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Score a sampled fraction of live traffic with a candidate model, off the request path.
+    Runs in this worker only; with several workers it sees that worker's share of traffic.
+    """
+    _require_admin(current_user, "manage models")
+    _check_backend_name(request.backend)
+    model_path = _model_path(request.model)
+    try:
+        return registry.start_shadow(request.backend, model_path, request.sample_rate)
+    except (OSError, ValueError, RuntimeError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not load shadow model: {e}")
+
+
+@router.delete("/model/shadow")
+def stop_shadow_model(current_user: models.User = Depends(get_current_user)):
+    """Stop shadow scoring and return its final statistics."""
+    _require_admin(current_user, "manage models")
+    stats = registry.stop_shadow()
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No shadow model is running")
+    return stats
+
+
+# READ CACHE
+@router.get("/cache")
+def get_cache_stats(current_user: models.User = Depends(get_current_user)):
+    """Read-through cache backend, hit ratio and invalidation counts."""
+    _require_provider(current_user, "view cache statistics")
+    return cache.stats()
+
+
+# ADMISSION CONTROL
+@router.get("/limits")
+def get_admission_stats(current_user: models.User = Depends(get_current_user)):
+    """Rate-limit settings and rejections, and the inference / hashing slot usage of this worker."""
+    _require_provider(current_user, "view admission statistics")
+    return admission_stats()
+
+
+# LIVE DASHBOARD STREAMS
+@router.get("/events")
+def get_event_stats(current_user: models.User = Depends(get_current_user)):
+    """Open dashboard event streams and events published by this worker."""
+    _require_provider(current_user, "view event statistics")
+    return hub.stats()
+
+
+# COHORT RESCORING
+@router.post("/rescore", status_code=status.HTTP_202_ACCEPTED)
+def start_rescore(current_user: models.User = Depends(get_current_user)):
+    """
+    Rescore every patient's latest vitals with the active model in the background.
+    Resumes the last unfinished job from its checkpoint if there is one.
+    """
+    _require_admin(current_user, "rescore patients")
+    job_id = rescore_runner.start()
+    if job_id is None:
+        raise HTTPException(status_code=409, detail="A rescoring job is already running")
+    return {"message": "Rescoring started", "job_id": job_id}
+
+
+@router.get("/rescore")
+def get_rescore_status(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Progress (processed / total, rows per second) of the latest rescoring job."""
+    _require_provider(current_user, "rescore patients")
+    job = rescore_runner.status(db)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No rescoring job has run")
+    return job
+
+
+@router.delete("/rescore")
+def stop_rescore(current_user: models.User = Depends(get_current_user)):
+    """Stop the running job after its current chunk; POST /admin/rescore resumes it."""
+    _require_admin(current_user, "rescore patients")
+    if not rescore_runner.stop():
+        raise HTTPException(status_code=404, detail="No rescoring job is running")
+    return {"message": "Rescoring will stop after the current chunk"}
@@ -1,11 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from datetime import datetime
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_db, get_read_db
+from ..events import hub
+from ..responses import FastJSONResponse, rows
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
 
+# Columns of an AppointmentResponse row, selected directly instead of loading ORM objects
+APPOINTMENT_COLUMNS = (
+    models.Appointment.id,
+    models.Appointment.patient_name,
+    models.Appointment.date,
+    models.Appointment.appointment_type,
+    models.Appointment.status,
+    models.Appointment.hospital_name,
+    models.Appointment.provider_id,
+)
+
+
+def _publish_appointment(appointment: models.Appointment, action: str):
+    hub.publish(appointment.provider_id, "appointment", {
+        "action": action,
+        "appointment_id": appointment.id,
+        "patient_name": appointment.patient_name,
+        "date": appointment.date,
+        "appointment_type": appointment.appointment_type,
+        "status": appointment.status,
+    })
+
 
 # Book Appointment (Patient books with Provider)
 @router.post("/book", response_model=schemas.AppointmentResponse)
@@ -42,43 +66,29 @@ def book_appointment(appointment: schemas.AppointmentCreate, db: Session = Depen
     db.add(new_appointment)
     db.commit()
     db.refresh(new_appointment)
+    _publish_appointment(new_appointment, "booked")
     return new_appointment
 
 # Get all Appointments for a Provider
 @router.get("/provider/{email}", response_model=list[schemas.AppointmentResponse])
-def get_provider_appointments(email: str, db: Session = Depends(get_db)):
+def get_provider_appointments(email: str, db: Session = Depends(get_read_db)):
     # Find provider by email
     provider = db.query(models.User).filter_by(email=email, is_provider=True).first()
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
-    # Fetch all appointments linked by provider_id
+    # Fetch all appointments linked by provider_id as ready-to-send rows
     appointments = (
-        db.query(models.Appointment)
+        db.query(*APPOINTMENT_COLUMNS)
         .filter(models.Appointment.provider_id == provider.id)
         .order_by(models.Appointment.date.desc())
-        .all()
     )
+    return FastJSONResponse(rows(appointments, provider_email=None, provider_name=provider.full_name))
+
 
-    # Serialize results safely
-    results = []
-    for a in appointments:
-        results.append({
-            "id": a.id,
-            "patient_name": a.patient_name,
-            "date": a.date,
-            "appointment_type": a.appointment_type,
-            "status": a.status,
-            "hospital_name": a.hospital_name,
-            "provider_id": a.provider_id,
-            "provider_name": provider.full_name if provider else None,
-        })
-
-    return results
-    
 # Get all Appointments for a Patient
 @router.get("/patient/{email}")
-def get_patient_appointments(email: str, db: Session = Depends(get_db)):
+def get_patient_appointments(email: str, db: Session = Depends(get_read_db)):
     # Find patient user
     patient_user = db.query(models.User).filter_by(email=email, is_provider=False).first()
     if not patient_user:
@@ -93,30 +103,18 @@ def get_patient_appointments(email: str, db: Session = Depends(get_db)):
     if not patient_profile:
         raise HTTPException(status_code=404, detail="Patient profile not found")
 
-    # Get appointments with provider info
+    # Get appointments with provider names in one query
     appointments = (
-        db.query(models.Appointment)
-        .options(joinedload(models.Appointment.provider)) 
+        db.query(*APPOINTMENT_COLUMNS, models.User.full_name.label("provider_name"))
+        .outerjoin(models.User, models.Appointment.provider_id == models.User.id)
         .filter(models.Appointment.patient_name == patient_profile.full_name)
         .order_by(models.Appointment.date.desc())
-        .all()
     )
 
-    # Serialize results
-    results = []
-    for a in appointments:
-        results.append({
-            "id": a.id,
-            "patient_name": a.patient_name,
-            "date": a.date,
-            "appointment_type": a.appointment_type,
-            "status": a.status,
-            "hospital_name": a.hospital_name or patient_profile.hospital_name,
-            "provider_id": a.provider_id,
-            "provider_name": a.provider.full_name if a.provider else None,  
-        })
-
-    return results
+    results = rows(appointments)
+    for row in results:
+        row["hospital_name"] = row["hospital_name"] or patient_profile.hospital_name
+    return FastJSONResponse(results)
 
 
 # Update Appointment Status (Completed / Cancelled)
@@ -143,4 +141,5 @@ def update_appointment_status(
     appointment.status = new_status
     db.commit()
     db.refresh(appointment)
+    _publish_appointment(appointment, "status_changed")
     return appointment
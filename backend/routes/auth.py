@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Form, Request, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
@@ -6,8 +7,11 @@ from passlib.context import CryptContext
 from jose import jwt, JWTError
 
 from .. import models, schemas
+from ..cache import invalidate_provider
 from ..database import get_db
-from ..utils import create_access_token, SECRET_KEY, ALGORITHM
+from ..events import hub
+from ..ratelimit import hashing_slots, rate_limit, spend
+from ..utils import create_access_token, normalize_email, SECRET_KEY, ALGORITHM
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -19,7 +23,7 @@ class LoginRequest(BaseModel):
     password: str
 
 # PROVIDER SIGNUP
-@router.post("/signup/provider", response_model=schemas.UserResponse)
+@router.post("/signup/provider", response_model=schemas.UserResponse, dependencies=[Depends(rate_limit("signup"))])
 def signup_provider(
     full_name: str = Form(...),
     email: str = Form(...),
@@ -28,11 +32,14 @@ def signup_provider(
     role: str = Form(...),
     db: Session = Depends(get_db),
 ):
-    existing_user = db.query(models.User).filter(models.User.email == email).first()
+    email = normalize_email(email)
+    # lower() also catches accounts stored in mixed case before addresses were normalized
+    existing_user = db.query(models.User).filter(func.lower(models.User.email) == email).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_pw = pwd_context.hash(password)
+    with hashing_slots.slot():
+        hashed_pw = pwd_context.hash(password)
 
     new_user = models.User(
         full_name=full_name,
@@ -49,7 +56,7 @@ def signup_provider(
     return new_user
 
 # PATIENT SIGNUP
-@router.post("/signup/patient", response_model=schemas.UserResponse)
+@router.post("/signup/patient", response_model=schemas.UserResponse, dependencies=[Depends(rate_limit("signup"))])
 def signup_patient(
     full_name: str = Form(...),
     email: str = Form(...),
@@ -57,11 +64,14 @@ def signup_patient(
     hospital_name: schemas.HospitalName = Form(...),
     db: Session = Depends(get_db),
 ):
-    existing_user = db.query(models.User).filter(models.User.email == email).first()
+    email = normalize_email(email)
+    # lower() also catches accounts stored in mixed case before addresses were normalized
+    existing_user = db.query(models.User).filter(func.lower(models.User.email) == email).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_pw = pwd_context.hash(password)
+    with hashing_slots.slot():
+        hashed_pw = pwd_context.hash(password)
     new_user = models.User(
         full_name=full_name,
         email=email,
@@ -90,6 +100,12 @@ def signup_patient(
     db.add(new_patient)
     db.commit()
     db.refresh(new_patient)
+    invalidate_provider(new_patient.provider_id)
+    hub.publish(new_patient.provider_id, "patient_added", {
+        "patient_id": new_patient.id,
+        "patient_name": new_patient.full_name,
+        "risk_level": new_patient.risk_level,
+    })
 
     return {
         "id": new_user.id,
@@ -101,8 +117,14 @@ def signup_patient(
         "created_at": new_user.created_at,
     }
 
+def _verify_password(password: str, hashed_password: str) -> bool:
+    # bcrypt is deliberately slow: keep it off the event loop and within the hashing slots
+    with hashing_slots.slot():
+        return pwd_context.verify(password, hashed_password)
+
+
 # LOGIN
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(rate_limit("login"))])
 async def login(
     request: Request,
     db: Session = Depends(get_db),
@@ -122,8 +144,18 @@ async def login(
     if not email or not password:
         raise HTTPException(status_code=400, detail="Email and password required")
 
-    db_user = db.query(models.User).filter(models.User.email == email).first()
-    if not db_user or not pwd_context.verify(password, db_user.hashed_password):
+    normalized = normalize_email(email)
+    # Per account as well as per address, so a shared address can have a larger allowance
+    spend(f"login:{normalized}", "login")
+
+    # Normalized address first; the address as typed still finds accounts created before normalization
+    db_user = (
+        db.query(models.User)
+        .filter(models.User.email.in_({normalized, email}))
+        .order_by(models.User.email != normalized, models.User.id)
+        .first()
+    )
+    if not db_user or not await run_in_threadpool(_verify_password, password, db_user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     access_token = create_access_token(data={"sub": db_user.email})
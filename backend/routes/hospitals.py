@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..analytics import hospital_analytics, hospital_overview, refresh
+from ..database import get_db, get_read_db
+from ..utils import get_current_user
+
+router = APIRouter(prefix="/hospitals", tags=["Hospitals"])
+
+
+def _require_provider(user: models.User, action: str):
+    if not user.is_provider:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only providers can {action}",
+        )
+
+
+# ALL HOSPITALS
+@router.get("/analytics")
+def get_hospitals_overview(
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Caseload, high-risk share, assessment volume and appointment completion per hospital."""
+    _require_provider(current_user, "view hospital analytics")
+    return hospital_overview(db, days)
+
+
+# REFRESH THE SUMMARY TABLES NOW
+@router.post("/analytics/refresh")
+def refresh_hospital_analytics(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    _require_provider(current_user, "refresh hospital analytics")
+    return refresh(db)
+
+
+# ONE HOSPITAL, BY PROVIDER AND BY DAY
+@router.get("/{hospital_name}/analytics")
+def get_hospital_analytics(
+    hospital_name: schemas.HospitalName,
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Per-provider numbers for the signed-in provider's own hospital, from the summary tables."""
+    _require_provider(current_user, "view hospital analytics")
+    if current_user.hospital_name != hospital_name.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view analytics for your own hospital",
+        )
+    return hospital_analytics(db, hospital_name.value, days)
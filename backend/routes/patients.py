@@ -1,19 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+import json
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from datetime import datetime
 from .. import models, schemas
-from ..database import get_db
+from ..cache import cache, invalidate_patient, latest_risk_key
+from ..database import get_db, get_read_db
+from ..responses import FastJSONResponse, dumps
+from ..timeseries import METHODS, downsample
 from ..utils import get_current_user
 
 router = APIRouter(prefix="/patients", tags=["Patients"])
 
+# Time-series metric name -> RiskHistory column
+TIMESERIES_METRICS = {
+    "systolic": models.RiskHistory.systolic_bp,
+    "diastolic": models.RiskHistory.diastolic_bp,
+    "sugar": models.RiskHistory.blood_sugar,
+    "temp": models.RiskHistory.body_temp,
+    "heart_rate": models.RiskHistory.heart_rate,
+    "high_risk_probability": models.RiskHistory.high_risk_probability,
+}
+
 
 # Patient Dashboard (Logged-in Patient)
 @router.get("/me", response_model=schemas.PatientDashboardResponse)
 def get_logged_in_patient(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Return the logged-in patient's dashboard data."""
     if not current_user:
@@ -75,7 +90,7 @@ def get_logged_in_patient(
 # Update Static Info (for Patients)
 @router.patch("/update-static-info")
 def update_static_info(
-    data: dict,
+    data: schemas.PatientStaticInfoUpdate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -87,19 +102,29 @@ def update_static_info(
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    patient.age = data.get("age", patient.age)
-    patient.pre_existing_diabetes = data.get("pre_existing_diabetes", patient.pre_existing_diabetes)
-    patient.gestational_diabetes = data.get("gestational_diabetes", patient.gestational_diabetes)
-    patient.previous_complications = data.get("previous_complications", patient.previous_complications)
+    for field, value in data.model_dump(exclude_unset=True).items():
+        setattr(patient, field, value)
 
     db.commit()
     db.refresh(patient)
+    invalidate_patient(patient.id, patient.provider_id)
     return {"message": "Patient static info updated", "patient_id": patient.id}
 
 
 # Get Latest Risk Record (For Provider View)
 @router.get("/{patient_id}/latest-risk")
 def get_latest_patient_risk(patient_id: int, db: Session = Depends(get_db)):
+    """
+    Served from the read-through cache; invalidated by assessments, static info updates and discharge.
+    Misses read the primary, not the replica, so a refill right after a write is never stale.
+    """
+    return Response(
+        cache.get_or_load(latest_risk_key(patient_id), lambda: dumps(_latest_patient_risk(patient_id, db))),
+        media_type="application/json",
+    )
+
+
+def _latest_patient_risk(patient_id: int, db: Session) -> dict:
     record = (
         db.query(models.RiskHistory)
         .filter(models.RiskHistory.patient_id == patient_id)
@@ -137,3 +162,56 @@ def get_latest_patient_risk(patient_id: int, db: Session = Depends(get_db)):
             "previous_complications": patient.previous_complications if patient else None,
         },
     }
+
+
+# Downsampled Vitals / Risk Time Series (charts)
+@router.get("/{patient_id}/timeseries")
+def get_patient_timeseries(
+    patient_id: int,
+    metric: str = Query("high_risk_probability", description=f"One of: {', '.join(TIMESERIES_METRICS)}"),
+    points: int = Query(200, ge=3, le=5000),
+    method: str = Query("lttb", description="lttb or minmax"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Column-oriented history for charting, downsampled to at most `points`
+    rows picked on `metric`; every column uses the same rows.
+    """
+    if metric not in TIMESERIES_METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric: {metric}")
+    if method not in METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown method: {method}")
+    if not db.query(models.Patient.id).filter(models.Patient.id == patient_id).first():
+        raise HTTPException(status_code=404, detail="Patient not found")
+
+    R = models.RiskHistory
+    history = (
+        db.query(R.created_at, *TIMESERIES_METRICS.values())
+        .filter(R.patient_id == patient_id, R.source == "assessment")
+        .order_by(R.created_at.asc(), R.id.asc())
+        .all()
+    )
+    if not history:
+        return FastJSONResponse({
+            "metric": metric, "method": method, "total_points": 0, "returned_points": 0,
+            "timestamps": [], **{name: [] for name in TIMESERIES_METRICS},
+        })
+
+    timestamps = [row[0] for row in history]
+    values = np.array([row[1:] for row in history], dtype=np.float64)
+    epoch = np.array([ts.timestamp() for ts in timestamps], dtype=np.float64)
+    keep = downsample(epoch, values[:, list(TIMESERIES_METRICS).index(metric)], points, method)
+
+    selected = values[keep]
+    return FastJSONResponse({
+        "metric": metric,
+        "method": method,
+        "total_points": len(history),
+        "returned_points": len(keep),
+        "timestamps": [timestamps[i] for i in keep],
+        # NaN (missing vital) -> null
+        **{
+            name: [None if v != v else v for v in selected[:, i].tolist()]
+            for i, name in enumerate(TIMESERIES_METRICS)
+        },
+    })
@@ -1,10 +1,20 @@
+import json
+from typing import Optional
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from .. import models, schemas
-from ..database import get_db
-from ..utils import get_current_user
+from ..cache import cache, invalidate_patient, provider_patients_key
+from ..database import SessionLocal, get_db, get_read_db
+from ..events import hub
+from ..responses import FastJSONResponse, dumps, rows
+from ..search import search_patients
+from ..vitals_trend import TREND_METRICS
+from ..utils import STREAM_TOKEN_EXPIRE_SECONDS, create_stream_token, get_current_user, verify_stream_token
+from .appointments import APPOINTMENT_COLUMNS
 
 router = APIRouter(prefix="/providers", tags=["Providers"])
 
@@ -12,7 +22,7 @@ router = APIRouter(prefix="/providers", tags=["Providers"])
 @router.get("/me", response_model=schemas.ProviderDashboardResponse)
 def get_logged_in_provider(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     if not current_user or not current_user.is_provider:
         raise HTTPException(
@@ -55,6 +65,17 @@ def get_logged_in_provider(
 # GET LIST OF PATIENTS ASSIGNED TO A PROVIDER (BY ID)
 @router.get("/{provider_id}/patients", response_model=list[schemas.PatientResponse])
 def get_provider_patients(provider_id: int, db: Session = Depends(get_db)):
+    """
+    Served from the read-through cache; invalidated whenever one of the listed patients changes.
+    Misses read the primary, not the replica, so a refill right after a write is never stale.
+    """
+    return Response(
+        cache.get_or_load(provider_patients_key(provider_id), lambda: dumps(_provider_patients(provider_id, db))),
+        media_type="application/json",
+    )
+
+
+def _provider_patients(provider_id: int, db: Session) -> list[dict]:
     provider = db.query(models.User).filter(
         models.User.id == provider_id, models.User.is_provider == True
     ).first()
@@ -62,16 +83,59 @@ def get_provider_patients(provider_id: int, db: Session = Depends(get_db)):
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
-    patients = db.query(models.Patient).filter(
-        models.Patient.provider_id == provider.id
-    ).all()
+    patients = db.query(
+        models.Patient.full_name,
+        models.Patient.age,
+        models.Patient.risk_level,
+        models.Patient.hospital_name,
+        models.Patient.id,
+        models.Patient.last_assessment_date,
+        models.Patient.provider_id,
+    ).filter(models.Patient.provider_id == provider.id)
 
-    return patients
+    return rows(patients, assigned_doctor=None)
+
+
+# SEARCH A PROVIDER'S PATIENTS
+@router.get("/{provider_id}/patients/search", response_model=schemas.PatientSearchResponse)
+def search_provider_patients(
+    provider_id: int,
+    q: Optional[str] = Query(None, max_length=100, description="Any part of the patient's name"),
+    risk_level: Optional[str] = None,
+    min_age: Optional[int] = Query(None, ge=0),
+    max_age: Optional[int] = Query(None, ge=0),
+    assessed_after: Optional[datetime] = None,
+    assessed_before: Optional[datetime] = None,
+    limit: int = Query(25, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Name, risk, age and last-assessment search over the provider's caseload, one page at a time.
+    Served from the name search index and the patient filter indexes (see backend/search.py).
+    """
+    if not current_user.is_provider or current_user.id != provider_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only search your own patients",
+        )
+
+    page = rows(search_patients(
+        db, provider_id, q=q, risk_level=risk_level, min_age=min_age, max_age=max_age,
+        assessed_after=assessed_after, assessed_before=assessed_before, limit=limit, offset=offset,
+    ), assigned_doctor=None)
+    return FastJSONResponse({
+        "patients": page[:limit],
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if len(page) > limit else None,
+    })
 
 
 # GET ALL APPOINTMENTS FOR A PROVIDER (BY ID)
 @router.get("/{provider_id}/appointments", response_model=list[schemas.AppointmentResponse])
-def get_provider_appointments(provider_id: int, db: Session = Depends(get_db)):
+def get_provider_appointments(provider_id: int, db: Session = Depends(get_read_db)):
     provider = db.query(models.User).filter(
         models.User.id == provider_id, models.User.is_provider == True
     ).first()
@@ -80,31 +144,16 @@ def get_provider_appointments(provider_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Provider not found")
 
     appointments = (
-        db.query(models.Appointment)
+        db.query(*APPOINTMENT_COLUMNS)
         .filter(models.Appointment.provider_id == provider.id)
         .order_by(models.Appointment.date.asc())
-        .all()
     )
-
-    results = []
-    for a in appointments:
-        results.append({
-            "id": a.id,
-            "patient_name": a.patient_name,
-            "date": a.date,
-            "appointment_type": a.appointment_type,
-            "status": a.status,
-            "hospital_name": a.hospital_name,
-            "provider_id": provider.id,
-            "provider_name": provider.full_name,
-        })
-
-    return results
+    return FastJSONResponse(rows(appointments, provider_email=None, provider_name=provider.full_name))
 
 
 # GET WEEKLY RISK SUMMARY FOR ALL PATIENTS OF A PROVIDER
 @router.get("/{provider_id}/risk-summary")
-def get_provider_risk_summary(provider_id: int, db: Session = Depends(get_db)):
+def get_provider_risk_summary(provider_id: int, db: Session = Depends(get_read_db)):
     provider = db.query(models.User).filter(
         models.User.id == provider_id,
         models.User.is_provider == True
@@ -134,6 +183,7 @@ def get_provider_risk_summary(provider_id: int, db: Session = Depends(get_db)):
         .join(models.Patient)
         .filter(models.Patient.provider_id == provider.id)
         .filter(models.RiskHistory.created_at >= fourteen_days_ago)
+        .filter(models.RiskHistory.source == "assessment")
         .all()
     )
 
@@ -180,7 +230,7 @@ def get_provider_risk_summary(provider_id: int, db: Session = Depends(get_db)):
 
 # GET PROVIDER RECENT ACTIVITY (Dashboard Feed)
 @router.get("/{provider_id}/activity")
-def get_provider_recent_activity(provider_id: int, db: Session = Depends(get_db)):
+def get_provider_recent_activity(provider_id: int, db: Session = Depends(get_read_db)):
     provider = db.query(models.User).filter(
         models.User.id == provider_id,
         models.User.is_provider == True
@@ -272,6 +322,92 @@ def get_provider_recent_activity(provider_id: int, db: Session = Depends(get_db)
     return activities[:5]
 
 
+# LIVE DASHBOARD UPDATES (Server-Sent Events)
+def _provider_exists(provider_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(models.User.id).filter(
+            models.User.id == provider_id, models.User.is_provider == True
+        ).first() is not None
+    finally:
+        db.close()
+
+
+@router.post("/{provider_id}/events/token")
+def create_provider_events_token(provider_id: int, current_user: models.User = Depends(get_current_user)):
+    """Short-lived token for `GET /providers/{provider_id}/events?token=...` (EventSource cannot send headers)."""
+    if not current_user.is_provider or current_user.id != provider_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Providers can only follow their own dashboard",
+        )
+    return {"token": create_stream_token(current_user.email, provider_id), "expires_in": STREAM_TOKEN_EXPIRE_SECONDS}
+
+
+@router.get("/{provider_id}/events")
+async def stream_provider_events(provider_id: int, token: Optional[str] = None):
+    """
+    Push dashboard deltas (assessments, patients added / discharged / rescored,
+    appointments) as they are written, instead of polling. On a `resync`
+    event the dashboard refetches its data. The open stream holds no DB connection.
+    Needs a stream token from POST /providers/{provider_id}/events/token, checked on connect.
+    """
+    verify_stream_token(token, provider_id)
+    if not await run_in_threadpool(_provider_exists, provider_id):
+        raise HTTPException(status_code=404, detail="Provider not found")
+    return StreamingResponse(
+        hub.stream(provider_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# GET EARLY-WARNING ALERTS FOR A PROVIDER'S PATIENTS
+@router.get("/{provider_id}/alerts")
+def get_provider_alerts(provider_id: int, db: Session = Depends(get_read_db)):
+    """
+    Patients whose vitals or risk are high or trending upward, read from the
+    per-patient trend state maintained on every assessment (no history scan).
+    """
+    provider = db.query(models.User).filter(
+        models.User.id == provider_id,
+        models.User.is_provider == True
+    ).first()
+
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+
+    S = models.PatientVitalsState
+    states = (
+        db.query(S, models.Patient.full_name, models.Patient.risk_level)
+        .join(models.Patient, models.Patient.id == S.patient_id)
+        .filter(models.Patient.provider_id == provider.id, S.alert == True)
+        .order_by(S.high_risk_probability_ewma.desc(), S.updated_at.desc())
+        .all()
+    )
+
+    return FastJSONResponse([
+        {
+            "patient_id": state.patient_id,
+            "patient_name": full_name,
+            "risk_level": risk_level,
+            "assessments": state.assessments,
+            "reasons": json.loads(state.alert_reasons or "[]"),
+            "updated_at": state.updated_at,
+            "trends": {
+                metric: {
+                    "ewma": getattr(state, f"{metric}_ewma"),
+                    "min": getattr(state, f"{metric}_min"),
+                    "max": getattr(state, f"{metric}_max"),
+                    "slope": getattr(state, f"{metric}_slope"),
+                }
+                for metric in TREND_METRICS
+            },
+        }
+        for state, full_name, risk_level in states
+    ])
+
+
 # DISCHARGE (DELETE) PATIENT FROM PROVIDER’S CARE
 @router.delete("/{provider_id}/patients/{patient_id}", status_code=204)
 def discharge_patient(
@@ -301,4 +437,6 @@ def discharge_patient(
 
     db.delete(patient)
     db.commit()
+    invalidate_patient(patient_id, provider_id)
+    hub.publish(provider_id, "patient_discharged", {"patient_id": patient_id})
     return {"message": f"Patient {patient.full_name} discharged successfully"}
@@ -1,110 +1,153 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.orm import Session
 from datetime import datetime
-from .. import models
-from ..database import get_db
-from ..ml.predictor import assess_risk
-from ..utils import get_current_user
+from .. import models, schemas
+from ..cache import invalidate_patient
+from ..database import get_db, get_read_db
+from ..events import hub
+from ..ml.predictor import assess_risk, features_from_requests
+from ..ratelimit import inference_slots, rate_limit
+from ..responses import FastJSONResponse
+from ..vitals_trend import fold_readings, new_state
+from ..utils import get_current_email
 import json
 
 router = APIRouter(prefix="/assess-risk", tags=["Risk Assessment"])
 
+# Attempts at the write transaction when concurrent assessments of one patient collide
+STORE_ATTEMPTS = 5
+
+
+def _lookup_patient(db: Session, email: str):
+    """User, patient summary and trend state in one query."""
+    P = models.Patient
+    return (
+        db.query(
+            models.User.is_provider,
+            P.id, P.provider_id, P.full_name, P.risk_level,
+            P.age, P.pre_existing_diabetes, P.gestational_diabetes, P.previous_complications,
+            models.PatientVitalsState,
+        )
+        .outerjoin(P, P.user_id == models.User.id)
+        .outerjoin(models.PatientVitalsState, models.PatientVitalsState.patient_id == P.id)
+        .filter(models.User.email == email)
+        .first()
+    )
+
+
+def _store_assessment(db: Session, patient, data: schemas.RiskAssessmentRequest, result: dict, vitals: dict):
+    """History row, patient summary and trend state, committed together. Returns (record id, patient updates)."""
+    # Save to RiskHistory (now including vitals); RETURNING gives the id without a re-read
+    record_id = db.execute(
+        insert(models.RiskHistory)
+        .values(
+            patient_id=patient.id,
+            risk_level=result.get("Prediction"),
+            high_risk_probability=result.get("High_Risk_Probability"),
+            low_risk_probability=result.get("Low_Risk_Probability"),
+            contributing_factors=str(result.get("Top_Contributing_Factors")),
+            **vitals,
+        )
+        .returning(models.RiskHistory.id)
+    ).scalar_one()
+
+    # Update patient summary record, saving static details ONCE if not already set
+    patient_updates = {"risk_level": result.get("Prediction"), "last_assessment_date": datetime.utcnow()}
+    if patient.age is None and data.Age is not None:
+        patient_updates["age"] = int(data.Age)
+    for column, value in (
+        ("pre_existing_diabetes", data.Pre_existing_Diabetes),
+        ("gestational_diabetes", data.Gestational_Diabetes),
+        ("previous_complications", data.Previous_Complications),
+    ):
+        if getattr(patient, column) is None and value is not None:
+            patient_updates[column] = value
+    db.execute(update(models.Patient).where(models.Patient.id == patient.id).values(**patient_updates))
+
+    # Fold the new readings into the patient's trend / early-warning state (O(1))
+    fold_readings(patient.PatientVitalsState or new_state(db, patient.id), {
+        "systolic_bp": data.Systolic_BP,
+        "diastolic_bp": data.Diastolic_BP,
+        "blood_sugar": data.Blood_Sugar,
+        "body_temp": data.Body_Temp,
+        "heart_rate": data.Heart_Rate,
+        "high_risk_probability": result.get("High_Risk_Probability"),
+    })
+
+    db.commit()
+    return record_id, patient_updates
+
 
 # RUN ASSESSMENT + SAVE RESULT
-@router.post("/")
+@router.post("/", dependencies=[Depends(rate_limit("assess"))])
 def assess_and_store_risk(
-    data: dict,
+    data: schemas.RiskAssessmentRequest,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    email: str = Depends(get_current_email),
 ):
     """
     Calls ML model → saves risk result → updates patient record → returns result.
+    One transaction and five round trips: user/patient/trend lookup,
+    INSERT ... RETURNING, one patient UPDATE, trend state write, commit.
     """
+    patient = _lookup_patient(db, email)
 
     # Ensure it's a patient user
-    if not current_user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    if current_user.is_provider:
+    if patient is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    if patient.is_provider:
         raise HTTPException(status_code=403, detail="Providers cannot assess patient risk")
-
-    # Find the patient's record using user_id
-    patient = db.query(models.Patient).filter(models.Patient.user_id == current_user.id).first()
-    if not patient:
+    if patient.id is None:
         raise HTTPException(status_code=404, detail="Patient not found")
 
-    # Save static details ONCE if not already set
-    updates = False
-    if patient.age is None and "Age" in data and data["Age"] is not None:
-        patient.age = data["Age"]
-        updates = True
-
-    if patient.pre_existing_diabetes is None and "Pre_existing_Diabetes" in data:
-        patient.pre_existing_diabetes = data["Pre_existing_Diabetes"]
-        updates = True
-
-    if patient.gestational_diabetes is None and "Gestational_Diabetes" in data:
-        patient.gestational_diabetes = data["Gestational_Diabetes"]
-        updates = True
-
-    if patient.previous_complications is None and "Previous_Complications" in data:
-        patient.previous_complications = data["Previous_Complications"]
-        updates = True
-
-    if updates:
-        db.commit()
-        db.refresh(patient)
-
-    # Run ML model prediction
-    result = assess_risk(data)
-
-    # Safely get vital values (avoid None or wrong key)
-    systolic = float(data.get("Systolic_BP") or 0)
-    diastolic = float(data.get("Diastolic_BP") or 0)
-    sugar = float(data.get("Blood_Sugar") or 0)
-    temp = float(data.get("Body_Temp") or 0)
-    heart = float(data.get("Heart_Rate") or 0)
-
-    # Save to RiskHistory (now including vitals)
-    new_risk = models.RiskHistory(
-        patient_id=patient.id,
-        risk_level=result.get("Prediction"),
-        high_risk_probability=result.get("High_Risk_Probability"),
-        low_risk_probability=result.get("Low_Risk_Probability"),
-        contributing_factors=str(result.get("Top_Contributing_Factors")),
-        systolic_bp=systolic,
-        diastolic_bp=diastolic,
-        blood_sugar=sugar,
-        body_temp=temp,
-        heart_rate=heart,
-    )
-
-    db.add(new_risk)
-
-    # Update patient summary record
-    patient.risk_level = result.get("Prediction")
-    patient.last_assessment_date = datetime.utcnow()
+    # Run ML model prediction on the already-validated vitals (503 when every inference slot is busy)
+    with inference_slots.slot():
+        result = assess_risk(features_from_requests([data]))
 
-    db.commit()
-    db.refresh(new_risk)
+    vitals = {
+        "systolic_bp": data.Systolic_BP or 0,
+        "diastolic_bp": data.Diastolic_BP or 0,
+        "blood_sugar": data.Blood_Sugar or 0,
+        "body_temp": data.Body_Temp or 0,
+        "heart_rate": data.Heart_Rate or 0,
+    }
+    for attempt in range(STORE_ATTEMPTS):
+        try:
+            record_id, patient_updates = _store_assessment(db, patient, data, result, vitals)
+            break
+        except (IntegrityError, StaleDataError):
+            # Another request (or worker) for this patient wrote the trend state first; redo on top of it
+            db.rollback()
+            if attempt == STORE_ATTEMPTS - 1:
+                raise
+            patient = _lookup_patient(db, email)
+
+    invalidate_patient(patient.id, patient.provider_id)
+    hub.publish(patient.provider_id, "assessment", {
+        "patient_id": patient.id,
+        "patient_name": patient.full_name,
+        "record_id": record_id,
+        "risk_level": result.get("Prediction"),
+        "previous_risk_level": patient.risk_level,
+        "high_risk_probability": result.get("High_Risk_Probability"),
+        "created_at": patient_updates["last_assessment_date"],
+    })
 
     return {
         "message": "Risk assessment completed successfully.",
         "risk_result": result,
-        "record_id": new_risk.id,
+        "record_id": record_id,
         "patient_id": patient.id,
-        "saved_vitals": {
-            "systolic_bp": new_risk.systolic_bp,
-            "diastolic_bp": new_risk.diastolic_bp,
-            "blood_sugar": new_risk.blood_sugar,
-            "body_temp": new_risk.body_temp,
-            "heart_rate": new_risk.heart_rate,
-        },
+        "saved_vitals": vitals,
     }
 
 
 # GET ALL RISK ASSESSMENTS FOR A PATIENT
 @router.get("/patient/{patient_id}", tags=["Risk Assessment"])
-def get_patient_assessments(patient_id: int, db: Session = Depends(get_db)):
+def get_patient_assessments(patient_id: int, db: Session = Depends(get_read_db)):
     """
     Fetch all risk assessment history entries for a given patient.
     """
@@ -112,17 +155,22 @@ def get_patient_assessments(patient_id: int, db: Session = Depends(get_db)):
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
+    R = models.RiskHistory
     assessments = (
-        db.query(models.RiskHistory)
-        .filter(models.RiskHistory.patient_id == patient.id)
-        .order_by(models.RiskHistory.created_at.desc())
+        db.query(
+            R.id, R.patient_id, R.created_at, R.risk_level, R.high_risk_probability,
+            R.low_risk_probability, R.contributing_factors, R.systolic_bp, R.diastolic_bp,
+            R.blood_sugar, R.body_temp, R.heart_rate,
+        )
+        .filter(R.patient_id == patient.id, R.source == "assessment")
+        .order_by(R.created_at.desc())
         .all()
     )
 
     if not assessments:
         raise HTTPException(status_code=404, detail="No assessments found")
 
-    return [
+    return FastJSONResponse([
         {
             "id": r.id,
             "patientId": r.patient_id,
@@ -140,4 +188,4 @@ def get_patient_assessments(patient_id: int, db: Session = Depends(get_db)):
             },
         }
         for r in assessments
-    ]
+    ])
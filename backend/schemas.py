@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime
 from enum import Enum
@@ -18,6 +18,18 @@ class ProviderRole(str, Enum):
     midwife = "Midwife"
 
 
+# ENUM: YES / NO ANSWERS (history questions in the assessment form)
+class YesNo(str, Enum):
+    yes = "Yes"
+    no = "No"
+
+
+def _normalize_yes_no(value):
+    if isinstance(value, str):
+        return value.strip().capitalize() or None
+    return value
+
+
 # USER SCHEMAS
 class UserBase(BaseModel):
     full_name: str
@@ -74,6 +86,12 @@ class PatientResponse(PatientBase):
     class Config:
         from_attributes = True
 
+class PatientSearchResponse(BaseModel):
+    patients: list[PatientResponse]
+    limit: int
+    offset: int
+    next_offset: Optional[int] = None
+
 # PATIENT DASHBOARD RESPONSE
 class PatientDashboardResponse(BaseModel):
     patient_id: int 
@@ -95,6 +113,27 @@ class PatientDashboardResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+# PATIENT STATIC INFO UPDATE (fields left out keep their stored value)
+class PatientStaticInfoUpdate(BaseModel):
+    age: Optional[int] = None
+    pre_existing_diabetes: Optional[YesNo] = None
+    gestational_diabetes: Optional[YesNo] = None
+    previous_complications: Optional[YesNo] = None
+
+    @field_validator("age", mode="before")
+    @classmethod
+    def blank_age(cls, value):
+        return None if value == "" else value
+
+    @field_validator("pre_existing_diabetes", "gestational_diabetes", "previous_complications", mode="before")
+    @classmethod
+    def normalize_yes_no(cls, value):
+        return _normalize_yes_no(value)
+
+    class Config:
+        use_enum_values = True
+
 # PROVIDER DASHBOARD RESPONSE
 class ProviderDashboardResponse(BaseModel):
     provider_id: int
@@ -152,3 +191,72 @@ class RiskHistoryResponse(RiskHistoryBase):
 
     class Config:
         from_attributes = True
+
+
+# RISK ASSESSMENT SCHEMAS
+class RiskAssessmentRequest(BaseModel):
+    """Body of POST /assess-risk/. Missing vitals score as 0 and missing answers as "No"."""
+    Age: Optional[float] = Field(None, ge=0, le=120)
+    Systolic_BP: Optional[float] = Field(None, ge=0)
+    Diastolic_BP: Optional[float] = Field(None, ge=0)
+    Blood_Sugar: Optional[float] = Field(None, ge=0)
+    Body_Temp: Optional[float] = Field(None, ge=0)
+    Heart_Rate: Optional[float] = Field(None, ge=0)
+    Previous_Complications: Optional[YesNo] = None
+    Pre_existing_Diabetes: Optional[YesNo] = None
+    Gestational_Diabetes: Optional[YesNo] = None
+
+    @field_validator("Previous_Complications", "Pre_existing_Diabetes", "Gestational_Diabetes", mode="before")
+    @classmethod
+    def normalize_yes_no(cls, value):
+        # The form sends "" for unanswered questions and older clients send lowercase
+        return _normalize_yes_no(value)
+
+    class Config:
+        use_enum_values = True
+
+
+# BULK PATIENT IMPORT SCHEMAS
+class PatientImportRow(BaseModel):
+    full_name: str
+    email: EmailStr
+    password: str
+    hospital_name: HospitalName
+    age: Optional[int] = None
+    pre_existing_diabetes: Optional[YesNo] = None
+    gestational_diabetes: Optional[YesNo] = None
+    previous_complications: Optional[YesNo] = None
+
+    @field_validator("pre_existing_diabetes", "gestational_diabetes", "previous_complications", mode="before")
+    @classmethod
+    def normalize_yes_no(cls, value):
+        return _normalize_yes_no(value)
+
+    class Config:
+        use_enum_values = True
+
+
+class PatientImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class PatientImportResult(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    errors: list[PatientImportError] = []
+
+
+# MODEL MANAGEMENT SCHEMAS
+class ModelReloadRequest(BaseModel):
+    backend: Optional[str] = None
+    # Artifact name inside MODELS_DIR (e.g. "xgboost-20250101T120000"), never a path
+    model: Optional[str] = None
+
+
+class ShadowModelRequest(BaseModel):
+    backend: str
+    model: Optional[str] = None
+    sample_rate: float = Field(0.1, ge=0, le=1)
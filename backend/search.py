@@ -0,0 +1,195 @@
+"""
+Indexed patient search for provider caseloads.
+
+`GET /providers/{provider_id}/patients/search?q=...` matches any part of a
+patient's name, case-insensitively, together with risk level, age range and
+last-assessment filters, one page at a time:
+
+* PostgreSQL: a pg_trgm GIN index on lower(full_name) serves the
+  `LIKE '%q%'` match.
+* SQLite: an FTS5 table with the trigram tokenizer (`patients_fts`, kept in
+  sync by triggers) serves queries of 3+ characters; shorter ones fall back
+  to a name-prefix match within the provider's rows.
+
+The filters use the (provider_id, risk_level, last_assessment_date) and
+(provider_id, age) indexes declared on Patient. Names that start with the
+query rank first.
+
+The index is created with new databases and on startup; for an existing
+database, or to rebuild the SQLite index from the table:
+
+    python -m backend.search --install
+"""
+import argparse
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, case, event, func, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+MIN_TRIGRAM_LENGTH = 3
+
+# Name-matching strategy per database URL: "trigram", "fts5" or "like"
+_modes: dict[str, str] = {}
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5("
+    "full_name, content='patients', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS patients_fts_insert AFTER INSERT ON patients BEGIN "
+    "INSERT INTO patients_fts(rowid, full_name) VALUES (new.id, new.full_name); END",
+    "CREATE TRIGGER IF NOT EXISTS patients_fts_delete AFTER DELETE ON patients BEGIN "
+    "INSERT INTO patients_fts(patients_fts, rowid, full_name) VALUES ('delete', old.id, old.full_name); END",
+    "CREATE TRIGGER IF NOT EXISTS patients_fts_update AFTER UPDATE OF full_name ON patients BEGIN "
+    "INSERT INTO patients_fts(patients_fts, rowid, full_name) VALUES ('delete', old.id, old.full_name); "
+    "INSERT INTO patients_fts(rowid, full_name) VALUES (new.id, new.full_name); END",
+]
+
+_POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_patients_full_name_trgm ON patients USING gin (lower(full_name) gin_trgm_ops)",
+]
+
+
+# INDEX SETUP
+def _install(conn: Connection, rebuild: bool = False) -> str:
+    dialect = conn.dialect.name
+    for index in models.Patient.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    try:
+        with conn.begin_nested():
+            if dialect == "postgresql":
+                for ddl in _POSTGRES_DDL:
+                    conn.execute(text(ddl))
+                mode = "trigram"
+            elif dialect == "sqlite":
+                existed = _has_fts_table(conn)
+                for ddl in _SQLITE_DDL:
+                    conn.execute(text(ddl))
+                if rebuild or not existed:
+                    # Index the rows that were there before the triggers
+                    conn.execute(text("INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')"))
+                mode = "fts5"
+            else:
+                mode = "like"
+    except Exception as e:
+        # No pg_trgm privilege, or SQLite built without FTS5 / the trigram tokenizer
+        logger.warning("Patient name index unavailable on %s, searching without it: %s", dialect, e)
+        mode = "like"
+    _modes[str(conn.engine.url)] = mode
+    return mode
+
+
+def install_search_index(bind: Engine, rebuild: bool = False) -> str:
+    """Create the name index and filter indexes if missing; returns the matching strategy."""
+    with bind.begin() as conn:
+        return _install(conn, rebuild)
+
+
+def _has_fts_table(conn: Connection) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'patients_fts'")
+    ).first() is not None
+
+
+@event.listens_for(models.Patient.__table__, "after_create")
+def _install_with_table(target, conn, **kw):
+    _install(conn)
+
+
+@event.listens_for(models.Patient.__table__, "after_drop")
+def _drop_with_table(target, conn, **kw):
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("DROP TABLE IF EXISTS patients_fts"))
+    _modes.pop(str(conn.engine.url), None)
+
+
+def _mode(db: Session) -> str:
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _modes:
+        # A database this process did not set up (e.g. a read replica): use what it has
+        if bind.dialect.name == "sqlite":
+            _modes[key] = "fts5" if _has_fts_table(db.connection()) else "like"
+        elif bind.dialect.name == "postgresql":
+            _modes[key] = "trigram"
+        else:
+            _modes[key] = "like"
+    return _modes[key]
+
+
+# QUERY
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_patients(
+    db: Session,
+    provider_id: int,
+    q: Optional[str] = None,
+    risk_level: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    assessed_after: Optional[datetime] = None,
+    assessed_before: Optional[datetime] = None,
+    limit: int = 25,
+    offset: int = 0,
+):
+    """One page (plus one extra row, to tell whether there is a next page) of the provider's matching patients."""
+    P = models.Patient
+    query = db.query(
+        P.full_name, P.age, P.risk_level, P.hospital_name, P.id, P.last_assessment_date, P.provider_id,
+    ).filter(P.provider_id == provider_id)
+
+    if risk_level:
+        query = query.filter(P.risk_level == risk_level)
+    if min_age is not None:
+        query = query.filter(P.age >= min_age)
+    if max_age is not None:
+        query = query.filter(P.age <= max_age)
+    if assessed_after is not None:
+        query = query.filter(P.last_assessment_date >= assessed_after)
+    if assessed_before is not None:
+        query = query.filter(P.last_assessment_date < assessed_before)
+
+    order = []
+    q = (q or "").strip().lower()
+    if q:
+        pattern = _escape_like(q)
+        mode = _mode(db)
+        if mode == "fts5" and len(q) >= MIN_TRIGRAM_LENGTH:
+            phrase = '"' + q.replace('"', '""') + '"'
+            query = query.filter(P.id.in_(
+                text("SELECT rowid FROM patients_fts WHERE patients_fts MATCH :phrase")
+                .bindparams(phrase=phrase).columns(rowid=Integer)
+            ))
+        elif mode == "fts5":
+            query = query.filter(func.lower(P.full_name).like(pattern + "%", escape="\\"))
+        else:
+            query = query.filter(func.lower(P.full_name).like("%" + pattern + "%", escape="\\"))
+        order.append(case((func.lower(P.full_name).like(pattern + "%", escape="\\"), 0), else_=1))
+
+    return query.order_by(*order, P.full_name, P.id).offset(offset).limit(limit + 1)
+
+
+# CLI
+def main(argv: Optional[list[str]] = None) -> int:
+    from .database import engine
+
+    parser = argparse.ArgumentParser(description="Create or rebuild the patient name search index.")
+    parser.add_argument("--install", action="store_true", help="Create missing indexes and rebuild the SQLite FTS table")
+    args = parser.parse_args(argv)
+    if not args.install:
+        parser.print_help()
+        return 1
+    print(f"Patient search index: {install_search_index(engine, rebuild=True)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
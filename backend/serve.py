@@ -0,0 +1,308 @@
+"""
+Pre-fork multi-worker server with the model shared copy-on-write.
+
+    python -m backend.serve --workers 4 --host 0.0.0.0 --port 8000
+
+Running `uvicorn --workers N` makes every worker import the app and load its
+own model and SHAP explainer. Here the master process does that once: it
+imports the app, creates the tables, loads and warms up the served model,
+then calls gc.freeze() so garbage collection does not write to (and
+un-share) those pages, binds the socket and forks the workers. After the
+fork each worker re-creates its database connection pools and serves the
+inherited socket with uvicorn.
+
+The master starts no threads: the model file watch, the deployment poll
+and the analytics refresher start in each worker's startup hook (the
+refresher skips a refresh another worker has just done).
+
+Some state lives in each worker process:
+
+* Read cache (CACHE_BACKEND=lru): a write invalidates the entry only in the
+  worker that handled it, so other workers can serve it for up to
+  CACHE_TTL_SECONDS. Use CACHE_BACKEND=redis.
+* Rate-limit buckets (RATE_LIMIT_BACKEND=memory): each worker has its own,
+  so a caller gets up to `workers` times the limit. Use RATE_LIMIT_BACKEND=redis.
+* Dashboard event streams: an event reaches only the dashboards connected
+  to the worker that handled the write.
+* Shadow scoring runs in the worker that started it.
+* Concurrency slots (INFERENCE_CONCURRENCY, HASH_CONCURRENCY) and the
+  import hashing pool (IMPORT_HASH_WORKERS) are per worker. Unless they are
+  set, this server defaults them to the CPU count divided by the workers.
+
+Model deployments and read-your-writes routing work across workers (see
+backend.deployments and backend.database). The master prints a warning for
+each per-process backend still in use.
+
+The master replaces workers that die and stops all of them on SIGTERM or
+SIGINT. A worker that exits within WORKER_MIN_UPTIME_SECONDS (default 10)
+of starting, e.g. because the database is unreachable, is replaced after a
+delay that doubles from WORKER_RESTART_BACKOFF_SECONDS (default 0.5) up to
+30s; after WORKER_MAX_FAST_FAILURES (default 10) such exits in a row the
+master stops and exits with status 1. SIGUSR1, or --report-after N, prints the unique and shared memory of
+the master and every worker, read from /proc/<pid>/smaps_rollup.
+Requires os.fork (Linux / macOS); elsewhere run uvicorn directly.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Optional
+
+import uvicorn
+
+WORKER_MIN_UPTIME_SECONDS = float(os.getenv("WORKER_MIN_UPTIME_SECONDS", "10"))
+WORKER_RESTART_BACKOFF_SECONDS = float(os.getenv("WORKER_RESTART_BACKOFF_SECONDS", "0.5"))
+WORKER_RESTART_BACKOFF_MAX_SECONDS = 30.0
+WORKER_MAX_FAST_FAILURES = int(os.getenv("WORKER_MAX_FAST_FAILURES", "10"))
+
+
+# MEMORY REPORT
+def process_memory(pid: int) -> dict:
+    """Resident memory of `pid` split into pages only it uses and pages shared with other processes."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[0].endswith(":"):
+                fields[parts[0][:-1]] = int(parts[1])  # kB
+    mb = lambda *names: round(sum(fields.get(name, 0) for name in names) / 1024, 1)
+    return {
+        "pid": pid,
+        "rss_mb": mb("Rss"),
+        "pss_mb": mb("Pss"),
+        "unique_mb": mb("Private_Clean", "Private_Dirty"),
+        "shared_mb": mb("Shared_Clean", "Shared_Dirty"),
+    }
+
+
+def memory_report(master_pid: int, worker_pids: list[int]) -> dict:
+    rows = [{**process_memory(master_pid), "role": "master"}]
+    rows += [{**process_memory(pid), "role": "worker"} for pid in worker_pids]
+    return {
+        "processes": rows,
+        # What the whole server really costs: every process's proportional share added up
+        "total_pss_mb": round(sum(row["pss_mb"] for row in rows), 1),
+        "total_rss_mb": round(sum(row["rss_mb"] for row in rows), 1),
+    }
+
+
+def print_memory_report(master_pid: int, worker_pids: list[int]) -> None:
+    try:
+        report = memory_report(master_pid, worker_pids)
+    except OSError as e:
+        print(f"Memory report unavailable: {e}", file=sys.stderr)
+        return
+    print(f"{'role':<8}{'pid':>8}{'rss MB':>10}{'unique MB':>11}{'shared MB':>11}{'pss MB':>9}", file=sys.stderr)
+    for row in report["processes"]:
+        print(f"{row['role']:<8}{row['pid']:>8}{row['rss_mb']:>10}{row['unique_mb']:>11}"
+              f"{row['shared_mb']:>11}{row['pss_mb']:>9}", file=sys.stderr)
+    print(f"total: {report['total_rss_mb']} MB rss, {report['total_pss_mb']} MB pss", file=sys.stderr)
+
+
+# MASTER: LOAD ONCE, THEN FORK
+PER_WORKER_LIMITS = ("INFERENCE_CONCURRENCY", "HASH_CONCURRENCY", "IMPORT_HASH_WORKERS")
+
+
+def split_cpu_limits(workers: int, environ=os.environ) -> dict:
+    """Default the per-process CPU limits to a share of the cores, so `workers` processes do not oversubscribe them."""
+    share = str(max(1, (os.cpu_count() or 1) // workers))
+    return {name: environ.setdefault(name, share) for name in PER_WORKER_LIMITS}
+
+
+def shared_state_warnings(workers: int, environ=os.environ) -> list[str]:
+    """Per-process backends that behave differently once there is more than one worker."""
+    if workers <= 1:
+        return []
+    warnings = []
+    if environ.get("CACHE_BACKEND", "lru") == "lru":
+        warnings.append("CACHE_BACKEND=lru: other workers may serve invalidated entries until CACHE_TTL_SECONDS")
+    if environ.get("RATE_LIMIT_BACKEND", "memory") == "memory" and environ.get("RATE_LIMIT_PER_SECOND") != "0":
+        warnings.append(f"RATE_LIMIT_BACKEND=memory: each caller gets up to {workers}x the rate limit")
+    return warnings
+
+
+def preload():
+    """Import the app and load everything read-only the workers will share."""
+    from backend import deployments, main
+    from backend.database import SessionLocal, engine
+    from backend.ml import predictor
+
+    main.setup_database()
+    predictor.registry.current()
+    # Start from the last deployed model, so the workers share it instead of each reloading it
+    db = SessionLocal()
+    try:
+        deployments.load_latest(db, predictor.registry)
+    finally:
+        db.close()
+    # The workers must not redo this in their own startup hook
+    main.DB_CREATE_ALL = False
+    engine.dispose()
+
+    gc.collect()
+    gc.freeze()
+    return main.app
+
+
+def after_fork_in_worker() -> None:
+    """Per-worker state that must not be inherited from the master."""
+    from backend import database, rescore
+
+    # Pooled connections are per process; drop the inherited pool objects without closing the parent's sockets
+    database.engine.dispose(close=False)
+    if database.read_engine is not database.engine:
+        database.read_engine.dispose(close=False)
+    rescore._session_factory = None
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+# WORKER RESTARTS
+class RestartBackoff:
+    """Delay before replacing a dead worker; doubles with each worker in a row that dies soon after starting."""
+
+    def __init__(
+        self,
+        min_uptime: float = WORKER_MIN_UPTIME_SECONDS,
+        base: float = WORKER_RESTART_BACKOFF_SECONDS,
+        cap: float = WORKER_RESTART_BACKOFF_MAX_SECONDS,
+        max_failures: int = WORKER_MAX_FAST_FAILURES,
+    ):
+        self.min_uptime = min_uptime
+        self.base = base
+        self.cap = cap
+        self.max_failures = max_failures
+        self.failures = 0
+
+    def delay(self, uptime: float) -> Optional[float]:
+        """Seconds to wait before starting the replacement, or None to give up."""
+        if uptime >= self.min_uptime:
+            self.failures = 0
+            return 0.0
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            return None
+        return min(self.cap, self.base * 2 ** (self.failures - 1))
+
+
+def spawn_worker(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    # Worker: default signal handling (uvicorn installs its own) and a fresh DB pool
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGUSR1):
+        signal.signal(sig, signal.SIG_DFL)
+    code = 0
+    try:
+        after_fork_in_worker()
+        server = uvicorn.Server(uvicorn.Config(app, log_level=log_level, lifespan="on"))
+        server.run(sockets=[sock])
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def serve(host: str, port: int, workers: int, log_level: str = "info", report_after: Optional[float] = None) -> int:
+    if not hasattr(os, "fork"):
+        print("backend.serve needs os.fork; run `uvicorn backend.main:app --workers N` instead", file=sys.stderr)
+        return 1
+
+    # Before preload(): the app reads these limits when it is imported
+    split_cpu_limits(workers)
+    for warning in shared_state_warnings(workers):
+        print(f"Warning: per-process {warning}; use a shared backend with several workers", file=sys.stderr)
+
+    started = time.perf_counter()
+    app = preload()
+    sock = bind_socket(host, port)
+    print(f"Master {os.getpid()}: app and model loaded in {time.perf_counter() - started:.1f}s, "
+          f"forking {workers} workers on {host}:{port}", file=sys.stderr)
+
+    # Worker pid -> when it started; replacements wait in `restarts` (due times) under the backoff
+    pids = {spawn_worker(app, sock, log_level): time.monotonic() for _ in range(workers)}
+    restarts: list[float] = []
+    backoff = RestartBackoff()
+    stopping = False
+    exit_code = 0
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGUSR1, lambda signum, frame: print_memory_report(os.getpid(), sorted(pids)))
+    report_at = time.monotonic() + report_after if report_after else None
+
+    while not stopping:
+        time.sleep(0.2)
+        if report_at is not None and time.monotonic() >= report_at:
+            report_at = None
+            print_memory_report(os.getpid(), sorted(pids))
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if not pid:
+                break
+            started_at = pids.pop(pid, None)
+            if stopping or started_at is None:
+                continue
+            delay = backoff.delay(time.monotonic() - started_at)
+            if delay is None:
+                print(f"Worker {pid} exited ({status}); {backoff.failures} workers in a row died within "
+                      f"{backoff.min_uptime:.0f}s of starting, stopping", file=sys.stderr)
+                stopping, exit_code = True, 1
+            else:
+                print(f"Worker {pid} exited ({status}); starting a replacement in {delay:.1f}s", file=sys.stderr)
+                restarts.append(time.monotonic() + delay)
+        now = time.monotonic()
+        due = [at for at in restarts if at <= now]
+        if due and not stopping:
+            restarts = [at for at in restarts if at > now]
+            for _ in due:
+                pids[spawn_worker(app, sock, log_level)] = time.monotonic()
+
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+    return exit_code
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-fork UzaziSafe API server with a shared, preloaded model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--report-after", type=float, default=None,
+                        help="Print the per-worker memory report this many seconds after start")
+    args = parser.parse_args(argv)
+    return serve(args.host, args.port, args.workers, args.log_level, args.report_after)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Startup phase timing for cold starts.
+
+backend.main wraps each startup phase in `phase(...)`; the timings, the
+time until the app was ready and the time to the first response are
+logged once and served at GET /health/startup. Measure a real cold start
+in a fresh interpreter with:
+
+    python -m backend.startup            # import, first response, model ready
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+STARTED = time.perf_counter()
+PHASES: dict[str, float] = {}
+MILESTONES: dict[str, float] = {}
+
+
+@contextmanager
+def phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASES[name] = PHASES.get(name, 0.0) + time.perf_counter() - started
+
+
+def milestone(name: str) -> None:
+    """Record the first time `name` happened, relative to process start."""
+    MILESTONES.setdefault(name, time.perf_counter() - STARTED)
+
+
+def report() -> dict:
+    return {
+        "phases_ms": {name: round(seconds * 1e3, 1) for name, seconds in PHASES.items()},
+        "milestones_ms": {name: round(seconds * 1e3, 1) for name, seconds in MILESTONES.items()},
+    }
+
+
+def log_report() -> None:
+    phases = ", ".join(f"{name} {ms:.0f} ms" for name, ms in report()["phases_ms"].items())
+    print(f"Startup: {phases}")
+
+
+class FirstResponseMiddleware:
+    """Pure ASGI middleware that records when the first response started; a no-op afterwards."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or "first_response" in MILESTONES:
+            return await self.app(scope, receive, send)
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                milestone("first_response")
+            await send(message)
+
+        return await self.app(scope, receive, send_and_record)
+
+
+# COLD START MEASUREMENT
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import backend.main
+imported = time.perf_counter() - started
+from fastapi.testclient import TestClient
+with TestClient(backend.main.app) as client:
+    client.get("/")
+    first_response = time.perf_counter() - started
+    from backend.ml import predictor
+    predictor.registry.current()
+    model_ready = time.perf_counter() - started
+    client.get("/openapi.json")
+    started_openapi = time.perf_counter()
+    client.get("/openapi.json")
+    openapi_cached = time.perf_counter() - started_openapi
+print(json.dumps({
+    "import_s": round(imported, 3),
+    "first_response_s": round(first_response, 3),
+    "model_ready_s": round(model_ready, 3),
+    "openapi_repeat_ms": round(openapi_cached * 1e3, 2),
+}))
+"""
+
+
+def measure_cold_start(env: Optional[dict] = None) -> dict:
+    """Run the app in a fresh interpreter and time it to first response / model ready."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process_env = {**os.environ, "PYTHONPATH": root, **(env or {})}
+    process_env.setdefault("DATABASE_URL", "sqlite:///./startup_probe.db")
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=root, env=process_env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure API cold start in fresh processes.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--preload", choices=["background", "eager", "lazy"], default=None,
+                        help="Override MODEL_PRELOAD for the measured process")
+    args = parser.parse_args(argv)
+
+    env = {"MODEL_PRELOAD": args.preload} if args.preload else None
+    runs = [measure_cold_start(env) for _ in range(args.runs)]
+    for key in runs[0]:
+        values = sorted(run[key] for run in runs)
+        print(f"{key:<20} median {values[len(values) // 2]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@ os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 from backend.database import Base, engine, SessionLocal, get_db
 from backend.main import app
 from backend import models
+from backend.ratelimit import limiter
 from backend.utils import create_access_token
 
 
@@ -43,6 +44,13 @@ def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 
 
+# Every test starts with full rate-limit buckets (all TestClient requests share one address)
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    limiter.backend.clear()
+    yield
+
+
 # FastAPI test client
 @pytest.fixture
 def client():
@@ -61,7 +69,8 @@ def auth_header_for_user(db_session):
         full_name: str,
         is_provider: bool,
         hospital_name="UzaziSafe Health Center",
-        role=None
+        role=None,
+        is_admin=False,
     ):
         user = models.User(
             full_name=full_name,
@@ -70,6 +79,7 @@ def auth_header_for_user(db_session):
             is_provider=is_provider,
             role=role,
             hospital_name=hospital_name,
+            is_admin=is_admin,
         )
         db_session.add(user)
         db_session.commit()
@@ -0,0 +1,133 @@
+import io
+from backend import models
+from backend.patient_import import import_patients
+from backend.utils import verify_password
+
+
+def test_post_admin_patients_import__creates_and_reports_errors(client, db_session, auth_header_for_user):
+    headers, prov = auth_header_for_user(
+        email="importprov@example.com",
+        is_provider=True,
+        full_name="Import Doc",
+        role="Doctor",
+        is_admin=True,
+    )
+
+    existing = models.User(
+        full_name="Already Here",
+        email="already@import.com",
+        hashed_password="hash",
+        hospital_name=prov.hospital_name,
+    )
+    db_session.add(existing)
+    db_session.commit()
+
+    csv_text = (
+        "full_name,email,password,age,gestational_diabetes\n"
+        "Imp One,imp1@import.com,Secret1!,28,no\n"
+        "Imp Two,imp2@import.com,Secret2!,,\n"
+        "Imp Dup,imp1@import.com,Secret3!,30,No\n"
+        "Already Here,already@import.com,Secret4!,31,No\n"
+        "Bad Email,not-an-email,Secret5!,22,No\n"
+    )
+    files = {"file": ("patients.csv", csv_text, "text/csv")}
+    res = client.post("/admin/patients/import", files=files, headers=headers)
+    assert res.status_code == 200
+
+    data = res.json()
+    assert data["total_rows"] == 5
+    assert data["created"] == 2
+    assert data["failed"] == 3
+    assert sorted(e["row"] for e in data["errors"]) == [4, 5, 6]
+
+    patient = (
+        db_session.query(models.Patient)
+        .join(models.User, models.Patient.user_id == models.User.id)
+        .filter(models.User.email == "imp1@import.com")
+        .first()
+    )
+    assert patient is not None
+    assert patient.age == 28
+    assert patient.gestational_diabetes == "No"
+    assert patient.hospital_name == prov.hospital_name
+    assert patient.provider_id is not None
+
+    login = client.post("/auth/login", json={"email": "imp2@import.com", "password": "Secret2!"})
+    assert login.status_code == 200
+
+
+def test_post_admin_patients_import__missing_columns(client, auth_header_for_user):
+    headers, _ = auth_header_for_user(
+        email="importprov2@example.com",
+        is_provider=True,
+        full_name="Import Doc 2",
+        role="Doctor",
+        is_admin=True,
+    )
+    files = {"file": ("patients.csv", "full_name,email\nA,a@b.com\n", "text/csv")}
+    res = client.post("/admin/patients/import", files=files, headers=headers)
+    assert res.status_code == 400
+
+
+def test_post_admin_patients_import__forbidden_for_patient(client, auth_header_for_user):
+    headers, _ = auth_header_for_user(
+        email="importpatient@example.com", is_provider=False, full_name="Not Admin"
+    )
+    files = {"file": ("patients.csv", "full_name,email,password\n", "text/csv")}
+    res = client.post("/admin/patients/import", files=files, headers=headers)
+    assert res.status_code == 403
+
+
+def test_post_admin_patients_import__forbidden_for_provider_without_admin_role(client, auth_header_for_user):
+    headers, _ = auth_header_for_user(
+        email="importnotadmin@example.com", is_provider=True, full_name="Plain Doc", role="Doctor"
+    )
+    files = {"file": ("patients.csv", "full_name,email,password\n", "text/csv")}
+    res = client.post("/admin/patients/import", files=files, headers=headers)
+    assert res.status_code == 403
+
+
+def test_post_admin_patients_import__only_own_hospital_and_valid_answers(client, auth_header_for_user):
+    headers, admin = auth_header_for_user(
+        email="importadmin3@example.com", is_provider=True, full_name="Import Admin",
+        role="Doctor", hospital_name="MediCare Clinic", is_admin=True,
+    )
+    csv_text = (
+        "full_name,email,password,hospital_name,previous_complications\n"
+        "Own Hospital,Own.Hospital@Import.com,Secret1!,MediCare Clinic,YES\n"
+        "Other Hospital,other.hospital@import.com,Secret2!,UzaziSafe Health Center,No\n"
+        "Bad Answer,bad.answer@import.com,Secret3!,MediCare Clinic,maybe\n"
+    )
+    files = {"file": ("patients.csv", csv_text, "text/csv")}
+    data = client.post("/admin/patients/import", files=files, headers=headers).json()
+
+    assert data["created"] == 1
+    errors = {e["row"]: e["error"] for e in data["errors"]}
+    assert "MediCare Clinic" in errors[3]
+    assert "previous_complications" in errors[4]
+
+    # Stored lowercase, so any casing logs in and a re-signup is caught
+    login = client.post("/auth/login", json={"email": "OWN.hospital@import.com", "password": "Secret1!"})
+    assert login.status_code == 200
+    signup = client.post("/auth/signup/patient", data={
+        "full_name": "Own Again", "email": "own.hospital@IMPORT.com",
+        "password": "Secret9!", "hospital_name": "MediCare Clinic",
+    })
+    assert signup.status_code == 400
+
+
+def test_import_patients__process_pool_hashing(db_session):
+    csv_text = (
+        "full_name,email,password,hospital_name\n"
+        "Pool A,poola@import.com,PoolPass1,MediCare Clinic\n"
+        "Pool B,poolb@import.com,PoolPass2,MediCare Clinic\n"
+        "Pool C,poolc@import.com,PoolPass3,Unknown Hospital\n"
+    )
+    result = import_patients(db_session, io.StringIO(csv_text), batch_size=2, workers=2)
+
+    assert result.created == 2
+    assert result.failed == 1
+    assert result.errors[0].row == 4
+
+    user = db_session.query(models.User).filter_by(email="poolb@import.com").first()
+    assert verify_password("PoolPass2", user.hashed_password)
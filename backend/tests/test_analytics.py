@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+from urllib.parse import quote
+from backend import analytics, models
+from backend.database import count_queries
+
+
+def test_hospital_analytics__summaries_refresh_incrementally(client, db_session, auth_header_for_user):
+    headers, prov = auth_header_for_user(email="stats_prov@example.com", is_provider=True, full_name="Dr. Stats",
+                                         hospital_name="Aga Khan Hospital", role="Doctor")
+    _, peer = auth_header_for_user(email="stats_peer@example.com", is_provider=True, full_name="Dr. Peer",
+                                   hospital_name="Aga Khan Hospital")
+    other_headers, _ = auth_header_for_user(email="stats_other@example.com", is_provider=True, full_name="Dr. Else",
+                                            hospital_name="MediCare Clinic")
+    _, user = auth_header_for_user(email="stats_patient@patient.com", is_provider=False, full_name="Counted",
+                                   hospital_name="Aga Khan Hospital")
+    patients = [
+        models.Patient(full_name=f"Counted {i}", hospital_name="Aga Khan Hospital", user_id=user.id,
+                       provider_id=prov.id, risk_level=risk)
+        for i, risk in enumerate(["High Risk", "Low Risk", "Low Risk", "High Risk"])
+    ]
+    db_session.add_all(patients)
+    db_session.flush()
+    db_session.add_all([
+        models.RiskHistory(patient_id=patients[0].id, risk_level="High Risk", created_at=datetime(2030, 3, 1, 9)),
+        models.RiskHistory(patient_id=patients[1].id, risk_level="Low Risk", created_at=datetime(2030, 3, 1, 17)),
+        models.RiskHistory(patient_id=patients[3].id, risk_level="High Risk", created_at=datetime(2030, 3, 2, 8)),
+        models.Appointment(patient_name="Counted 0", provider_id=prov.id, date=datetime(2030, 3, 1), status="Completed"),
+        models.Appointment(patient_name="Counted 1", provider_id=prov.id, date=datetime(2030, 3, 2), status="Completed"),
+        models.Appointment(patient_name="Counted 2", provider_id=prov.id, date=datetime(2030, 3, 3), status="Cancelled"),
+        models.Appointment(patient_name="Counted 3", provider_id=prov.id, date=datetime(2030, 3, 9)),
+    ])
+    db_session.commit()
+
+    first = analytics.refresh(db_session, today=date(2030, 3, 2))
+    assert first["settled_through"] == date(2030, 2, 28)
+
+    # A late row for a still-open day is picked up; rows in settled days are not rescanned
+    db_session.add(models.RiskHistory(patient_id=patients[2].id, risk_level="Low Risk",
+                                      created_at=datetime(2030, 3, 2, 23)))
+    db_session.add(models.RiskHistory(patient_id=patients[2].id, risk_level="Low Risk",
+                                      created_at=datetime(2030, 2, 20, 12)))
+    db_session.commit()
+    analytics.refresh(db_session, today=date(2030, 3, 3))
+
+    days = {
+        d.day: (d.assessments, d.high_risk_assessments)
+        for d in db_session.query(models.DailyAssessmentSummary).filter_by(hospital_name="Aga Khan Hospital")
+    }
+    assert days == {date(2030, 3, 1): (2, 1), date(2030, 3, 2): (2, 1)}
+
+    url = f"/hospitals/{quote('Aga Khan Hospital')}/analytics"
+    with count_queries() as queries:
+        res = client.get(url, params={"days": 366}, headers=headers)
+    assert res.status_code == 200 and queries.round_trips <= 4
+    body = res.json()
+    mine = next(p for p in body["providers"] if p["provider_id"] == prov.id)
+    assert (mine["patients"], mine["high_risk_patients"], mine["high_risk_share"]) == (4, 2, 0.5)
+    assert (mine["appointments"], mine["completion_rate"]) == (4, 0.6667)
+    assert any(p["provider_id"] == peer.id and p["patients"] == 0 for p in body["providers"])
+    assert body["refreshed_at"] is not None
+
+    overview = client.get("/hospitals/analytics", headers=headers).json()
+    aga_khan = next(h for h in overview["hospitals"] if h["hospital_name"] == "Aga Khan Hospital")
+    assert aga_khan["providers"] >= 2 and aga_khan["patients"] >= 4
+
+    assert client.get(url, headers=other_headers).status_code == 403
+    assert client.get("/hospitals/Unknown%20Clinic/analytics", headers=headers).status_code == 422
+    assert client.post("/hospitals/analytics/refresh", headers=headers).json()["providers"] >= 3
+
+
+def test_analytics_refresh__scheduled_refresh_skips_when_recent(db_session):
+    first = analytics.refresh(db_session, today=date(2030, 3, 2))
+    refreshed_at = first["refreshed_at"]
+
+    # Another worker's schedule finds the summaries fresh and does not touch them
+    assert analytics.refresh(db_session, stale_before=refreshed_at - timedelta(seconds=30)) is None
+    assert db_session.get(models.AnalyticsRefresh, 1).refreshed_at == refreshed_at
+
+    again = analytics.refresh(db_session, stale_before=refreshed_at + timedelta(seconds=1))
+    assert again is not None and again["refreshed_at"] > refreshed_at
@@ -0,0 +1,45 @@
+import importlib.util
+import numpy as np
+import pytest
+from backend.ml.backends import load_backend
+from backend.ml.features import FEATURE_NAMES
+from backend.ml.model_report import measure_backend
+from backend.ml.training import load_dataset
+
+
+@pytest.fixture(scope="module")
+def sample():
+    X, y = load_dataset()
+    return X[:20], y[:20]
+
+
+@pytest.mark.parametrize("name", ["xgboost", "random_forest", "logistic"])
+def test_backends_load_backend__predicts_and_explains(name, sample):
+    X, _ = sample
+    backend = load_backend(name)
+
+    prob = backend.predict_proba(X)
+    assert prob.shape == (20,)
+    assert ((prob >= 0) & (prob <= 1)).all()
+
+    contributions = backend.explain(X[:3])
+    assert contributions.shape == (3, len(FEATURE_NAMES))
+
+
+@pytest.mark.skipif(importlib.util.find_spec("keras") is not None, reason="Keras is installed")
+def test_backends_load_backend__neural_requires_keras():
+    with pytest.raises(RuntimeError):
+        load_backend("nn_optimized", "models/optimized_nn_model.keras")
+
+
+def test_backends_load_backend__unknown_name():
+    with pytest.raises(ValueError):
+        load_backend("svm")
+
+
+def test_model_report_measure_backend__reports_accuracy_latency_memory():
+    result = measure_backend("logistic", holdout=True, repeats=10, batch_rows=100)
+    assert 0.5 < result["accuracy"] <= 1
+    assert 0.5 < result["roc_auc"] <= 1
+    assert result["single_row_p50_ms"] > 0
+    assert result["batch_rows_per_second"] > 0
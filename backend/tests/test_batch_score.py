@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from backend.ml import predictor
+from backend.ml.batch_score import score_file
+from backend.schemas import RiskAssessmentRequest
+
+ROWS = [
+    {"Age": 22, "Systolic BP": 90, "Diastolic BP": 60, "Blood Sugar": 9.0, "Body Temp": 100.0,
+     "Heart Rate": 80, "Previous Complications": "Yes", "Pre-existing Diabetes": "Yes", "Gestational Diabetes": "No"},
+    {"Age": 27, "Systolic BP": 110, "Diastolic BP": 70, "Blood Sugar": 7.5, "Body Temp": 98.0,
+     "Heart Rate": 72, "Previous Complications": "No", "Pre-existing Diabetes": "No", "Gestational Diabetes": "No"},
+    {"Age": 35, "Systolic BP": None, "Diastolic BP": 90, "Blood Sugar": 15.0, "Body Temp": 98.0,
+     "Heart Rate": 88, "Previous Complications": None, "Pre-existing Diabetes": "Yes", "Gestational Diabetes": "Yes"},
+]
+
+
+def test_features_from_frame__matches_assess_risk_mapping():
+    api_rows = [{field: row[feature] for feature, field in predictor.FEATURE_FIELDS.items()} for row in ROWS]
+    labels, high_prob = predictor.predict_batch(predictor.features_from_frame(pd.DataFrame(ROWS)))
+    api_labels, _ = predictor.predict_batch(predictor.features_from_frame(pd.DataFrame(api_rows)))
+
+    for i, payload in enumerate(api_rows):
+        single = predictor.assess_risk(predictor.features_from_requests([RiskAssessmentRequest(**payload)]))
+        assert single["Prediction"] == labels[i] == api_labels[i]
+        assert single["High_Risk_Probability"] == pytest.approx(high_prob[i], abs=1e-3)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_score__scores_file_in_chunks(tmp_path, workers):
+    source = tmp_path / "extract.csv"
+    pd.DataFrame(ROWS * 4).to_csv(source, index=False)
+    target = tmp_path / "scored.csv"
+
+    stats = score_file(str(source), str(target), chunk_size=5, workers=workers, with_shap=True, log=lambda m: None)
+
+    scored = pd.read_csv(target)
+    assert stats["rows"] == len(scored) == 12
+    assert list(scored["Prediction"][:3]) == list(scored["Prediction"][3:6])
+    assert "SHAP Blood Sugar" in scored.columns
+    assert ((scored["High_Risk_Probability"] + scored["Low_Risk_Probability"]).round(3) == 1).all()
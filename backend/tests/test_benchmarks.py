@@ -0,0 +1,25 @@
+import json
+from backend.benchmarks.compare import compare, load_stats
+
+
+def _report(path, medians):
+    path.write_text(json.dumps({
+        "benchmarks": [
+            {"fullname": name, "stats": {"median": value, "mean": value}}
+            for name, value in medians.items()
+        ]
+    }))
+    return str(path)
+
+
+def test_benchmarks_compare__flags_regressions_above_threshold(tmp_path):
+    baseline = _report(tmp_path / "base.json", {"a": 1.0, "b": 2.0, "gone": 1.0})
+    current = _report(tmp_path / "cur.json", {"a": 1.1, "b": 3.0, "new": 5.0})
+
+    rows = compare(load_stats(current), load_stats(baseline), threshold=0.2)
+    by_name = {r["name"]: r for r in rows}
+
+    assert set(by_name) == {"a", "b"}
+    assert by_name["a"]["regressed"] is False
+    assert by_name["b"]["regressed"] is True
+    assert round(by_name["b"]["change"], 2) == 0.5
@@ -0,0 +1,102 @@
+import time
+from backend import models
+from backend.cache import LRUBackend, ReadThroughCache, RedisBackend, cache
+from backend.database import count_queries
+import backend.routes.risk_assess as risk_routes
+
+
+class FakeRedis:
+    """Minimal stand-in for a redis-py client (get / set(ex=) / delete)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None or value[0] < time.monotonic():
+            return None
+        return value[1]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (time.monotonic() + (ex or 3600), value)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def test_lru_backend__evicts_least_recent_and_expires():
+    lru = LRUBackend(max_entries=2)
+    lru.set("a", b"1", ttl=60)
+    lru.set("b", b"2", ttl=60)
+    lru.get("a")
+    lru.set("c", b"3", ttl=60)
+    assert (lru.get("a"), lru.get("b"), lru.get("c")) == (b"1", None, b"3")
+
+    lru.set("short", b"x", ttl=-1)
+    assert lru.get("short") is None
+
+
+def test_read_through__hit_ratio_invalidation_and_racing_write():
+    store = ReadThroughCache(RedisBackend(FakeRedis()), ttl=60)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return b"v%d" % len(loads)
+
+    assert store.get_or_load("k", load) == b"v1"
+    assert store.get_or_load("k", load) == b"v1"
+    store.invalidate("k")
+    assert store.get_or_load("k", load) == b"v2"
+
+    # A write that lands while a miss is loading must not leave the old value cached
+    def racing_load():
+        store.invalidate("k")
+        return b"stale"
+
+    store.invalidate("k")
+    assert store.get_or_load("k", racing_load) == b"stale"
+    assert store.get_or_load("k", load) == b"v3"
+
+    stats = store.stats()
+    assert (stats["backend"], stats["hits"], stats["misses"]) == ("redis", 1, 4)
+    assert stats["hit_ratio"] == 0.2
+
+
+def test_latest_risk_and_provider_patients__cached_until_writes(client, db_session, auth_header_for_user, monkeypatch):
+    prov_headers, prov = auth_header_for_user(email="cache_prov@example.com", is_provider=True, full_name="Dr. Cache")
+    headers, user = auth_header_for_user(email="cache_patient@patient.com", is_provider=False, full_name="Cached")
+    patient = models.Patient(full_name="Cached", hospital_name="UzaziSafe Health Center", user_id=user.id,
+                             provider_id=prov.id)
+    db_session.add(patient)
+    db_session.commit()
+    monkeypatch.setattr(risk_routes, "assess_risk", lambda X: {
+        "Prediction": "High Risk", "High_Risk_Probability": 0.8,
+        "Low_Risk_Probability": 0.2, "Top_Contributing_Factors": {"Blood Sugar": 0.4},
+    })
+    cache.reset_stats()
+
+    assert client.post("/assess-risk/", json={"Systolic_BP": 120}, headers=headers).status_code == 200
+    first = client.get(f"/patients/{patient.id}/latest-risk").json()
+    with count_queries() as queries:
+        again = client.get(f"/patients/{patient.id}/latest-risk").json()
+    assert again == first and queries.round_trips == 0
+    assert first["contributing_factors"] == {"Blood Sugar": 0.4}
+
+    # Each write path drops exactly the entries it changed
+    client.post("/assess-risk/", json={"Systolic_BP": 150}, headers=headers)
+    assert client.get(f"/patients/{patient.id}/latest-risk").json()["vitals"]["systolic"] == 150
+    client.patch("/patients/update-static-info", json={"age": 31}, headers=headers)
+    assert client.get(f"/patients/{patient.id}/latest-risk").json()["patient_info"]["age"] == 31
+
+    listed = client.get(f"/providers/{prov.id}/patients").json()
+    assert [(p["id"], p["risk_level"], p["age"]) for p in listed] == [(patient.id, "High Risk", 31)]
+    assert client.get(f"/providers/{prov.id}/patients").json() == listed
+    assert client.delete(f"/providers/{prov.id}/patients/{patient.id}", headers=prov_headers).status_code == 204
+    assert client.get(f"/providers/{prov.id}/patients").json() == []
+    assert client.get(f"/patients/{patient.id}/latest-risk").status_code == 404
+
+    stats = client.get("/admin/cache", headers=prov_headers).json()
+    assert stats["backend"] == "lru" and stats["hits"] == 2
+    assert 0 < stats["hit_ratio"] < 1 and stats["invalidations"] >= 6
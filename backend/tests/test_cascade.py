@@ -0,0 +1,51 @@
+import numpy as np
+from backend.ml.backends import CascadeBackend, load_backend
+from backend.ml.cascade import evaluate_band, recommend
+from backend.ml.features import FEATURE_NAMES
+from backend.ml.training import load_dataset
+
+
+def test_cascade_backend__escalates_only_inside_band():
+    X, _ = load_dataset()
+    X = X[:200]
+    cheap, full = load_backend("logistic"), load_backend("xgboost")
+    cascade = CascadeBackend(cheap, full, band_low=0.2, band_high=0.8)
+
+    cheap_prob = cheap.predict_proba(X)
+    full_prob = full.predict_proba(X)
+    prob = cascade.predict_proba(X)
+
+    inside = (cheap_prob >= 0.2) & (cheap_prob <= 0.8)
+    assert np.allclose(prob[inside], full_prob[inside])
+    assert np.allclose(prob[~inside], cheap_prob[~inside])
+
+    stats = cascade.stats()
+    assert stats["scored"] == 200
+    assert stats["escalated"] == int(inside.sum())
+
+    contributions = cascade.explain(X[:5])
+    assert contributions.shape == (5, len(FEATURE_NAMES))
+
+    # Explaining the rows just scored reuses their escalation mask instead of re-scoring them
+    calls = []
+    score = cheap.predict_proba
+    cheap.predict_proba = lambda rows: calls.append(len(rows)) or score(rows)
+    row = X[:1]
+    cascade.predict_proba(row)
+    cascade.explain(row)
+    assert calls == [1]
+
+
+def test_cascade_evaluate_band__and_recommend():
+    y = np.array([1, 0, 1, 0])
+    cheap = np.array([0.9, 0.55, 0.45, 0.1])
+    full = np.array([0.95, 0.2, 0.8, 0.05])
+
+    narrow = evaluate_band(cheap, full, y, 0.5, 0.5)
+    wide = evaluate_band(cheap, full, y, 0.4, 0.6)
+
+    assert narrow["escalation_rate"] == 0.0
+    assert narrow["accuracy"] == 0.5
+    assert wide["escalation_rate"] == 0.5
+    assert wide["agreement"] == 1.0
+    assert recommend([narrow, wide])["band"] == [0.4, 0.6]
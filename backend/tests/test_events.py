@@ -0,0 +1,103 @@
+import asyncio
+import json
+import threading
+from backend import models
+from backend.events import RESYNC, EventHub, hub
+from backend.routes.provider import stream_provider_events
+import backend.routes.risk_assess as risk_routes
+
+
+def parse(frame: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().splitlines() if not line.startswith(":"))
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_event_hub__cross_thread_publish_bounded_queue_and_cleanup():
+    events = EventHub(max_queue=3, heartbeat=0.05)
+
+    async def scenario():
+        stream = events.stream(7)
+        assert parse(await stream.__anext__())[0] == "ready"
+
+        # Published from a worker thread, as sync routes do
+        worker = threading.Thread(target=events.publish, args=(7, "assessment", {"patient_id": 1}))
+        worker.start()
+        worker.join()
+        assert parse(await stream.__anext__()) == ("assessment", {"patient_id": 1})
+        assert events.publish(8, "assessment", {}) == 0
+
+        # Idle streams get heartbeats
+        assert (await stream.__anext__()).startswith(b":")
+
+        # A client that falls behind gets one resync instead of an unbounded backlog
+        for i in range(10):
+            events.publish(7, "assessment", {"patient_id": i})
+        await asyncio.sleep(0)
+        assert await stream.__anext__() == RESYNC
+        assert (await stream.__anext__()).startswith(b":")
+
+        assert events.stats()["connections"] == 1
+        await stream.aclose()
+        assert events.stats()["connections"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_provider_events__pushed_by_write_paths(client, db_session, auth_header_for_user, monkeypatch):
+    prov_headers, prov = auth_header_for_user(email="events_prov@example.com", is_provider=True, full_name="Dr. Push")
+    headers, user = auth_header_for_user(email="events_patient@patient.com", is_provider=False, full_name="Pushed")
+    patient = models.Patient(full_name="Pushed", hospital_name="UzaziSafe Health Center", user_id=user.id,
+                             provider_id=prov.id, risk_level="Unknown")
+    db_session.add(patient)
+    db_session.commit()
+    monkeypatch.setattr(risk_routes, "assess_risk", lambda X: {
+        "Prediction": "High Risk", "High_Risk_Probability": 0.9,
+        "Low_Risk_Probability": 0.1, "Top_Contributing_Factors": {},
+    })
+    assert client.get(f"/providers/{prov.id}/events").status_code == 401
+
+    async def scenario():
+        stream = hub.stream(prov.id)
+        await stream.__anext__()
+        res = await asyncio.to_thread(client.post, "/assess-risk/", json={"Systolic_BP": 150}, headers=headers)
+        assert res.status_code == 200
+        event, data = parse(await asyncio.wait_for(stream.__anext__(), 5))
+        assert event == "assessment"
+        assert (data["patient_id"], data["risk_level"], data["previous_risk_level"]) == (patient.id, "High Risk", "Unknown")
+
+        booking = {"patient_name": "Pushed", "provider_id": prov.id, "date": "2030-01-01T09:00:00",
+                   "appointment_type": "Checkup", "status": "Scheduled"}
+        res = await asyncio.to_thread(client.post, "/appointments/book", json=booking)
+        assert res.status_code == 200
+        event, data = parse(await asyncio.wait_for(stream.__anext__(), 5))
+        assert (event, data["action"], data["appointment_id"]) == ("appointment", "booked", res.json()["id"])
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert client.get("/admin/events", headers=prov_headers).json()["connections"] == 0
+
+
+def test_provider_events__need_a_stream_token_for_that_provider(client, auth_header_for_user):
+    headers, prov = auth_header_for_user(email="events_token@example.com", is_provider=True, full_name="Dr. Token")
+    other_headers, _ = auth_header_for_user(email="events_other@example.com", is_provider=True, full_name="Dr. Other")
+    patient_headers, _ = auth_header_for_user(email="events_pat@patient.com", is_provider=False, full_name="Pat")
+
+    assert client.post(f"/providers/{prov.id}/events/token", headers=other_headers).status_code == 403
+    assert client.post(f"/providers/{prov.id}/events/token", headers=patient_headers).status_code == 403
+    res = client.post(f"/providers/{prov.id}/events/token", headers=headers)
+    assert res.status_code == 200
+    token = res.json()["token"]
+
+    # Neither the access token nor a stream token for another provider opens the stream
+    access_token = headers["Authorization"].split()[1]
+    assert client.get(f"/providers/{prov.id}/events", params={"token": access_token}).status_code == 401
+    assert client.get(f"/providers/{prov.id + 1}/events", params={"token": token}).status_code == 401
+    # The stream token is logged with the URL, so it must not work as a bearer token
+    assert client.get("/providers/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+    async def scenario():
+        response = await stream_provider_events(prov.id, token)
+        assert parse(await response.body_iterator.__anext__())[0] == "ready"
+        await response.body_iterator.aclose()
+
+    asyncio.run(scenario())
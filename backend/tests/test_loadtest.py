@@ -0,0 +1,51 @@
+from backend import models
+from backend.loadtest.seed import seed_accounts
+from backend.loadtest.slo import evaluate
+
+
+SLOS = {
+    "default": {"p95": 500},
+    "max_failure_ratio": 0.05,
+    "endpoints": {"POST /auth/login": {"p95": 2000, "p99": 3000}},
+}
+
+
+def _row(method, name, p95, p99=None, requests=100, failures=0):
+    return {"method": method, "name": name, "num_requests": requests,
+            "num_failures": failures, "p50": 10, "p95": p95, "p99": p99}
+
+
+def test_loadtest_slo_evaluate__uses_endpoint_overrides_and_default():
+    rows = [
+        _row("POST", "/auth/login", p95=1500, p99=2500),   # within override
+        _row("GET", "/patients/me", p95=800),               # breaches default
+        _row("GET", "/providers/me", p95=100, failures=10),  # breaches failure ratio
+    ]
+    breaches = evaluate(rows, SLOS)
+
+    assert len(breaches) == 2
+    assert breaches[0].startswith("GET /patients/me: p95")
+    assert "failure ratio" in breaches[1]
+
+
+def test_loadtest_slo_evaluate__no_slos_means_no_breaches():
+    assert evaluate([_row("GET", "/x", p95=99999)], {}) == []
+
+
+def test_loadtest_seed_accounts__assigns_patients_to_providers(db_session):
+    accounts = seed_accounts(db_session, patients=5, providers=2, prefix="seedtest")
+
+    assert len(accounts["patients"]) == 5
+    assert len(accounts["providers"]) == 2
+
+    provider_ids = {p["id"] for p in accounts["providers"]}
+    patients = (
+        db_session.query(models.Patient)
+        .filter(models.Patient.full_name.like("Load Patient seedtest %"))
+        .all()
+    )
+    assert len(patients) == 5
+    assert {p.provider_id for p in patients} == provider_ids
+    # Each patient is in the hospital of the provider they were assigned to
+    hospital_of = {u.id: u.hospital_name for u in db_session.query(models.User).filter(models.User.id.in_(provider_ids))}
+    assert all(p.hospital_name == hospital_of[p.provider_id] for p in patients)
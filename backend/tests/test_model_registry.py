@@ -0,0 +1,231 @@
+import os
+import time
+import numpy as np
+import pytest
+from backend import deployments, models
+from backend.ml import predictor
+from backend.ml.features import FEATURE_NAMES
+from backend.ml.registry import ModelRegistry
+from backend.database import SessionLocal
+from backend.schemas import RiskAssessmentRequest
+
+
+class ConstantBackend:
+    explainer = None
+
+    def __init__(self, name, prob):
+        self.name = name
+        self.model = name
+        self.prob = prob
+
+    def predict_proba(self, X):
+        return np.full(len(X), self.prob)
+
+    def explain(self, X):
+        return None
+
+
+def make_registry(probs, fail=()):
+    def loader(name, model_path=None):
+        if name in fail:
+            raise FileNotFoundError(f"no artifact for {name}")
+        return ConstantBackend(name, probs[name])
+
+    return ModelRegistry(loader=loader, warm_up=lambda backend: backend.predict_proba(np.zeros((1, 9))))
+
+
+@pytest.fixture
+def restore_predictor():
+    active = predictor.registry.current()
+    yield
+    predictor.registry.stop_shadow()
+    predictor.registry.active = active
+    # Leave no deployment for workers started by later tests to apply
+    db = SessionLocal()
+    db.query(models.ModelDeployment).delete()
+    db.commit()
+    db.close()
+
+
+def test_model_registry_reload_async__swaps_active_model():
+    registry = make_registry({"old": 0.2, "new": 0.8})
+    registry.load("old")
+    in_flight = registry.active
+
+    assert registry.reload_async("new")
+    registry.wait(5)
+
+    assert registry.active.name == "new"
+    assert registry.reloads == 1
+    # A request that pinned the old model keeps scoring with it
+    assert in_flight.backend.predict_proba(np.zeros((1, 9)))[0] == 0.2
+
+
+def test_model_registry_reload_async__failed_load_keeps_current_model():
+    registry = make_registry({"old": 0.2}, fail={"broken"})
+    registry.load("old")
+
+    registry.reload_async("broken")
+    registry.wait(5)
+
+    assert registry.active.name == "old"
+    status = registry.status()
+    assert status["state"] == "failed"
+    assert "no artifact" in status["last_error"]
+
+
+def test_model_registry_reload_async__same_backend_keeps_active_artifact():
+    registry = make_registry({"old": 0.2})
+    registry.load("old", "/models/old-v2")
+
+    registry.reload_async()
+    registry.wait(5)
+
+    assert registry.active.model_path == "/models/old-v2"
+
+
+def test_model_registry_shadow__records_agreement_and_latency():
+    registry = make_registry({"active": 0.7, "agrees": 0.9, "disagrees": 0.1})
+    registry.load("active")
+    X = np.zeros((1, len(FEATURE_NAMES)), dtype=np.float32)
+
+    registry.start_shadow("agrees", sample_rate=1.0)
+    for _ in range(4):
+        registry.observe(X, np.array([0.7]))
+    registry.shadow.drain()
+    stats = registry.status()["shadow"]
+    assert stats["submitted"] == 4
+    assert stats["agreement"] == 1.0
+    assert stats["mean_abs_prob_diff"] == pytest.approx(0.2)
+    assert stats["latency_p50_ms"] is not None
+
+    registry.start_shadow("disagrees", sample_rate=1.0)
+    registry.observe(X, np.array([0.7]))
+    registry.shadow.drain()
+    assert registry.stop_shadow()["agreement"] == 0.0
+    assert registry.shadow is None
+
+
+def test_model_registry_shadow__zero_sample_rate_skips_traffic():
+    registry = make_registry({"active": 0.7, "candidate": 0.9})
+    registry.load("active")
+    registry.start_shadow("candidate", sample_rate=0.0)
+
+    registry.observe(np.zeros((1, 9)), np.array([0.7]))
+
+    assert registry.status()["shadow"]["submitted"] == 0
+
+
+def test_model_registry_watch__reloads_when_artifact_changes(tmp_path):
+    artifact = tmp_path / "model.pkl"
+    artifact.write_text("v1")
+    registry = make_registry({"old": 0.2})
+    registry.load("old", str(artifact))
+
+    registry.watch(str(artifact), interval=0.05)
+    later = time.time() + 10
+    os.utime(artifact, (later, later))
+
+    deadline = time.time() + 5
+    while registry.reloads == 0 and time.time() < deadline:
+        time.sleep(0.05)
+    registry.wait(5)
+    assert registry.reloads == 1
+    assert registry.active.model_path == str(artifact)
+
+
+def test_post_admin_model_reload__swaps_served_model(client, auth_header_for_user, restore_predictor, monkeypatch):
+    headers, _ = auth_header_for_user(
+        email="reloadprov@example.com",
+        is_provider=True,
+        full_name="Reload Doc",
+        role="Doctor",
+        is_admin=True,
+    )
+
+    res = client.post("/admin/model/reload", json={"backend": "logistic"}, headers=headers)
+    assert res.status_code == 202
+    predictor.registry.wait(30)
+
+    status = client.get("/admin/model", headers=headers).json()
+    assert status["active"]["backend"] == "logistic"
+    assert status["state"] == "idle"
+    assert predictor.backend.name == "logistic"
+
+    # Another worker, still on its startup model, catches up on its next poll
+    db = SessionLocal()
+    try:
+        assert deployments.latest(db).id == res.json()["deployment_id"]
+        other_worker = make_registry({"xgboost": 0.2, "logistic": 0.8})
+        other_worker.load("xgboost")
+        monkeypatch.setattr(deployments, "_applied_id", None)
+        assert deployments.sync(db, other_worker)
+        other_worker.wait(5)
+        assert other_worker.active.name == "logistic"
+        assert not deployments.sync(db, other_worker)
+    finally:
+        db.close()
+
+
+def test_post_admin_model_reload__rejects_unknown_backend(client, auth_header_for_user):
+    headers, _ = auth_header_for_user(
+        email="reloadbad@example.com",
+        is_provider=True,
+        full_name="Reload Bad",
+        role="Doctor",
+        is_admin=True,
+    )
+
+    res = client.post("/admin/model/reload", json={"backend": "svm"}, headers=headers)
+    assert res.status_code == 400
+
+
+def test_post_admin_model_reload__only_admins_and_model_names(client, auth_header_for_user):
+    headers, _ = auth_header_for_user(
+        email="reloadnotadmin@example.com", is_provider=True, full_name="Reload Plain", role="Doctor"
+    )
+    assert client.post("/admin/model/reload", json={"backend": "logistic"}, headers=headers).status_code == 403
+
+    headers, _ = auth_header_for_user(
+        email="reloadpath@example.com", is_provider=True, full_name="Reload Path", role="Doctor", is_admin=True
+    )
+    for model in ("../backend/xgboost_model.pkl", "/etc/passwd", "missing-model.pkl"):
+        res = client.post("/admin/model/reload", json={"backend": "xgboost", "model": model}, headers=headers)
+        assert res.status_code == 400
+    res = client.post("/admin/model/shadow", json={"backend": "xgboost", "model": "../requirements.txt"}, headers=headers)
+    assert res.status_code == 400
+
+
+def test_admin_model_shadow__scores_live_requests(client, auth_header_for_user, restore_predictor):
+    headers, _ = auth_header_for_user(
+        email="shadowprov@example.com",
+        is_provider=True,
+        full_name="Shadow Doc",
+        role="Doctor",
+        is_admin=True,
+    )
+
+    res = client.post("/admin/model/shadow", json={"backend": "logistic", "sample_rate": 1.0}, headers=headers)
+    assert res.status_code == 200
+    assert res.json()["backend"] == "logistic"
+
+    request = RiskAssessmentRequest(Age=30, Systolic_BP=150, Diastolic_BP=95)
+    result = predictor.assess_risk(predictor.features_from_requests([request]))
+    assert result["Prediction"] in ("High Risk", "Low Risk")
+    predictor.registry.shadow.drain()
+
+    stats = client.delete("/admin/model/shadow", headers=headers).json()
+    assert stats["submitted"] == 1
+    assert stats["scored"] == 1
+    assert client.delete("/admin/model/shadow", headers=headers).status_code == 404
+
+
+def test_get_admin_model__forbidden_for_patient(client, auth_header_for_user):
+    headers, _ = auth_header_for_user(
+        email="modelpatient@example.com",
+        is_provider=False,
+        full_name="Model Patient",
+    )
+
+    res = client.get("/admin/model", headers=headers)
+    assert res.status_code == 403
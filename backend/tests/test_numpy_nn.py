@@ -0,0 +1,98 @@
+import json
+import os
+import zipfile
+import numpy as np
+import pytest
+from backend.ml.backends import NumpyNNBackend, load_backend
+from backend.ml.numpy_nn import NumpyMLP, export, main, read_keras_archive
+from backend.ml.training import load_dataset
+
+MODELS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "models")
+
+# High-risk probabilities of the first 8 dataset rows from the shipped exports, checked against Keras when exported
+REFERENCE = {
+    "optimized_nn_model": [0.891894, 0.039951, 0.507314, 0.027164, 0.029067, 0.077351, 0.89438, 0.028954],
+    "vanilla_nn_model": [0.866534, 0.093093, 0.363193, 0.103484, 0.141278, 0.097017, 0.804752, 0.089559],
+}
+
+
+@pytest.fixture(scope="module")
+def sample():
+    X, _ = load_dataset()
+    return X[:200]
+
+
+def test_numpy_mlp_forward__matches_manual_computation():
+    kernels = [np.array([[1.0, -1.0], [2.0, 0.5]], dtype=np.float32), np.array([[1.0], [1.0]], dtype=np.float32)]
+    biases = [np.array([0.0, 1.0], dtype=np.float32), np.array([-1.0], dtype=np.float32)]
+    mlp = NumpyMLP(kernels, biases, ["relu", "sigmoid"], mean=np.array([1.0, 1.0]), scale=np.array([2.0, 2.0]))
+
+    prob = mlp.predict_proba(np.array([[3.0, 1.0], [1.0, 5.0]]))
+
+    # Row 1: scaled [1, 0] -> relu([1, 0]) -> sigmoid(0); row 2: scaled [0, 2] -> relu([4, 2]) -> sigmoid(5)
+    np.testing.assert_allclose(prob, [0.5, 1 / (1 + np.exp(-5))], rtol=1e-6)
+
+
+@pytest.mark.parametrize("name", ["nn_optimized", "nn_vanilla"])
+def test_backends_load_backend__neural_served_without_tensorflow(name, sample):
+    backend = load_backend(name)
+
+    prob = backend.predict_proba(sample)
+    assert isinstance(backend, NumpyNNBackend)
+    assert prob.shape == (200,)
+    assert ((prob >= 0) & (prob <= 1)).all()
+
+
+def test_numpy_nn_export__reproduces_shipped_npz(tmp_path, sample):
+    pytest.importorskip("h5py")
+    output = tmp_path / "optimized.npz"
+
+    export(os.path.join(MODELS, "optimized_nn_model.keras"), str(output), os.path.join(MODELS, "scaler.pkl"))
+
+    fresh = NumpyMLP.load(str(output)).predict_proba(sample)
+    shipped = NumpyMLP.load(os.path.join(MODELS, "optimized_nn_model.npz")).predict_proba(sample)
+    np.testing.assert_allclose(fresh, shipped, atol=1e-7)
+
+
+@pytest.mark.parametrize("stem", sorted(REFERENCE))
+def test_numpy_nn__matches_stored_reference_output(stem, sample):
+    prob = NumpyMLP.load(os.path.join(MODELS, f"{stem}.npz")).predict_proba(sample[:8])
+    np.testing.assert_allclose(prob, REFERENCE[stem], atol=1e-5)
+
+
+def test_numpy_nn_export__activation_layer_applies_after_dense(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    kernel = np.array([[1.0, -1.0], [0.5, 2.0]], dtype=np.float32)
+    config = {"config": {"layers": [
+        {"class_name": "InputLayer", "config": {}},
+        {"class_name": "Dense", "config": {"activation": "relu", "use_bias": False}},
+        {"class_name": "Activation", "config": {"activation": "sigmoid"}},
+        {"class_name": "Dense", "config": {"activation": "linear", "use_bias": False}},
+        {"class_name": "Activation", "config": {"activation": "tanh"}},
+    ]}}
+    weights_path = tmp_path / "model.weights.h5"
+    with h5py.File(weights_path, "w") as weights:
+        weights["layers/dense/vars/0"] = kernel
+        weights["layers/dense_1/vars/0"] = kernel
+    archive_path = tmp_path / "model.keras"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("config.json", json.dumps(config))
+        archive.write(weights_path, "model.weights.h5")
+
+    layers = read_keras_archive(str(archive_path))
+
+    # relu is kept and sigmoid follows as an identity layer; tanh replaces the linear activation
+    assert [layer["activation"] for layer in layers] == ["relu", "sigmoid", "tanh"]
+    mlp = NumpyMLP([layer["kernel"] for layer in layers], [np.zeros(2, dtype=np.float32)] * 3,
+                   [layer["activation"] for layer in layers])
+    x = np.array([[1.0, -2.0]], dtype=np.float32)
+    expected = np.tanh((1 / (1 + np.exp(-np.maximum(x @ kernel, 0)))) @ kernel)
+    np.testing.assert_allclose(mlp.forward(x), expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize("stem", ["optimized_nn_model", "vanilla_nn_model"])
+def test_numpy_nn_parity__matches_keras(stem):
+    pytest.importorskip("keras")
+    scaler = os.path.join(MODELS, "scaler.pkl")
+    assert main(["parity", os.path.join(MODELS, f"{stem}.keras"), os.path.join(MODELS, f"{stem}.npz"),
+                 "--scaler", scaler]) == 0
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from backend.ml.backends import OnnxBackend, load_backend
+from backend.ml.features import FEATURE_NAMES
+from backend.ml.onnx_export import create_session, export
+from backend.ml.training import load_dataset
+
+pytest.importorskip("onnxruntime")
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    X, _ = load_dataset()
+    return X
+
+
+@pytest.mark.parametrize("name", ["xgboost", "random_forest", "logistic"])
+def test_onnx_backend__matches_native_probabilities(name, dataset):
+    native = load_backend(name)
+    exported = OnnxBackend(create_session(f"models/{name}.onnx"), name)
+
+    np.testing.assert_allclose(exported.predict_proba(dataset), native.predict_proba(dataset), atol=1e-5)
+
+
+def test_load_backend__onnx_runtime_keeps_explanations(monkeypatch, dataset):
+    monkeypatch.setenv("MODEL_RUNTIME", "onnx")
+    backend = load_backend("xgboost")
+
+    assert isinstance(backend, OnnxBackend)
+    assert backend.predict_proba(dataset[:5]).shape == (5,)
+    assert backend.explain(dataset[:2]).shape == (2, len(FEATURE_NAMES))
+
+
+def test_create_session__thread_options(monkeypatch):
+    monkeypatch.setenv("ONNX_INTRA_OP_THREADS", "2")
+    session = create_session("models/logistic.onnx", inter_op_threads=3)
+
+    options = session.get_session_options()
+    assert options.intra_op_num_threads == 2
+    assert options.inter_op_num_threads == 3
+
+
+def test_onnx_export__logistic_round_trip(tmp_path, dataset):
+    pytest.importorskip("skl2onnx")
+    path = export("logistic", str(tmp_path / "logistic.onnx"))
+
+    exported = OnnxBackend(create_session(path), "logistic")
+    np.testing.assert_allclose(exported.predict_proba(dataset[:50]), load_backend("logistic").predict_proba(dataset[:50]), atol=1e-5)
+
+
+def test_load_backend__onnx_runtime_converts_a_deployed_artifact(monkeypatch, tmp_path, dataset):
+    pytest.importorskip("skl2onnx")
+    import joblib
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from backend.ml.training import load_dataset
+
+    X, y = load_dataset()
+    # A "retrained" bundle that scores differently from the shipped logistic model
+    pipeline = Pipeline([("scaler", StandardScaler()), ("model", LogisticRegression(C=0.001))]).fit(X, y)
+    path = str(tmp_path / "logistic-retrained.pkl")
+    joblib.dump(pipeline, path)
+    monkeypatch.setenv("MODEL_RUNTIME", "onnx")
+
+    backend = load_backend("logistic", path)
+
+    assert isinstance(backend, OnnxBackend)
+    np.testing.assert_allclose(backend.predict_proba(dataset[:50]), pipeline.predict_proba(dataset[:50])[:, 1], atol=1e-5)
+    assert not np.allclose(backend.predict_proba(dataset[:50]), load_backend("logistic").predict_proba(dataset[:50]))
+    assert backend.explain(dataset[:2]).shape == (2, len(FEATURE_NAMES))
@@ -89,3 +89,21 @@ def test_get_patients_me__forbidden_for_provider(client, auth_header_for_user):
 def test_get_patients_me__unauthenticated(client):
     res = client.get("/patients/me")
     assert res.status_code == 403
+
+
+def test_patch_update_static_info__validates_yes_no(client, db_session, auth_header_for_user):
+    headers, user = auth_header_for_user(email="patient_static@example.com", is_provider=False, full_name="Static")
+    patient = models.Patient(full_name="Static", hospital_name="UzaziSafe Health Center", user_id=user.id,
+                             gestational_diabetes="unknown")  # stored before the body was validated
+    db_session.add(patient)
+    db_session.commit()
+    assert client.get("/patients/me", headers=headers).status_code == 200
+
+    bad = client.patch("/patients/update-static-info", json={"pre_existing_diabetes": "maybe"}, headers=headers)
+    assert bad.status_code == 422
+    res = client.patch("/patients/update-static-info",
+                       json={"age": "29", "pre_existing_diabetes": "yes", "gestational_diabetes": "No"}, headers=headers)
+    assert res.status_code == 200
+
+    data = client.get("/patients/me", headers=headers).json()
+    assert (data["age"], data["pre_existing_diabetes"], data["gestational_diabetes"]) == (29, "Yes", "No")
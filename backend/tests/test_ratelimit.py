@@ -0,0 +1,88 @@
+import threading
+import pytest
+from fastapi import HTTPException
+from backend import models, ratelimit
+from backend.ratelimit import ConcurrencyLimit, MemoryBuckets, RateLimiter
+import backend.routes.risk_assess as risk_routes
+
+
+def test_token_bucket__burst_refill_and_retry_after(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter(MemoryBuckets(), rate=2, burst=5)
+
+    assert [limiter.check("a", 2) for _ in range(3)] == [0, 0, 0.5]
+    assert limiter.check("b", 5) == 0  # callers have separate buckets
+    now[0] += 0.5
+    assert limiter.check("a", 2) == 0
+    assert limiter.stats()["limited"] == 1
+    assert RateLimiter(MemoryBuckets(), rate=0).check("a", 100) == 0
+
+
+def test_concurrency_limit__rejects_fast_when_full():
+    slots = ConcurrencyLimit("inference", limit=1, wait=0)
+    entered, release = threading.Event(), threading.Event()
+
+    def hold():
+        with slots.slot():
+            entered.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait(5)
+    with pytest.raises(HTTPException) as exc:
+        with slots.slot():
+            pass
+    release.set()
+    holder.join()
+    assert exc.value.status_code == 503 and exc.value.headers["Retry-After"] == "1"
+    with slots.slot():
+        assert slots.stats()["active"] == 1
+    assert (slots.stats()["admitted"], slots.stats()["rejected"]) == (2, 1)
+
+
+def test_assess_and_login__limited_per_caller(client, db_session, auth_header_for_user, monkeypatch):
+    prov_headers, _ = auth_header_for_user(email="limit_prov@example.com", is_provider=True, full_name="Dr. Limit")
+    headers, user = auth_header_for_user(email="limit_patient@patient.com", is_provider=False, full_name="Hammer")
+    db_session.add(models.Patient(full_name="Hammer", hospital_name="UzaziSafe Health Center", user_id=user.id))
+    db_session.commit()
+    monkeypatch.setattr(risk_routes, "assess_risk", lambda X: {
+        "Prediction": "Low Risk", "High_Risk_Probability": 0.1,
+        "Low_Risk_Probability": 0.9, "Top_Contributing_Factors": {},
+    })
+    monkeypatch.setattr(ratelimit, "limiter", RateLimiter(MemoryBuckets(), rate=0.01, burst=5))
+
+    codes = [client.post("/assess-risk/", json={"Systolic_BP": 120}, headers=headers).status_code for _ in range(6)]
+    assert codes == [200] * 5 + [429]
+    # Another user has their own bucket: this one gets past the limiter to the role check
+    assert client.post("/assess-risk/", json={"Systolic_BP": 120}, headers=prov_headers).status_code == 403
+    assert client.get("/admin/limits", headers=prov_headers).json()["rate_limit"]["limited"] == 1
+
+    # Logins are also keyed by the target account and cost more: its burst covers only one
+    login = {"email": "nobody@patient.com", "password": "wrong"}
+    assert client.post("/auth/login", json=login).status_code == 401
+    res = client.post("/auth/login", json=login)
+    assert res.status_code == 429 and int(res.headers["Retry-After"]) > 0
+
+
+def test_login__shared_address_scaled_and_trusted_proxy(client, monkeypatch):
+    monkeypatch.setattr(ratelimit, "limiter", RateLimiter(MemoryBuckets(), rate=0.01, burst=5))
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ADDRESS_SCALE", 3)
+
+    # One address, several accounts: the address bucket holds three logins, not one
+    codes = [client.post("/auth/login", json={"email": f"nat{i}@patient.com", "password": "x"}).status_code
+             for i in range(4)]
+    assert codes == [401, 401, 401, 429]
+
+    # The client cannot pick its address unless the header is trusted
+    spoofed = {"X-Forwarded-For": "203.0.113.9"}
+    res = client.post("/auth/login", json={"email": "nat9@patient.com", "password": "x"}, headers=spoofed)
+    assert res.status_code == 429
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXY_HEADER", "x-forwarded-for")
+    # Only the entry the proxy appended counts, not what the client sent before it
+    forwarded = {"X-Forwarded-For": "10.0.0.1, 203.0.113.9"}
+    res = client.post("/auth/login", json={"email": "nat9@patient.com", "password": "x"}, headers=forwarded)
+    assert res.status_code == 401
+    assert client.post("/auth/login", json={"email": "nat9@patient.com", "password": "x"},
+                       headers={"X-Forwarded-For": "203.0.113.10"}).status_code == 429  # same account
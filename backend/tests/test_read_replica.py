@@ -0,0 +1,91 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend import database, models
+from backend.database import WRITE_COOKIE, wrote_recently
+from backend.main import app
+import backend.routes.risk_assess as risk_routes
+
+
+@pytest.fixture
+def lagging_replica(tmp_path, monkeypatch):
+    """A second SQLite file with the schema but none of the primary's rows, i.e. a replica far behind."""
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=replica)
+    monkeypatch.setattr(database, "read_engine", replica)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=replica))
+    yield replica
+    replica.dispose()
+
+
+def test_wrote_recently__cookie_or_header_within_the_window():
+    now = time.time()
+    assert wrote_recently({"headers": [(b"cookie", f"a=1; {WRITE_COOKIE}={now - 1}".encode())]}, window=5)
+    assert wrote_recently({"headers": [(b"x-last-write", str(now).encode())]}, window=5)
+    assert not wrote_recently({"headers": [(b"x-last-write", str(now - 10).encode())]}, window=5)
+    assert not wrote_recently({"headers": [(b"x-last-write", b"soon")]}, window=5)
+    assert not wrote_recently({"headers": []}, window=5)
+
+
+def test_read_routes__use_replica_except_right_after_the_callers_write(
+    client, db_session, auth_header_for_user, lagging_replica, monkeypatch
+):
+    _, prov = auth_header_for_user(email="replica_prov@example.com", is_provider=True, full_name="Dr. Replica")
+    headers, user = auth_header_for_user(email="replica_patient@patient.com", is_provider=False, full_name="Lagged")
+    patient = models.Patient(full_name="Lagged", hospital_name="UzaziSafe Health Center", user_id=user.id,
+                             provider_id=prov.id)
+    db_session.add(patient)
+    db_session.commit()
+    monkeypatch.setattr(risk_routes, "assess_risk", lambda X: {
+        "Prediction": "Low Risk", "High_Risk_Probability": 0.1,
+        "Low_Risk_Probability": 0.9, "Top_Contributing_Factors": {},
+    })
+
+    # Reads go to the (empty) replica...
+    assert client.get(f"/providers/{prov.id}/risk-summary").status_code == 404
+    assert client.get(f"/assess-risk/patient/{patient.id}", headers=headers).status_code == 404
+
+    # ...until the caller writes: then their own reads see the primary
+    assert client.post("/assess-risk/", json={"Systolic_BP": 125}, headers=headers).status_code == 200
+    history = client.get(f"/assess-risk/patient/{patient.id}", headers=headers)
+    assert history.status_code == 200 and history.json()[0]["vitals"]["systolic_bp"] == 125
+    assert client.get("/patients/me", headers=headers).json()["current_risk_level"] == "Low Risk"
+
+    # Other callers stay on the replica, even from the same address
+    other = TestClient(app)
+    assert other.get(f"/assess-risk/patient/{patient.id}").status_code == 404
+
+    # A client without cookies echoes the header from its write's response
+    booking = {"patient_name": "Lagged", "provider_id": prov.id, "date": "2030-02-01T10:00:00", "status": "Scheduled"}
+    res = other.post("/appointments/book", json=booking)
+    assert res.status_code == 200
+    other.cookies.clear()
+    assert other.get(f"/appointments/provider/{prov.email}").status_code == 404
+    echoed = {"X-Last-Write": res.headers["X-Last-Write"]}
+    assert len(other.get(f"/appointments/provider/{prov.email}", headers=echoed).json()) == 1
+
+
+def test_login__is_not_a_write(client, lagging_replica):
+    client.post("/auth/signup/patient", data={
+        "full_name": "Replica Login", "email": "replica_login@patient.com",
+        "password": "Secret1!", "hospital_name": "MediCare Clinic",
+    })
+    fresh = TestClient(app)
+    res = fresh.post("/auth/login", json={"email": "replica_login@patient.com", "password": "Secret1!"})
+    assert res.status_code == 200
+    assert "X-Last-Write" not in res.headers and WRITE_COOKIE not in fresh.cookies
+
+
+def test_cors__frontend_can_read_and_echo_last_write(client):
+    # The frontend is cross-site to the API, so it relies on the header, not the cookie
+    origin = "https://uzazisafe.onrender.com"
+    preflight = client.options("/patients/me", headers={
+        "Origin": origin, "Access-Control-Request-Method": "GET",
+        "Access-Control-Request-Headers": "authorization,x-last-write",
+    })
+    assert preflight.status_code == 200
+    assert "x-last-write" in preflight.headers["access-control-allow-headers"].lower()
+    res = client.get("/health/startup", headers={"Origin": origin})
+    assert "x-last-write" in res.headers["access-control-expose-headers"].lower()
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from backend import models
+from backend.rescore import LostClaim, fetch_chunk, job_sessions, prepare_job, run_job, runner, write_chunk
+
+
+def make_assessed_patients(db_session, auth_header_for_user, prefix, count):
+    patients = []
+    for i in range(count):
+        _, user = auth_header_for_user(email=f"{prefix}{i}@patient.com", is_provider=False, full_name=f"{prefix} {i}")
+        patient = models.Patient(full_name=user.full_name, hospital_name="UzaziSafe Health Center",
+                                 user_id=user.id, age=25 + i, risk_level="Low Risk", gestational_diabetes="Yes")
+        db_session.add(patient)
+        db_session.flush()
+        for systolic in (110, 120 + i):
+            db_session.add(models.RiskHistory(patient_id=patient.id, risk_level="Low Risk", systolic_bp=systolic,
+                                              diastolic_bp=80, blood_sugar=0, body_temp=98, heart_rate=70))
+        patients.append(patient)
+    db_session.commit()
+    return patients
+
+
+def history_count(db_session, patients):
+    ids = [p.id for p in patients]
+    return db_session.query(models.RiskHistory).filter(models.RiskHistory.patient_id.in_(ids)).count()
+
+
+def test_run_job__resumes_from_checkpoint_without_duplicates(db_session, auth_header_for_user):
+    patients = make_assessed_patients(db_session, auth_header_for_user, "rescore_resume", 5)
+    seen = []
+    calls = {"n": 0}
+
+    def flaky_score(X):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("worker crashed")
+        seen.append(X.copy())
+        return np.full(len(X), "High Risk"), np.full(len(X), 0.9)
+
+    db = job_sessions()()
+    job_id = prepare_job(db).id
+    db.close()
+
+    first = run_job(job_id, chunk_size=2, pause=0, score=flaky_score)
+    assert first["status"] == "failed" and first["scored"] == 2
+
+    db = job_sessions()()
+    assert prepare_job(db).id == job_id
+    db.close()
+    second = run_job(job_id, chunk_size=2, pause=0, score=flaky_score)
+    assert second["status"] == "completed"
+    assert second["rows_per_second"] > 0
+
+    db_session.expire_all()
+    job = db_session.get(models.RescoreJob, job_id)
+    assert job.processed == job.total and job.finished_at is not None
+    # One rescored row per patient, from the latest vitals, despite the crash in between
+    assert history_count(db_session, patients) == 15
+    assert all(db_session.get(models.Patient, p.id).risk_level == "High Risk" for p in patients)
+    latest = np.concatenate(seen)
+    first_row = latest[np.where(latest[:, 0] == 25)[0][0]]
+    assert list(first_row[1:3]) == [120, 80] and first_row[-1] == 1
+
+
+def test_admin_rescore__runs_in_background_and_reports_progress(client, db_session, auth_header_for_user):
+    patients = make_assessed_patients(db_session, auth_header_for_user, "rescore_api", 3)
+    headers, _ = auth_header_for_user(email="rescore_prov@example.com", is_provider=True, full_name="Dr. Rescore",
+                                      is_admin=True)
+    patient_headers, _ = auth_header_for_user(email="rescore_pat@example.com", is_provider=False, full_name="Pat")
+    provider_headers, _ = auth_header_for_user(email="rescore_plain@example.com", is_provider=True, full_name="Dr. Plain")
+
+    assert client.post("/admin/rescore", headers=patient_headers).status_code == 403
+    assert client.post("/admin/rescore", headers=provider_headers).status_code == 403
+    res = client.post("/admin/rescore", headers=headers)
+    assert res.status_code == 202
+    runner.wait(timeout=60)
+
+    status = client.get("/admin/rescore", headers=headers).json()
+    assert status["job_id"] == res.json()["job_id"]
+    assert status["status"] == "completed" and status["percent"] == 100.0
+    assert status["model"] and status["rows_per_second"] > 0
+    assert history_count(db_session, patients) == 9
+    assert client.delete("/admin/rescore", headers=headers).status_code == 404
+
+    # Rescored rows are the latest risk, but not assessments
+    patient = patients[0]
+    assert client.get(f"/patients/{patient.id}/latest-risk", headers=headers).json()["high_risk_probability"] is not None
+    assert len(client.get(f"/assess-risk/patient/{patient.id}", headers=headers).json()) == 2
+    assert client.get(f"/patients/{patient.id}/timeseries", headers=headers).json()["total_points"] == 2
+
+
+def test_prepare_job__one_runner_per_job_until_its_lease_expires(db_session, auth_header_for_user):
+    make_assessed_patients(db_session, auth_header_for_user, "rescore_lease", 3)
+    sessions = job_sessions()
+    db = sessions()
+    job = prepare_job(db)
+    assert job is not None
+    job_id, first_claim, cursor = job.id, job.claimed_by, job.last_patient_id
+    # A second worker (or the CLI) cannot take a job whose runner is alive
+    assert prepare_job(db) is None
+
+    # The first runner stalls past its lease; another one takes the job over
+    db.query(models.RescoreJob).filter_by(id=job_id).update({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    takeover = prepare_job(db)
+    db.close()
+    assert takeover.id == job_id and takeover.claimed_by != first_claim
+
+    # The stalled runner's next chunk is refused, without writing anything
+    db = sessions()
+    rows = fetch_chunk(db, cursor, 2)
+    with pytest.raises(LostClaim):
+        write_chunk(db, job_id, rows, ["Low Risk"] * len(rows), [0.1] * len(rows), first_claim)
+    db.close()
+
+    result = run_job(job_id, pause=0, score=lambda X: (np.full(len(X), "Low Risk"), np.full(len(X), 0.1)))
+    assert result["status"] == "completed"
+    db_session.expire_all()
+    assert db_session.get(models.RescoreJob, job_id).claimed_by is None
@@ -0,0 +1,62 @@
+import json
+from datetime import datetime
+import numpy as np
+import pytest
+from backend import models, responses
+from backend.schemas import YesNo
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps__encodes_datetimes_enums_and_numpy(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    elif responses.orjson is None:
+        pytest.skip("orjson not installed")
+
+    body = responses.dumps({
+        "when": datetime(2025, 3, 1, 8, 30),
+        "answer": YesNo.yes,
+        "prob": np.float32(0.5),
+        "values": np.array([1, 2]),
+        "name": "Wanjiku",
+    })
+
+    assert json.loads(body) == {
+        "when": "2025-03-01T08:30:00",
+        "answer": "Yes",
+        "prob": 0.5,
+        "values": [1, 2],
+        "name": "Wanjiku",
+    }
+
+
+def test_get_provider_appointments__rows_match_response_schema(client, db_session, auth_header_for_user):
+    _, prov = auth_header_for_user(
+        email="fastjson_prov@example.com",
+        is_provider=True,
+        full_name="Dr. Fast",
+        role="Doctor",
+    )
+    appointment = models.Appointment(
+        patient_name="Fast Patient",
+        date=datetime(2025, 5, 1, 10, 0),
+        appointment_type="Checkup",
+        provider_id=prov.id,
+    )
+    db_session.add(appointment)
+    db_session.commit()
+
+    res = client.get(f"/providers/{prov.id}/appointments")
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/json"
+    assert res.json() == [{
+        "id": appointment.id,
+        "patient_name": "Fast Patient",
+        "date": "2025-05-01T10:00:00",
+        "appointment_type": "Checkup",
+        "status": "Scheduled",
+        "hospital_name": None,
+        "provider_id": prov.id,
+        "provider_email": None,
+        "provider_name": "Dr. Fast",
+    }]
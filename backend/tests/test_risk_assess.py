@@ -1,5 +1,10 @@
 from datetime import datetime
+import numpy as np
 from backend import models
+from backend.database import count_queries
+from backend.ml.features import FEATURE_NAMES
+from backend.ml.predictor import features_from_requests
+from backend.schemas import RiskAssessmentRequest
 import backend.routes.risk_assess as risk_routes
 
 
@@ -84,3 +89,56 @@ def test_post_assess_risk__unauthenticated(client):
 
 def test_get_assess_risk_patient__404_when_no_assessments(client):
     assert client.get("/assess-risk/patient/9999").status_code == 404
+
+
+def test_post_assess_risk__rejects_invalid_vitals(client, auth_header_for_user):
+    headers, _ = auth_header_for_user(
+        email="invalid_vitals@patient.com",
+        is_provider=False,
+        full_name="Invalid Vitals",
+    )
+
+    res = client.post("/assess-risk/", json={"Systolic_BP": "high", "Gestational_Diabetes": "Maybe"}, headers=headers)
+    assert res.status_code == 422
+    fields = {error["loc"][-1] for error in res.json()["detail"]}
+    assert fields == {"Systolic_BP", "Gestational_Diabetes"}
+
+
+def test_features_from_requests__defaults_and_yes_no_mapping():
+    requests = [
+        RiskAssessmentRequest(Age=30, Systolic_BP=140, Previous_Complications="yes", Gestational_Diabetes=""),
+        RiskAssessmentRequest(),
+    ]
+
+    X = features_from_requests(requests)
+
+    assert X.dtype == np.float32
+    assert X.shape == (2, len(FEATURE_NAMES))
+    assert X[0].tolist() == [30, 140, 0, 0, 0, 0, 1, 0, 0]
+    assert not X[1].any()
+
+
+def test_post_assess_risk__single_transaction_round_trips(client, db_session, auth_header_for_user, monkeypatch):
+    headers, user = auth_header_for_user(email="roundtrips@patient.com", is_provider=False, full_name="Trips")
+    patient = models.Patient(full_name="Trips", hospital_name="UzaziSafe Health Center", user_id=user.id)
+    db_session.add(patient)
+    db_session.commit()
+    monkeypatch.setattr(risk_routes, "assess_risk", lambda X: {
+        "Prediction": "Low Risk", "High_Risk_Probability": 0.2,
+        "Low_Risk_Probability": 0.8, "Top_Contributing_Factors": {},
+    })
+    body = {"Age": 29, "Systolic_BP": 118, "Gestational_Diabetes": "Yes"}
+
+    for _ in range(2):
+        with count_queries() as queries:
+            res = client.post("/assess-risk/", json=body, headers=headers)
+        assert res.status_code == 200
+        # lookup, INSERT ... RETURNING, patient UPDATE, trend state write, one commit
+        assert queries.commits == 1
+        assert queries.round_trips <= 5, queries.statements
+
+    db_session.expire_all()
+    saved = db_session.get(models.Patient, patient.id)
+    assert (saved.age, saved.gestational_diabetes, saved.risk_level) == (29, "Yes", "Low Risk")
+    assert saved.pre_existing_diabetes is None
+    assert db_session.get(models.RiskHistory, res.json()["record_id"]).systolic_bp == 118
@@ -0,0 +1,72 @@
+from datetime import datetime
+from sqlalchemy import text
+from backend import models
+from backend.search import search_patients
+
+
+def _seed(db_session, user, provider_id, names):
+    patients = []
+    for name, age, risk, assessed in names:
+        patients.append(models.Patient(
+            full_name=name, age=age, risk_level=risk, last_assessment_date=assessed,
+            hospital_name="UzaziSafe Health Center", user_id=user.id, provider_id=provider_id,
+        ))
+    db_session.add_all(patients)
+    db_session.commit()
+    return patients
+
+
+def test_patient_search__substring_filters_paging_and_scope(client, db_session, auth_header_for_user):
+    prov_headers, prov = auth_header_for_user(email="search_prov@example.com", is_provider=True, full_name="Dr. Find")
+    other_headers, other = auth_header_for_user(email="search_other@example.com", is_provider=True, full_name="Dr. Other")
+    _, user = auth_header_for_user(email="search_patient@patient.com", is_provider=False, full_name="Seeker")
+    _seed(db_session, user, prov.id, [
+        ("Achieng Mwangi", 24, "High Risk", datetime(2030, 1, 10)),
+        ("Wanjiru Kamau", 31, "Low Risk", datetime(2030, 1, 20)),
+        ("Grace Wambui", 38, "High Risk", datetime(2030, 2, 1)),
+        ("Mary Otieno", 27, "Low Risk", datetime(2030, 2, 5)),
+    ])
+    _seed(db_session, user, other.id, [("Wanza Mutua", 29, "High Risk", datetime(2030, 1, 15))])
+    url = f"/providers/{prov.id}/patients/search"
+
+    def names(**params):
+        res = client.get(url, params=params, headers=prov_headers)
+        assert res.status_code == 200, res.text
+        return [p["full_name"] for p in res.json()["patients"]]
+
+    # Anywhere in the name, case-insensitive; names starting with the query first
+    assert names(q="WAN") == ["Wanjiru Kamau", "Achieng Mwangi"]
+    assert names(q="wa") == ["Wanjiru Kamau"]  # under 3 characters: prefix only
+    assert names(q="wan", risk_level="High Risk") == ["Achieng Mwangi"]
+    assert names(min_age=25, max_age=35) == ["Mary Otieno", "Wanjiru Kamau"]
+    assert names(assessed_after="2030-01-15T00:00:00", assessed_before="2030-02-02T00:00:00") == [
+        "Grace Wambui", "Wanjiru Kamau",
+    ]
+    assert names(q="100%") == []
+
+    first = client.get(url, params={"limit": 3}, headers=prov_headers).json()
+    assert (len(first["patients"]), first["next_offset"]) == (3, 3)
+    last = client.get(url, params={"limit": 3, "offset": 3}, headers=prov_headers).json()
+    assert [p["full_name"] for p in last["patients"]] == ["Wanjiru Kamau"] and last["next_offset"] is None
+
+    assert client.get(url, params={"q": "wan"}, headers=other_headers).status_code == 403
+
+
+def test_patient_search__fts_index_follows_writes_and_is_used(db_session, auth_header_for_user):
+    _, prov = auth_header_for_user(email="fts_prov@example.com", is_provider=True, full_name="Dr. Index")
+    _, user = auth_header_for_user(email="fts_patient@patient.com", is_provider=False, full_name="Indexed")
+    (patient,) = _seed(db_session, user, prov.id, [("Njeri Chebet", 30, "Low Risk", None)])
+
+    patient.full_name = "Njeri Kiprono"
+    db_session.commit()
+    assert [r.id for r in search_patients(db_session, prov.id, q="kipro")] == [patient.id]
+    assert list(search_patients(db_session, prov.id, q="chebet")) == []
+
+    query = search_patients(db_session, prov.id, q="kipro", risk_level="Low Risk")
+    compiled = query.statement.compile(compile_kwargs={"literal_binds": True})
+    plan = " ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "VIRTUAL TABLE INDEX" in plan and "ix_patients_provider_risk_assessed" in plan
+
+    db_session.delete(patient)
+    db_session.commit()
+    assert db_session.execute(text("SELECT count(*) FROM patients_fts WHERE patients_fts MATCH 'kipro'")).scalar() == 0
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import pytest
+from backend import models
+from backend.database import SessionLocal
+from backend.serve import RestartBackoff, memory_report, shared_state_warnings, split_cpu_limits
+from backend.vitals_trend import fold_readings
+import backend.routes.risk_assess as risk_routes
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="needs /proc/<pid>/smaps_rollup")
+def test_memory_report__unique_plus_shared_is_resident():
+    report = memory_report(os.getpid(), [])
+    (row,) = report["processes"]
+    assert row["role"] == "master" and row["rss_mb"] > 0
+    assert abs(row["unique_mb"] + row["shared_mb"] - row["rss_mb"]) <= 0.2
+    assert report["total_pss_mb"] == row["pss_mb"]
+
+
+def test_split_cpu_limits__shares_cores_unless_set(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    environ = {"HASH_CONCURRENCY": "3"}
+    assert split_cpu_limits(4, environ) == {"INFERENCE_CONCURRENCY": "2", "HASH_CONCURRENCY": "3", "IMPORT_HASH_WORKERS": "2"}
+    assert split_cpu_limits(16, {})["INFERENCE_CONCURRENCY"] == "1"
+
+
+def test_shared_state_warnings__only_for_per_process_backends_with_several_workers():
+    assert shared_state_warnings(1, {}) == []
+    assert len(shared_state_warnings(4, {})) == 2
+    assert shared_state_warnings(4, {"CACHE_BACKEND": "redis", "RATE_LIMIT_BACKEND": "redis"}) == []
+
+
+def test_restart_backoff__doubles_for_fast_failures_then_gives_up():
+    backoff = RestartBackoff(min_uptime=10, base=0.5, cap=2, max_failures=5)
+
+    assert [backoff.delay(1) for _ in range(4)] == [0.5, 1.0, 2, 2]
+    # A worker that ran for a while resets the count and is replaced at once
+    assert backoff.delay(60) == 0.0
+    assert [backoff.delay(0.1) for _ in range(5)] == [0.5, 1.0, 2, 2, None]
+
+
+def test_import_app__starts_no_model_watch_before_fork(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    artifact = tmp_path / "model.pkl"
+    artifact.write_text("v1")
+    env = {**os.environ, "PYTHONPATH": root, "DATABASE_URL": "sqlite:///./test.db",
+           "MODEL_WATCH_SECONDS": "1", "MODEL_PATH": str(artifact)}
+    code = "import threading, backend.main; print(sorted(t.name for t in threading.enumerate()))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "['MainThread']"
+
+
+def test_assess__retries_when_another_worker_updates_the_trend_state(client, db_session, auth_header_for_user, monkeypatch):
+    headers, user = auth_header_for_user(email="serve_patient@patient.com", is_provider=False, full_name="Forked")
+    patient = models.Patient(full_name="Forked", hospital_name="UzaziSafe Health Center", user_id=user.id)
+    db_session.add(patient)
+    db_session.commit()
+    low_risk = {
+        "Prediction": "Low Risk", "High_Risk_Probability": 0.2,
+        "Low_Risk_Probability": 0.8, "Top_Contributing_Factors": {},
+    }
+    monkeypatch.setattr(risk_routes, "assess_risk", lambda X: low_risk)
+    assert client.post("/assess-risk/", json={"Systolic_BP": 110}, headers=headers).status_code == 200
+
+    # While this request is scoring, another worker folds a reading into the same trend state
+    def score_during_concurrent_write(X):
+        other = SessionLocal()
+        try:
+            fold_readings(other.get(models.PatientVitalsState, patient.id), {"systolic_bp": 130})
+            other.commit()
+        finally:
+            other.close()
+        return low_risk
+
+    monkeypatch.setattr(risk_routes, "assess_risk", score_during_concurrent_write)
+    assert client.post("/assess-risk/", json={"Systolic_BP": 150}, headers=headers).status_code == 200
+
+    db_session.expire_all()
+    state = db_session.get(models.PatientVitalsState, patient.id)
+    assert state.assessments == 3
+    assert db_session.query(models.RiskHistory).filter_by(patient_id=patient.id).count() == 2
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+import backend.main as main
+
+
+def test_import_main__does_not_load_model_stack():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = (
+        "import sys, backend.main; "
+        "print(sorted(m for m in ('xgboost', 'shap', 'sklearn', 'pandas', 'joblib') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": root, "DATABASE_URL": "sqlite:///./test.db"}
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_lifespan__records_startup_phases(monkeypatch):
+    monkeypatch.setattr(main, "MODEL_PRELOAD", "lazy")
+    # The deployment poll would outlive this test and query tables the session teardown drops
+    monkeypatch.setattr(main, "start_sync", lambda registry: None)
+
+    with TestClient(main.app) as client:
+        assert client.get("/").status_code == 200
+        timings = client.get("/health/startup").json()
+
+    assert "create_all" in timings["phases_ms"]
+    assert "import_app" in timings["phases_ms"]
+    assert {"app_ready", "first_response"} <= set(timings["milestones_ms"])
+
+
+def test_get_openapi__schema_built_once(client):
+    first = client.get("/openapi.json")
+    assert first.status_code == 200
+    assert main.app.openapi() is main.app.openapi()
+    assert first.json()["components"]["securitySchemes"]["BearerAuth"]["scheme"] == "bearer"
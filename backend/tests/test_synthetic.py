@@ -0,0 +1,61 @@
+from datetime import datetime
+import numpy as np
+from backend import models
+from backend.database import engine
+from backend.loadtest.synthetic import fit_distributions, generate_patient_chunk, seed_synthetic
+
+NOW = datetime(2025, 6, 1)
+
+
+def _chunk(seed):
+    rng = np.random.default_rng(seed)
+    return generate_patient_chunk(
+        rng, fit_distributions(), np.array([1, 2]), np.array(["Aga Khan Hospital", "MediCare Clinic"]),
+        user_start=10, patient_start=20, history_start=30, appointment_start=40,
+        count=50, history_mean=3, appointments_mean=2, hashed_pw="x",
+        now_us=1_700_000_000_000_000, days=90,
+    )
+
+
+def test_synthetic_generate_patient_chunk__deterministic_by_seed():
+    a, b, c = _chunk(5), _chunk(5), _chunk(6)
+    assert a == b
+    assert a["risk_history"]["systolic_bp"] != c["risk_history"]["systolic_bp"]
+
+
+def test_synthetic_generate_patient_chunk__patient_matches_latest_history():
+    chunk = _chunk(1)
+    history = chunk["risk_history"]
+    for patient_id, level, last in zip(
+        chunk["patients"]["id"], chunk["patients"]["risk_level"], chunk["patients"]["last_assessment_date"]
+    ):
+        rows = [i for i, pid in enumerate(history["patient_id"]) if pid == patient_id]
+        if not rows:
+            assert level == "Unknown"
+            continue
+        latest = max(rows, key=lambda i: history["created_at"][i])
+        assert history["risk_level"][latest] == level
+        assert history["created_at"][latest] == last
+
+
+def test_synthetic_seed__bulk_inserts_into_database(db_session):
+    before = db_session.query(models.RiskHistory).count()
+    counts = seed_synthetic(engine, providers=3, patients=40, history_mean=2, appointments_mean=1,
+                            seed=11, chunk_size=15, now=NOW, log=lambda msg: None)
+
+    assert counts["users"] == 43
+    assert counts["patients"] == 40
+    assert db_session.query(models.RiskHistory).count() == before + counts["risk_history"]
+
+    patient = (
+        db_session.query(models.Patient)
+        .filter(models.Patient.full_name.like("Synthetic Patient %"))
+        .first()
+    )
+    assert patient.provider.is_provider is True
+    assert patient.hospital_name == patient.provider.hospital_name
+
+    # The seeder's relaxed durability stays on its own connection
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() != 0
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() != "memory"
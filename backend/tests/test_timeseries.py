@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from backend import models
+from backend.timeseries import downsample, lttb_indices, minmax_indices
+
+
+def test_lttb_indices__keeps_endpoints_and_peak():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[437] = 25.0
+
+    keep = lttb_indices(x, y, 50)
+
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert (np.diff(keep) > 0).all()
+    assert 437 in keep
+
+
+def test_minmax_indices__keeps_every_bucket_extreme():
+    y = np.zeros(10_000)
+    y[1234], y[8765] = 9.0, -9.0
+
+    keep = minmax_indices(y, 100)
+
+    assert len(keep) <= 100
+    assert {0, 1234, 8765, 9999} <= set(keep.tolist())
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample__short_series_returned_whole(method):
+    assert downsample(np.arange(5.0), np.array([1, np.nan, 3, 4, 5]), 10, method).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_get_patient_timeseries__downsamples_all_columns(client, db_session, auth_header_for_user):
+    _, user = auth_header_for_user(email="series@patient.com", is_provider=False, full_name="Series Patient")
+    patient = models.Patient(full_name="Series Patient", hospital_name="UzaziSafe Health Center", user_id=user.id)
+    db_session.add(patient)
+    db_session.commit()
+
+    start = datetime(2025, 1, 1)
+    db_session.add_all([
+        models.RiskHistory(
+            patient_id=patient.id,
+            created_at=start + timedelta(hours=i),
+            systolic_bp=110 + (60 if i == 321 else i % 7),
+            diastolic_bp=70,
+            blood_sugar=None if i == 5 else 6.0,
+            body_temp=98.4,
+            heart_rate=80,
+            high_risk_probability=(i % 10) / 10,
+        )
+        for i in range(600)
+    ])
+    db_session.commit()
+
+    res = client.get(f"/patients/{patient.id}/timeseries", params={"metric": "systolic", "points": 60})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["total_points"] == 600
+    assert data["returned_points"] == len(data["timestamps"]) == len(data["high_risk_probability"]) <= 60
+    assert max(data["systolic"]) == 170
+    assert data["timestamps"][0].startswith("2025-01-01T00:00:00")
+
+    full = client.get(f"/patients/{patient.id}/timeseries", params={"points": 5000, "method": "minmax"}).json()
+    assert full["returned_points"] == 600
+    assert full["sugar"][5] is None
+
+    assert client.get(f"/patients/{patient.id}/timeseries", params={"metric": "bmi"}).status_code == 400
+    assert client.get("/patients/99999/timeseries").status_code == 404
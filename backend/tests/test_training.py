@@ -0,0 +1,40 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from backend.ml.features import FEATURE_NAMES
+from backend.ml.predictor import load_model
+from backend.ml.training import load_dataset, train
+
+
+def test_training_load_dataset__typed_arrays_in_feature_order():
+    X, y = load_dataset()
+    assert X.dtype == np.float32
+    assert y.dtype == np.int8
+    assert X.shape[1] == len(FEATURE_NAMES)
+    assert not np.isnan(X).any()
+    assert set(np.unique(X[:, FEATURE_NAMES.index("Pre-existing Diabetes")])) <= {0.0, 1.0}
+
+
+@pytest.mark.parametrize("model_type", ["logistic", "xgboost"])
+def test_training_train__writes_bundle_loadable_by_predictor(tmp_path, model_type):
+    bundle = train(model_type, output_dir=str(tmp_path), n_iter=2, cv=2, log=lambda m: None)
+
+    with open(os.path.join(bundle, "metadata.json")) as f:
+        metadata = json.load(f)
+    assert metadata["feature_names"] == FEATURE_NAMES
+    assert 0.5 < metadata["holdout_metrics"]["roc_auc"] <= 1.0
+    assert metadata["training_seconds"] > 0
+    assert metadata["inference_latency"]["batch_rows_per_second"] > 0
+
+    model = load_model(bundle)
+    X, _ = load_dataset()
+    probs = model.predict_proba(pd.DataFrame(X[:5], columns=FEATURE_NAMES))
+    assert probs.shape == (5, 2)
+
+
+def test_predictor_load_model__rejects_mismatched_feature_order(tmp_path):
+    (tmp_path / "metadata.json").write_text(json.dumps({"feature_names": ["Age"]}))
+    with pytest.raises(ValueError):
+        load_model(str(tmp_path))
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from backend import models
+from backend.vitals_trend import WINDOW, rebuild, update_state
+import backend.routes.risk_assess as risk_routes
+
+
+def make_patient(db_session, auth_header_for_user, email, provider_id=None):
+    headers, user = auth_header_for_user(email=email, is_provider=False, full_name=email.split("@")[0])
+    patient = models.Patient(
+        full_name=user.full_name,
+        hospital_name="UzaziSafe Health Center",
+        user_id=user.id,
+        provider_id=provider_id,
+    )
+    db_session.add(patient)
+    db_session.commit()
+    return headers, patient
+
+
+def test_update_state__ewma_window_and_rising_alert(db_session, auth_header_for_user):
+    _, patient = make_patient(db_session, auth_header_for_user, "trend_unit@patient.com")
+
+    for systolic in [110, 112, 120, 128, 136, 150]:
+        state = update_state(db_session, patient.id, {"systolic_bp": systolic, "blood_sugar": 6.0, "heart_rate": None})
+    db_session.commit()
+
+    assert state.assessments == 6
+    assert state.systolic_bp_min == 112 and state.systolic_bp_max == 150
+    assert len(json.loads(state.recent_values)["systolic_bp"]) == WINDOW
+    assert state.systolic_bp_slope == pytest.approx(9.2)
+    assert state.blood_sugar_slope == 0
+    assert state.heart_rate_ewma is None
+    assert state.alert is True
+    assert any("systolic_bp rising" in reason for reason in json.loads(state.alert_reasons))
+
+
+def test_post_assess_risk__updates_state_and_provider_alerts(client, db_session, auth_header_for_user, monkeypatch):
+    _, prov = auth_header_for_user(email="alerts_prov@example.com", is_provider=True, full_name="Dr. Alert", role="Doctor")
+    headers, patient = make_patient(db_session, auth_header_for_user, "alerts_patient@patient.com", prov.id)
+    _, calm = make_patient(db_session, auth_header_for_user, "calm_patient@patient.com", prov.id)
+    update_state(db_session, calm.id, {"systolic_bp": 110, "high_risk_probability": 0.1})
+    db_session.commit()
+
+    probabilities = iter([0.2, 0.35, 0.6])
+    def fake(X):
+        high = next(probabilities)
+        return {"Prediction": "High Risk" if high >= 0.5 else "Low Risk", "High_Risk_Probability": high,
+                "Low_Risk_Probability": 1 - high, "Top_Contributing_Factors": {}}
+    monkeypatch.setattr(risk_routes, "assess_risk", fake)
+
+    for sugar in [6.0, 7.0, 8.0]:
+        res = client.post("/assess-risk/", json={"Systolic_BP": 120, "Blood_Sugar": sugar}, headers=headers)
+        assert res.status_code == 200
+
+    res = client.get(f"/providers/{prov.id}/alerts")
+    assert res.status_code == 200
+    alerts = res.json()
+    assert [a["patient_id"] for a in alerts] == [patient.id]
+    assert alerts[0]["assessments"] == 3
+    assert alerts[0]["trends"]["blood_sugar"]["slope"] == pytest.approx(1.0)
+    assert any("high_risk_probability rising" in r for r in alerts[0]["reasons"])
+    assert client.get("/providers/99999/alerts").status_code == 404
+
+
+def test_rebuild__matches_incremental_state(db_session, auth_header_for_user):
+    _, patient = make_patient(db_session, auth_header_for_user, "trend_rebuild@patient.com")
+    start = datetime(2025, 2, 1)
+    readings = [(118, 0.3), (125, 0.4), (131, 0.45), (129, 0.5)]
+    for i, (systolic, prob) in enumerate(readings):
+        db_session.add(models.RiskHistory(
+            patient_id=patient.id, created_at=start + timedelta(days=i),
+            systolic_bp=systolic, blood_sugar=0, high_risk_probability=prob,
+        ))
+        update_state(db_session, patient.id, {"systolic_bp": systolic, "high_risk_probability": prob})
+    db_session.commit()
+    incremental = db_session.get(models.PatientVitalsState, patient.id)
+    expected = (incremental.systolic_bp_ewma, incremental.systolic_bp_slope, incremental.high_risk_probability_max)
+
+    rebuild(db_session)
+    db_session.expire_all()
+    rebuilt = db_session.get(models.PatientVitalsState, patient.id)
+
+    assert (rebuilt.systolic_bp_ewma, rebuilt.systolic_bp_slope, rebuilt.high_risk_probability_max) == pytest.approx(expected)
+    assert rebuilt.blood_sugar_ewma is None
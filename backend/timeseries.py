@@ -0,0 +1,82 @@
+"""
+Downsampling for per-patient vitals / risk charts.
+
+Both methods return sorted row indices into the original series, so every
+column (timestamps, each vital, probability) is downsampled consistently
+and a chart never shows a value that was not actually recorded.
+
+- lttb:   Largest-Triangle-Three-Buckets on one driving metric; keeps the
+          visual shape of that metric. One NumPy pass per bucket.
+- minmax: first/last point plus the min and max of the driving metric in
+          each bucket; keeps every spike. Fully vectorized.
+"""
+import numpy as np
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the `threshold` points LTTB keeps from (x, y)."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.linspace(0, n - 1, max(threshold, 1)).astype(int)
+
+    # Buckets for the points between the fixed first and last point
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    # Average of every bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for b in range(threshold - 2):
+        start, end = edges[b], edges[b + 1]
+        # Triangle area (x2) between the previously kept point, each candidate and the next bucket's average
+        area = np.abs(
+            (x[previous] - avg_x[b + 1]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y[b + 1] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[b + 1] = previous
+    return selected
+
+
+def _first_match(mask: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Index of the first True in `mask` for every bucket label."""
+    positions = np.flatnonzero(mask)
+    _, first = np.unique(labels[positions], return_index=True)
+    return positions[first]
+
+
+def minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the first/last point plus the min and max of each bucket (at most `threshold`)."""
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    buckets = max((threshold - 2) // 2, 1)
+    edges = np.linspace(1, n - 1, buckets + 1).astype(int)
+    starts = edges[:-1]
+    starts = starts[starts < n - 1]
+
+    # Per-bucket extremes with reduceat, then the first position matching each one
+    interior = y[1:n - 1]
+    offsets = starts - 1
+    counts = np.diff(np.append(offsets, len(interior)))
+    labels = np.repeat(np.arange(len(offsets)), counts)
+    mins = _first_match(interior == np.repeat(np.minimum.reduceat(interior, offsets), counts), labels) + 1
+    maxs = _first_match(interior == np.repeat(np.maximum.reduceat(interior, offsets), counts), labels) + 1
+    return np.unique(np.concatenate(([0], mins, maxs, [n - 1])))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, points: int, method: str = "lttb") -> np.ndarray:
+    """Row indices to keep. NaNs in the driving metric are treated as 0 for the selection only."""
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    if method == "lttb":
+        return lttb_indices(np.asarray(x, dtype=np.float64), y, points)
+    if method == "minmax":
+        return minmax_indices(y, points)
+    raise ValueError(f"Unknown downsampling method: {method}")
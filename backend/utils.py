@@ -11,9 +11,16 @@ from . import models
 SECRET_KEY = "your_secret_key" 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
+STREAM_TOKEN_EXPIRE_SECONDS = 300  # EventSource cannot send headers, so its token rides in the URL
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# EMAIL ADDRESSES
+def normalize_email(email: str) -> str:
+    """The stored form of an address: signup, login and CSV import all go through this."""
+    return email.strip().lower()
+
+
 # PASSWORD HELPERS
 def hash_password(password: str) -> str:
     """Hash a plain password."""
@@ -34,23 +41,46 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# EVENT STREAM TOKENS
+def create_stream_token(email: str, provider_id: int) -> str:
+    """Short-lived token that only opens `provider_id`'s event stream."""
+    expire = datetime.utcnow() + timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    return jwt.encode(
+        {"sub": email, "scope": "events", "provider_id": provider_id, "exp": expire},
+        SECRET_KEY, algorithm=ALGORITHM,
+    )
+
+
+def verify_stream_token(token: str | None, provider_id: int) -> str:
+    """The email in a valid stream token for `provider_id`; 401 otherwise."""
+    try:
+        payload = jwt.decode(token or "", SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        payload = {}
+    if payload.get("scope") != "events" or payload.get("provider_id") != provider_id or not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired stream token",
+        )
+    return payload["sub"]
+
+
 # AUTH DEPENDENCY (Used by protected routes)
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-):
+def get_current_email(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """
-    Extracts and validates the current user from the Bearer JWT token.
-    Used in protected routes like `/patients/me`.
+    Validates the Bearer JWT token and returns its subject (the user's email)
+    without touching the database. Routes that load the user together with
+    their own data in one query depend on this instead of get_current_user.
     """
     token = credentials.credentials  # Extract JWT from Authorization header
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
+        # Scoped tokens (the event stream's) travel in URLs and must not work as bearer tokens
+        if email is None or "scope" in payload:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload",
@@ -60,7 +90,17 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
+    return email
+
 
+def get_current_user(
+    email: str = Depends(get_current_email),
+    db: Session = Depends(get_db),
+):
+    """
+    Extracts and validates the current user from the Bearer JWT token.
+    Used in protected routes like `/patients/me`.
+    """
     user = db.query(models.User).filter(models.User.email == email).first()
     if user is None:
         raise HTTPException(
@@ -0,0 +1,152 @@
+"""
+Incremental vitals trend / early-warning state.
+
+Each assessment updates one PatientVitalsState row in constant time: the
+EWMA of every vital and of the high-risk probability, min / max and the
+least-squares slope (change per assessment) over the last WINDOW readings,
+and the alert reasons derived from them. Provider alert views read that
+row instead of scanning RiskHistory.
+
+Rebuild the state from existing history (e.g. after deploying this):
+
+    python -m backend.vitals_trend --rebuild
+"""
+import argparse
+import json
+import sys
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from . import models
+
+TREND_METRICS = ("systolic_bp", "diastolic_bp", "blood_sugar", "body_temp", "heart_rate", "high_risk_probability")
+EWMA_ALPHA = 0.3
+WINDOW = 5
+# Slopes are only trusted once this many readings are in the window
+MIN_READINGS_FOR_SLOPE = 3
+
+# metric -> (EWMA level that alerts, rising slope per assessment that alerts)
+ALERT_RULES = {
+    "systolic_bp": (140.0, 5.0),
+    "diastolic_bp": (90.0, 3.0),
+    "blood_sugar": (11.0, 0.5),
+    "body_temp": (100.4, 0.5),
+    "heart_rate": (110.0, 5.0),
+    "high_risk_probability": (0.5, 0.1),
+}
+
+
+def _slope(values: list[float]) -> float:
+    """Least-squares slope of values against their position (0, 1, 2, ...)."""
+    n = len(values)
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    numerator = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    denominator = sum((i - mean_x) ** 2 for i in range(n))
+    return numerator / denominator
+
+
+def _alert_reasons(state: models.PatientVitalsState, window: dict) -> list[str]:
+    reasons = []
+    for metric, (level, rising) in ALERT_RULES.items():
+        ewma = getattr(state, f"{metric}_ewma")
+        slope = getattr(state, f"{metric}_slope")
+        if ewma is not None and ewma >= level:
+            reasons.append(f"{metric} averaging {ewma:.1f} (>= {level:g})")
+        if slope is not None and len(window.get(metric, [])) >= MIN_READINGS_FOR_SLOPE and slope >= rising:
+            reasons.append(f"{metric} rising {slope:+.2f} per assessment")
+    return reasons
+
+
+def update_state(db: Session, patient_id: int, readings: dict) -> models.PatientVitalsState:
+    """
+    Fold one assessment into the patient's trend state (not committed).
+    `readings` maps TREND_METRICS names to values; None means not measured.
+    """
+    state = db.get(models.PatientVitalsState, patient_id)
+    if state is None:
+        state = new_state(db, patient_id)
+        # Sessions run with autoflush off; flush so the next get() in this transaction finds it
+        db.flush()
+    return fold_readings(state, readings)
+
+
+def new_state(db: Session, patient_id: int) -> models.PatientVitalsState:
+    state = models.PatientVitalsState(patient_id=patient_id, assessments=0)
+    db.add(state)
+    return state
+
+
+def fold_readings(state: models.PatientVitalsState, readings: dict) -> models.PatientVitalsState:
+    """update_state() for a state row the caller already loaded (or created with new_state())."""
+    window = json.loads(state.recent_values) if state.recent_values else {}
+
+    for metric in TREND_METRICS:
+        value = readings.get(metric)
+        if value is None:
+            continue
+        value = float(value)
+        recent = (window.get(metric, []) + [value])[-WINDOW:]
+        window[metric] = recent
+
+        previous = getattr(state, f"{metric}_ewma")
+        setattr(state, f"{metric}_ewma", value if previous is None else EWMA_ALPHA * value + (1 - EWMA_ALPHA) * previous)
+        setattr(state, f"{metric}_min", min(recent))
+        setattr(state, f"{metric}_max", max(recent))
+        setattr(state, f"{metric}_slope", _slope(recent) if len(recent) >= 2 else None)
+
+    state.assessments = (state.assessments or 0) + 1
+    state.recent_values = json.dumps(window)
+    reasons = _alert_reasons(state, window)
+    state.alert = bool(reasons)
+    state.alert_reasons = json.dumps(reasons)
+    return state
+
+
+def readings_from_history(record: models.RiskHistory) -> dict:
+    # The assess route stores 0 for vitals that were not sent
+    return {metric: (getattr(record, metric) or None) for metric in TREND_METRICS}
+
+
+def rebuild(db: Session, batch_size: int = 1000) -> int:
+    """Recompute every patient's state by replaying RiskHistory in time order."""
+    db.query(models.PatientVitalsState).delete()
+    db.flush()
+    replayed = 0
+    query = (
+        db.query(models.RiskHistory)
+        .filter(models.RiskHistory.source == "assessment")
+        .order_by(models.RiskHistory.patient_id, models.RiskHistory.created_at, models.RiskHistory.id)
+        .yield_per(batch_size)
+    )
+    for record in query:
+        if record.patient_id is None:
+            continue
+        update_state(db, record.patient_id, readings_from_history(record))
+        replayed += 1
+    db.commit()
+    return replayed
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain per-patient vitals trend state.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute all state from RiskHistory")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return 1
+
+    from .database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine, tables=[models.PatientVitalsState.__table__])
+    db = SessionLocal()
+    try:
+        print(f"Replayed {rebuild(db)} assessments")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,9 @@ import ReactDOM from 'react-dom/client';
 import './index.css';
 import App from './App';
 import reportWebVitals from './reportWebVitals';
+import { installReadYourWrites } from './lib/readYourWrites';
+
+installReadYourWrites(process.env.REACT_APP_API_URL || 'https://uzazisafe-backend.onrender.com');
 
 const root = ReactDOM.createRoot(
   document.getElementById('root') as HTMLElement
@@ -0,0 +1,39 @@
+// Read-your-writes with a read replica (see backend/database.py).
+// Every successful write response carries X-Last-Write. Echoing it on later
+// API requests sends this browser's reads to the primary, so a dashboard
+// reloaded right after an assessment shows it. The backend's last-write
+// cookie does not help here: this site and the API are on different
+// onrender.com subdomains, which browsers treat as cross-site.
+const HEADER = "X-Last-Write";
+const STORAGE_KEY = "lastWrite";
+// Stop echoing after this long; the backend decides the actual window (READ_YOUR_WRITES_SECONDS)
+const ECHO_SECONDS = 60;
+
+function requestUrl(input: RequestInfo | URL): string {
+  if (typeof input === "string") return input;
+  if (input instanceof URL) return input.href;
+  return input.url;
+}
+
+export function installReadYourWrites(apiUrl: string) {
+  const apiOrigin = new URL(apiUrl).origin;
+  const nativeFetch = window.fetch.bind(window);
+
+  window.fetch = async (input: RequestInfo | URL, init?: RequestInit) => {
+    if (new URL(requestUrl(input), window.location.href).origin !== apiOrigin) {
+      return nativeFetch(input, init);
+    }
+
+    const lastWrite = localStorage.getItem(STORAGE_KEY);
+    if (lastWrite && Date.now() / 1000 - Number(lastWrite) < ECHO_SECONDS) {
+      const headers = new Headers(init?.headers ?? (input instanceof Request ? input.headers : undefined));
+      headers.set(HEADER, lastWrite);
+      init = { ...init, headers };
+    }
+
+    const response = await nativeFetch(input, init);
+    const written = response.headers.get(HEADER);
+    if (written) localStorage.setItem(STORAGE_KEY, written);
+    return response;
+  };
+}